@@ -4,25 +4,63 @@ import argparse
 from pathlib import Path
 
 from .engine import GameEngine
+from .rng import RNG_KINDS
 from .world import bootstrap_world
 
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Pygame-ce ZZT runtime clone")
     p.add_argument("world", nargs="?", help="Path to .ZZT/.SAV world to load")
+    p.add_argument("--seed", type=int, default=None, help="Seed the game RNG for a reproducible run")
+    p.add_argument(
+        "--rng",
+        choices=sorted(RNG_KINDS),
+        default="buffered",
+        help="Random source; 'pascal' replays Turbo Pascal's Random for parity runs",
+    )
+    p.add_argument(
+        "--audio-thread",
+        action="store_true",
+        help="Time music on a background thread instead of the render loop",
+    )
+    p.add_argument(
+        "--audio-stream",
+        action="store_true",
+        help="Mix the speaker into one continuous PCM stream instead of restarting a tone per note",
+    )
+    p.add_argument("--audio-trace", metavar="FILE", help="Record sound timing to FILE (.csv or .json) and print a summary")
+    p.add_argument(
+        "--memory-report",
+        type=int,
+        nargs="?",
+        const=3,
+        metavar="CYCLES",
+        help="Print per-board memory use for WORLD over CYCLES reloads and exit",
+    )
     return p
 
 
 def main() -> None:
     args = build_parser().parse_args()
+    if args.memory_report is not None and args.world:
+        from .memprof import format_report, profile_world
+
+        print(format_report(profile_world(args.world, args.memory_report)))
+        return
     world_path = None
     if args.world:
         path = Path(args.world)
         if path.exists():
             world_path = str(path)
     world = bootstrap_world(world_path)
-    engine = GameEngine(world)
+    engine = GameEngine(world, rng=args.rng, seed=args.seed)
+    engine.audio_thread = args.audio_thread
+    engine.audio_stream = args.audio_stream
+    trace = engine.sound.start_trace() if args.audio_trace else None
     engine.run()
+    if trace is not None:
+        trace.write(args.audio_trace)
+        print(trace.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+"""Timestamped trace of sound engine activity.
+
+`SoundEngine.start_trace` attaches an `AudioTrace`.  It records ``add``
+calls from the game thread, every timer step with its drift from the
+scheduled time, and each note, digit, rest and stop the speaker is given.
+Steps that land a whole timer interval late count as missed: at that point
+a note has already run long by one step.  Only the latest ``max_events``
+events are kept for export; the summary counts the whole session.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+EVENT_FIELDS = ("t_ms", "kind", "value", "drift_ms")
+MAX_EVENTS = 100_000
+
+
+@dataclass(frozen=True, slots=True)
+class AudioEvent:
+    t_ms: float
+    kind: str
+    value: int = 0
+    drift_ms: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class AudioSummary:
+    events: int
+    adds: int
+    steps: int
+    notes: int
+    missed_steps: int
+    max_jitter_ms: float
+    mean_jitter_ms: float
+    dropped: int = 0
+
+
+class AudioTrace:
+    def __init__(
+        self,
+        step_ms: float,
+        clock: Callable[[], float] = time.perf_counter,
+        max_events: int = MAX_EVENTS,
+    ) -> None:
+        self.step_ms = step_ms
+        self.events: deque[AudioEvent] = deque(maxlen=max_events)
+        self._clock = clock
+        self._t0 = clock()
+        # The game and audio threads both record; the running totals are
+        # kept under a lock so the summary covers events the ring dropped.
+        self._lock = threading.Lock()
+        self._total = 0
+        self._adds = 0
+        self._notes = 0
+        self._steps = 0
+        self._missed = 0
+        self._max_jitter = 0.0
+        self._sum_jitter = 0.0
+
+    def record(self, kind: str, value: int = 0, drift_ms: float = 0.0) -> None:
+        event = AudioEvent((self._clock() - self._t0) * 1000.0, kind, value, drift_ms)
+        with self._lock:
+            self.events.append(event)
+            self._total += 1
+            if kind == "add":
+                self._adds += 1
+            elif kind in ("note", "digit"):
+                self._notes += 1
+            elif kind == "step":
+                jitter = abs(drift_ms)
+                self._steps += 1
+                self._missed += jitter >= self.step_ms
+                self._max_jitter = max(self._max_jitter, jitter)
+                self._sum_jitter += jitter
+
+    def summary(self) -> AudioSummary:
+        with self._lock:
+            return AudioSummary(
+                events=self._total,
+                adds=self._adds,
+                steps=self._steps,
+                notes=self._notes,
+                missed_steps=self._missed,
+                max_jitter_ms=self._max_jitter,
+                mean_jitter_ms=self._sum_jitter / self._steps if self._steps else 0.0,
+                dropped=self._total - len(self.events),
+            )
+
+    def write_csv(self, path: str | Path) -> None:
+        with open(path, "w", newline="", encoding="ascii") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(EVENT_FIELDS)
+            for e in self.events:
+                writer.writerow((f"{e.t_ms:.3f}", e.kind, e.value, f"{e.drift_ms:.3f}"))
+
+    def write_json(self, path: str | Path) -> None:
+        payload = {"step_ms": self.step_ms, "summary": asdict(self.summary()), "events": [asdict(e) for e in self.events]}
+        Path(path).write_text(json.dumps(payload), encoding="ascii")
+
+    def write(self, path: str | Path) -> None:
+        """Write CSV or JSON, chosen by ``path``'s suffix."""
+        if Path(path).suffix.lower() == ".json":
+            self.write_json(path)
+        else:
+            self.write_csv(path)
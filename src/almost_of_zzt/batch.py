@@ -0,0 +1,214 @@
+"""Headless batch simulation of many worlds/seeds across worker processes.
+
+Each job loads a world, seeds the engine RNG, drives the player with either a
+replayed input script or a seeded random-walk bot, and reports a summary.
+
+Replay scripts are whitespace-separated tokens, one per tick: ``N``/``S``/
+``E``/``W`` move, ``*N``/``*S``/``*E``/``*W`` shoot, ``.`` waits, and any
+other token presses its first character as a key.  When the script runs out
+the player idles.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+from . import constants as c
+from .engine import ControlState, GameEngine
+from .pool import map_in_processes
+from .world import load_world
+
+
+_DIRS = {"N": (0, -1), "S": (0, 1), "E": (1, 0), "W": (-1, 0)}
+
+
+@dataclass(frozen=True, slots=True)
+class BatchJob:
+    world: str
+    seed: int = 0
+    ticks: int = 2000
+    inputs: tuple[str, ...] | None = None
+    rng: str = "buffered"
+    audio_trace: bool = False
+
+
+@dataclass(slots=True)
+class BatchResult:
+    world: str
+    seed: int
+    ticks: int = 0
+    score: int = 0
+    death_tick: int | None = None
+    boards_visited: list[int] = field(default_factory=list)
+    ticks_per_sec: float = 0.0
+    audio: dict | None = None
+    error: str | None = None
+
+
+def parse_inputs(text: str) -> tuple[str, ...]:
+    return tuple(text.split())
+
+
+def control_token(control: ControlState) -> str:
+    for name, d in _DIRS.items():
+        if d == (control.dx, control.dy):
+            return f"*{name}" if control.fire else name
+    return "."
+
+
+def _control_from_token(token: str) -> ControlState:
+    if token == ".":
+        return ControlState()
+    fire = token.startswith("*")
+    d = _DIRS.get(token[1:] if fire else token)
+    if d is not None:
+        return ControlState(d[0], d[1], fire)
+    return ControlState(key=token[0])
+
+
+class RandomWalkBot:
+    """Seeded bot that holds a direction for a few ticks and sometimes shoots."""
+
+    def __init__(self, seed: int) -> None:
+        self.random = random.Random(seed)
+        self._dir = (0, 0)
+        self._hold = 0
+
+    def next_control(self) -> ControlState:
+        if self._hold <= 0:
+            self._dir = self.random.choice(list(_DIRS.values()))
+            self._hold = self.random.randrange(1, 6)
+        self._hold -= 1
+        return ControlState(self._dir[0], self._dir[1], self.random.random() < 0.1)
+
+
+class BatchEngine(GameEngine):
+    """GameEngine fed from a script or bot, with no UI, saves or rewind capture."""
+
+    def __init__(self, world, job: BatchJob) -> None:
+        super().__init__(world, rng=job.rng, seed=job.seed)
+        self._inputs = iter(job.inputs) if job.inputs is not None else None
+        self._bot = RandomWalkBot(job.seed) if job.inputs is None else None
+        self.death_tick: int | None = None
+
+    def _read_control(self) -> None:
+        if self._bot is not None:
+            self.control = self._bot.next_control()
+        else:
+            self.control = _control_from_token(next(self._inputs, "."))
+
+    def _autosave_step(self) -> None:
+        pass
+
+    def _rewind_step(self) -> None:
+        self._tick_count += 1
+
+    def _handle_player_death(self) -> None:
+        if self.death_tick is None:
+            self.death_tick = self._tick_count
+        self._death_score_noted = True
+
+
+def start_job(job: BatchJob) -> BatchEngine:
+    """Load the job's world and put its engine into play, ready to tick."""
+    engine = BatchEngine(load_world(job.world), job)
+    engine.entry_room = engine.world.inv.room
+    engine._start_play(reload_original=False)
+    engine.standby = False
+    engine.world.inv.play_flag = True
+    return engine
+
+
+def running(engine: BatchEngine) -> bool:
+    return engine.death_tick is None and engine.play_mode == c.PLAYER
+
+
+def run_job(job: BatchJob) -> BatchResult:
+    result = BatchResult(world=job.world, seed=job.seed)
+    try:
+        engine = start_job(job)
+        trace = engine.sound.start_trace() if job.audio_trace else None
+        visited = [engine.world.inv.room]
+        seen = set(visited)
+        start = time.perf_counter()
+        step = 0
+        while step < job.ticks and running(engine):
+            step += 1
+            engine._tick_game(step * engine.game_cycle_ms)
+            room = engine.world.inv.room
+            if room not in seen:
+                seen.add(room)
+                visited.append(room)
+        elapsed = time.perf_counter() - start
+
+        result.ticks = engine._tick_count
+        result.score = engine.world.inv.score
+        result.death_tick = engine.death_tick
+        result.boards_visited = visited
+        result.ticks_per_sec = result.ticks / elapsed if elapsed > 0 else 0.0
+        if trace is not None:
+            result.audio = asdict(trace.summary())
+    except Exception as exc:  # noqa: BLE001 - one bad world must not sink the batch
+        result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def run_batch(jobs: list[BatchJob], workers: int | None = None) -> list[BatchResult]:
+    """Run ``jobs`` on a process pool; results come back in job order."""
+    return map_in_processes(run_job, jobs, workers)
+
+
+def _parse_seeds(spec: str) -> list[int]:
+    seeds: list[int] = []
+    for part in spec.split(","):
+        lo, sep, hi = part.partition("-")
+        seeds.extend(range(int(lo), int(hi) + 1) if sep else [int(lo)])
+    return seeds
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Run headless ZZT simulations in parallel")
+    p.add_argument("worlds", nargs="+", help=".ZZT/.SAV worlds to play")
+    p.add_argument("--seeds", default="0", help="Seeds to run per world, e.g. 0-15 or 1,5,9")
+    p.add_argument("--ticks", type=int, default=2000, help="Maximum ticks per run")
+    p.add_argument("--inputs", help="Replay script file (defaults to the random-walk bot)")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.add_argument("--audio-trace", action="store_true", help="Summarise sound timer jitter per run")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    inputs = None
+    if args.inputs:
+        with open(args.inputs, encoding="latin-1") as fh:
+            inputs = parse_inputs(fh.read())
+    jobs = [BatchJob(world, seed, args.ticks, inputs, audio_trace=args.audio_trace) for world in args.worlds for seed in _parse_seeds(args.seeds)]
+    results = run_batch(jobs, args.workers)
+
+    if args.json:
+        json.dump([asdict(r) for r in results], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    for r in results:
+        if r.error:
+            print(f"{r.world} seed={r.seed} error: {r.error}")
+            continue
+        death = "-" if r.death_tick is None else r.death_tick
+        audio = ""
+        if r.audio is not None:
+            audio = f" audio_steps={r.audio['steps']} missed={r.audio['missed_steps']} jitter_max={r.audio['max_jitter_ms']:.1f}ms"
+        print(
+            f"{r.world} seed={r.seed} ticks={r.ticks} score={r.score} death={death} "
+            f"boards={len(r.boards_visited)} tps={r.ticks_per_sec:.0f}{audio}"
+        )
+
+
+if __name__ == "__main__":
+    main()
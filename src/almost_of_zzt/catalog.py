@@ -0,0 +1,97 @@
+"""Background-scanned list of world and save files for the file picker.
+
+Scans run on a worker thread.  Per-file metadata (title, board count,
+original world name) is reused while a file's mtime and size are unchanged,
+so rescanning a large directory mostly costs one ``stat`` per file.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import constants as c
+from .world import read_title
+
+
+@dataclass(frozen=True, slots=True)
+class WorldEntry:
+    path: Path
+    title: str
+    num_rooms: int
+    orig_name: str
+    mtime_ns: int
+    size: int
+
+
+class WorldCatalog:
+    def __init__(self, directory: str | Path | None = None, exts: tuple[str, ...] = (c.WORLD_EXT, c.SAVE_EXT)) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self.exts = tuple(ext.upper() for ext in exts)
+        self._lock = threading.Lock()
+        self._meta: dict[Path, WorldEntry] = {}
+        self._entries: list[WorldEntry] | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def scanning(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def refresh(self) -> None:
+        """Start a background rescan unless one is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._scan, name="world-catalog", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.scanning
+
+    def entries(self, ext: str) -> list[WorldEntry] | None:
+        """Entries with ``ext`` from the latest finished scan, or None before the first."""
+        with self._lock:
+            entries = self._entries
+        if entries is None:
+            return None
+        ext = ext.upper()
+        return [e for e in entries if e.path.suffix.upper() == ext]
+
+    def _scan(self) -> None:
+        directory = self.directory or Path.cwd()
+        old = self._meta
+        meta: dict[Path, WorldEntry] = {}
+        try:
+            with os.scandir(directory) as it:
+                found = [d for d in it if os.path.splitext(d.name)[1].upper() in self.exts and d.is_file()]
+        except OSError:
+            found = []
+        for d in found:
+            path = directory / d.name
+            try:
+                st = d.stat()
+            except OSError:
+                continue
+            entry = old.get(path)
+            if entry is None or entry.mtime_ns != st.st_mtime_ns or entry.size != st.st_size:
+                entry = self._describe(path, st)
+            meta[path] = entry
+        entries = sorted(meta.values(), key=lambda e: e.path.name.lower())
+        with self._lock:
+            self._meta = meta
+            self._entries = entries
+
+    @staticmethod
+    def _describe(path: Path, st: os.stat_result) -> WorldEntry:
+        try:
+            num_rooms, inv, room = read_title(str(path))
+            title, orig_name = room.title, inv.orig_name
+        except (OSError, ValueError, IndexError):
+            num_rooms, title, orig_name = -1, "", ""
+        return WorldEntry(path, title, num_rooms, orig_name, st.st_mtime_ns, st.st_size)
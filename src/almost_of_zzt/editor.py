@@ -9,7 +9,7 @@ import pygame
 
 from . import constants as c
 from .info import init_info_edit, init_info_play
-from .model import BoardCell, Obj, make_default_room
+from .model import BoardCell, Obj, bake_labels, make_default_room
 from .world import save_world
 
 if TYPE_CHECKING:
@@ -83,6 +83,7 @@ class BoardEditor:
                 obj.room = proto.room
                 if proto.inside:
                     obj.inside = proto.inside
+                    obj.label_flips = proto.label_flips
                     obj.offset = 0
         else:
             self.engine.room.board[x][y] = BoardCell(kind, color)
@@ -152,9 +153,12 @@ class BoardEditor:
         if info.msg_dir:
             obj.xd, obj.yd = self.engine.in_dir(24, info.msg_dir + ":")
         if info.msg_scroll:
-            updated = self.engine.edit_scroll(obj.inside, title=f"Edit {info.msg_scroll}")
+            text = bake_labels(obj.inside, obj.label_flips)
+            updated = self.engine.edit_scroll(text, title=f"Edit {info.msg_scroll}")
             if updated is not None:
-                obj.inside = updated
+                obj.inside = self.engine.world.intern_program(updated)
+                obj.label_flips = frozenset()
+                obj.bind = 0
                 obj.offset = 0
         self._default_obj[kind] = copy.deepcopy(obj)
         self.modified = True
@@ -342,7 +346,8 @@ class BoardEditor:
                     break
                 if event.type == pygame.KEYDOWN:
                     self._handle_key(event)
-            self._draw()
+            if not self.engine.step_transition():
+                self._draw()
             pygame.display.flip()
             self._clock.tick(30)
 
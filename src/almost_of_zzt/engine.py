@@ -2,21 +2,35 @@ from __future__ import annotations
 
 import copy
 import random
+import threading
+from bisect import bisect_left
+from collections.abc import Callable
 from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import TypeVar
 
 import pygame
 
 from . import constants as c
+from .catalog import WorldCatalog
+from .hiscores import HiTable, default_service, empty_table
 from .info import InfoDef, init_info_play
 from .model import BoardCell, Obj, Room, RoomInfo, make_default_room, make_new_world
 from .oop import OOPRunner
-from .render import Renderer
+from .render import Renderer, cell_visible, draw_board, dynamic_char
+from .rng import GameRandom, PascalRandom, make_rng
+from .scheduler import CycleScheduler
+from .snapshot import QuickSave, RewindBuffer
 from . import sound as snd
 from .world import load_world, save_world
 
 
+T = TypeVar("T")
+_SPINNER = "|/-\\"
+
+
 @dataclass(slots=True)
 class ControlState:
     dx: int = 0
@@ -43,14 +57,43 @@ class EditScrollState:
     cancelled: bool = False
 
 
+@dataclass(slots=True)
+class BoardTransition:
+    order: tuple[tuple[int, int], ...]
+    pos: int = 0
+    target: pygame.Surface | None = None
+
+
+@lru_cache(maxsize=None)
+def _dissolve_order(seed: int) -> tuple[tuple[int, int], ...]:
+    cells = [(x, y) for y in range(1, c.YS + 1) for x in range(1, c.XS + 1)]
+    random.Random(seed).shuffle(cells)
+    return tuple(cells)
+
+
 class GameEngine:
     TARGET_RENDER_FPS = 60
     MAX_MOVE_QUEUE = 8
     MAX_TICK_CATCHUP = 8
-
-    def __init__(self, world) -> None:
+    AUTOSAVE_SLOTS = 4
+    AUTOSAVE_INTERVAL_TICKS = 300
+    REWIND_INTERVAL_TICKS = 4
+    REWIND_SECONDS = 3.0
+    REWIND_KEY = "\x08"
+    PREFETCH_ROWS_PER_FRAME = 5
+    CATALOG_WAIT_S = 0.05
+    HI_FLUSH_TIMEOUT_S = 2.0
+    HI_PREFETCH_WAIT_S = 0.5
+    UNNAMED_HI_SCORE = "Unnamed"
+    DISSOLVE_CELLS_PER_FRAME = 120
+    DISSOLVE_ORDERS = 8
+
+    def __init__(self, world, rng: GameRandom | str | None = None, seed: int | None = None) -> None:
         self.constants = c
-        self.random = random.Random()
+        if rng is None or isinstance(rng, str):
+            rng = make_rng(rng or "buffered", seed)
+        self.random = rng
+        self._fx_random = random.Random()
         self.world = world
         self.info: list[InfoDef] = init_info_play()
 
@@ -59,6 +102,8 @@ class GameEngine:
         self.counter = self.random.randrange(1, 100)
         self.obj_num = 0
         self.cycle_last_ms = 0
+        self.scheduler = CycleScheduler()
+        self.catalog = WorldCatalog()
 
         self.standby = True
         self.done = False
@@ -74,7 +119,10 @@ class GameEngine:
         self.fullscreen = False
 
         self.sound_enabled = True
-        self.sound = snd.SoundEngine(self.random)
+        self.audio_thread = False
+        self.audio_stream = False
+        # SOUNDU fills its digits during unit init, before Randomize runs.
+        self.sound = snd.SoundEngine(PascalRandom(0) if isinstance(self.random, PascalRandom) else self.random)
         self.sound.set_enabled(self.sound_enabled)
         self.first_thru = True
         self.play_mode = c.PLAYER
@@ -83,8 +131,21 @@ class GameEngine:
         self.entry_room = 0
         self._world_file: Path | None = None
         self._world_origin_file: Path | None = None
-        self._hi_scores: list[tuple[str, int]] = [("", -1) for _ in range(c.NUM_HI)]
+        self.hiscores = default_service()
+        self._hi_scores: HiTable = empty_table()
+        self._hi_scores_partial = False
         self._death_score_noted = False
+        self.quicksave = QuickSave()
+        self.autosaves: deque[bytes] = deque(maxlen=self.AUTOSAVE_SLOTS)
+        self._ticks_since_autosave = 0
+        self.rewind_buffer = RewindBuffer()
+        self._tick_count = 0
+        self._rewind_requested = False
+        self._board_cache: dict[int, tuple[Room, pygame.Surface, tuple[int, int]]] = {}
+        self._prefetch_queue: deque[int] = deque()
+        self._prefetch_job: tuple[int, Room, Renderer, int, tuple[int, int]] | None = None
+        self._prefetch_room: Room | None = None
+        self.transition: BoardTransition | None = None
 
         self.oop = OOPRunner(self)
 
@@ -98,7 +159,11 @@ class GameEngine:
 
         self._ensure_player_board()
         self._init_menu_state()
-        self._load_hi_scores()
+        self._prefetch_hi_scores()
+        if seed is not None:
+            # A seed names the stream play starts from, injected generators
+            # included, so construction-time draws do not shift it.
+            self.random.seed(seed)
 
     @property
     def room(self) -> Room:
@@ -206,18 +271,64 @@ class GameEngine:
         else:
             self._renderer.screen = self._screen
 
+    def _in_background(self, label: str, work: Callable[[Callable[[int, int], None]], T]) -> T:
+        """Run ``work(progress)`` on a worker thread while drawing a progress line."""
+        if self._renderer is None or self._screen is None:
+            return work(lambda done, total: None)
+
+        state = {"done": 0, "total": 0}
+        outcome: dict[str, object] = {}
+
+        def progress(done: int, total: int) -> None:
+            state["done"], state["total"] = done, total
+
+        def target() -> None:
+            try:
+                outcome["value"] = work(progress)
+            except BaseException as exc:  # re-raised on the main thread
+                outcome["error"] = exc
+
+        worker = threading.Thread(target=target, name=label, daemon=True)
+        worker.start()
+        clock = self._clock or pygame.time.Clock()
+        frame = 0
+        while worker.is_alive():
+            pygame.event.pump()
+            text = f" {label} {_SPINNER[frame % len(_SPINNER)]}"
+            if state["total"]:
+                filled = state["done"] * 20 // state["total"]
+                text += f" [{'#' * filled}{'.' * (20 - filled)}] {state['done']}/{state['total']}"
+            self._renderer.clear()
+            self._draw_board(self._renderer)
+            self._draw_panel(self._renderer)
+            self._renderer.draw_text(1, c.YS - 1, text[: c.XS], 0x1F)
+            pygame.display.flip()
+            self._ui_wait(clock)
+            frame += 1
+        worker.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["value"]
+
     def _select_game_file(self, ext: str, title: str) -> Path | None:
-        files = sorted(Path.cwd().glob(f"*{ext}"), key=lambda p: p.name.lower())
-        if not files:
+        # Rescans reuse cached metadata, so they usually finish within the
+        # short wait; otherwise the previous listing is shown.
+        self.catalog.refresh()
+        self.catalog.wait(self.CATALOG_WAIT_S)
+        entries = self.catalog.entries(ext)
+        if entries is None:
+            self._in_background("Scanning for files", lambda progress: self.catalog.wait())
+            entries = self.catalog.entries(ext) or []
+        if not entries:
             self.put_bot_msg(120, f"No {ext} files found.")
             return None
 
         lines: list[str] = []
         cmd_map: dict[str, Path] = {}
-        for idx, path in enumerate(files):
+        for idx, entry in enumerate(entries):
             cmd = f"F{idx}"
-            cmd_map[cmd] = path
-            lines.append(f"!{cmd};{path.name}")
+            cmd_map[cmd] = entry.path
+            lines.append(f"!{cmd};{entry.path.name:<13}{entry.title}"[: c.XS])
         lines.append("Exit")
 
         selection = self.show_scroll(lines, title, obj_flag=True)
@@ -227,12 +338,13 @@ class GameEngine:
 
     def _load_world_from_path(self, path: Path) -> bool:
         try:
-            loaded = load_world(str(path))
+            loaded = self._in_background(f"Loading {path.name}", lambda progress: load_world(str(path), progress))
         except Exception:
             self.put_bot_msg(200, f"Could not load {path.name}")
             return False
 
         self.world = loaded
+        self.oop.clear_programs()
         self._world_file = path
         if path.suffix.upper() == c.WORLD_EXT:
             self._world_origin_file = path
@@ -252,7 +364,55 @@ class GameEngine:
         self.move_queue.clear()
         self.bot_msg_ticks = 0
         self._death_score_noted = False
-        self._load_hi_scores()
+        self.quicksave.invalidate()
+        self.autosaves.clear()
+        self.rewind_buffer.clear()
+        self._prefetch_hi_scores()
+        return True
+
+    def quick_save(self) -> bytes:
+        return self.quicksave.capture(self)
+
+    def quick_load(self, snapshot: bytes | None = None) -> bool:
+        if snapshot is None:
+            if not self.autosaves:
+                return False
+            snapshot = self.autosaves[-1]
+        self.quicksave.restore(self, snapshot)
+        self.key_buffer.clear()
+        self.move_queue.clear()
+        self._death_score_noted = False
+        return True
+
+    def _autosave_step(self) -> None:
+        self._ticks_since_autosave += 1
+        if self._ticks_since_autosave >= self.AUTOSAVE_INTERVAL_TICKS:
+            self._ticks_since_autosave = 0
+            self.autosaves.append(self.quick_save())
+
+    def _rewind_step(self) -> None:
+        self._tick_count += 1
+        if self._tick_count % self.REWIND_INTERVAL_TICKS == 0:
+            self.rewind_buffer.push(self._tick_count, self.quicksave.capture_frame(self))
+
+    def rewind(self, seconds: float | None = None) -> bool:
+        if seconds is None:
+            seconds = self.REWIND_SECONDS
+        ticks = int(seconds * 1000 / (self.speed * 20))
+        frame = self.rewind_buffer.rewind(ticks)
+        if frame is None:
+            return False
+        self.quicksave.restore_frame(self, frame)
+        self._tick_count = self.rewind_buffer.latest_tick
+        if self.world.inv.strength > 0:
+            self.game_cycle_ms = self.speed * 20
+        self.standby = True
+        self._standby_blink_visible = True
+        self._death_score_noted = False
+        self.control = ControlState()
+        self.key_buffer.clear()
+        self.move_queue.clear()
+        self.put_bot_msg(120, "Rewound")
         return True
 
     def _start_play(self, reload_original: bool) -> None:
@@ -282,47 +442,31 @@ class GameEngine:
             return self._world_file.parent / f"{name}{c.HI_EXT}"
         return Path.cwd() / f"{name}{c.HI_EXT}"
 
-    def _load_hi_scores(self) -> None:
-        self._hi_scores = [("", -1) for _ in range(c.NUM_HI)]
+    def _prefetch_hi_scores(self) -> None:
+        self._hi_scores = empty_table()
         path = self._hi_scores_path()
-        if path is None:
-            return
+        if path is not None:
+            self.hiscores.prefetch(path)
 
-        try:
-            raw = path.read_bytes()
-        except OSError:
-            return
-
-        entry_size = 53
-        total_size = entry_size * c.NUM_HI
-        if len(raw) < total_size:
-            return
-
-        loaded: list[tuple[str, int]] = []
-        for idx in range(c.NUM_HI):
-            ofs = idx * entry_size
-            name_len = min(raw[ofs], 50)
-            name = raw[ofs + 1 : ofs + 1 + name_len].decode("cp437", errors="replace")
-            score = int.from_bytes(raw[ofs + 51 : ofs + 53], byteorder="little", signed=True)
-            loaded.append((name, score))
-        self._hi_scores = loaded
+    def _load_hi_scores(self, wait: float = 0.0) -> None:
+        path = self._hi_scores_path()
+        table = None
+        if path is not None:
+            # Never read the disk here: give the prefetch at most ``wait``
+            # seconds, then start from an empty table and let the write-behind
+            # merge in the file's entries.
+            self.hiscores.prefetch(path)
+            table = self.hiscores.peek(path, wait)
+        self._hi_scores_partial = table is None and path is not None
+        self._hi_scores = empty_table() if table is None else table
 
     def _save_hi_scores(self) -> None:
         path = self._hi_scores_path()
-        if path is None:
-            return
+        if path is not None:
+            self.hiscores.store(path, self._hi_scores, merge=self._hi_scores_partial)
 
-        payload = bytearray()
-        for idx in range(c.NUM_HI):
-            name, score = self._hi_scores[idx] if idx < len(self._hi_scores) else ("", -1)
-            enc = name.encode("cp437", errors="replace")[:50]
-            payload.append(len(enc))
-            payload.extend(enc.ljust(50, b"\x00"))
-            payload.extend(int(score).to_bytes(2, byteorder="little", signed=True))
-
-        try:
-            path.write_bytes(bytes(payload))
-        except OSError:
+    def _report_hi_score_failures(self) -> None:
+        for path in self.hiscores.take_failures():
             self.put_bot_msg(200, f"Could not save {path.name}")
 
     def _set_view_hi_lines(self) -> list[str]:
@@ -558,6 +702,12 @@ class GameEngine:
 
         for idx in range(c.NUM_HI - 1, rank - 1, -1):
             self._hi_scores[idx] = self._hi_scores[idx - 1]
+        if self._hi_scores_partial:
+            # The file's entries are not known yet, so neither is the real
+            # rank: do not claim a place, just record the score for the merge.
+            self._hi_scores[rank - 1] = (self.UNNAMED_HI_SCORE, score)
+            self._save_hi_scores()
+            return
         self._hi_scores[rank - 1] = ("-- You! --", score)
 
         title_name = self.world.inv.orig_name if self.world.inv.orig_name else "Untitled"
@@ -577,7 +727,7 @@ class GameEngine:
         self._death_score_noted = True
         self.sound_stop()
 
-        self._load_hi_scores()
+        self._load_hi_scores(self.HI_PREFETCH_WAIT_S)
         self._note_score(self.world.inv.score)
 
         dead_room = self.world.inv.room
@@ -668,6 +818,10 @@ class GameEngine:
 
     def new_game(self) -> None:
         self.world = make_new_world()
+        self.oop.clear_programs()
+        self.quicksave.invalidate()
+        self.autosaves.clear()
+        self.rewind_buffer.clear()
         self.info = init_info_play()
         self.entry_room = 0
         self.counter = self.random.randrange(1, 100)
@@ -677,20 +831,106 @@ class GameEngine:
         self._set_play_mode(c.MONITOR)
         self.room.board[self.player.x][self.player.y] = BoardCell(c.MONITOR, self.info[c.MONITOR].col)
 
+    def _prefetch_targets(self) -> list[int]:
+        room = self.room
+        cur = self.world.inv.room
+        targets: list[int] = []
+        for n in room.room_info.room_udlr:
+            if 0 < n <= self.world.num_rooms and n != cur and n not in targets:
+                targets.append(n)
+        for obj in room.objs[1:]:
+            if not (1 <= obj.x <= c.XS and 1 <= obj.y <= c.YS):
+                continue
+            n = obj.room
+            if room.board[obj.x][obj.y].kind == c.PASSAGE and 0 <= n <= self.world.num_rooms and n != cur and n not in targets:
+                targets.append(n)
+        return targets
+
+    def _refresh_prefetch(self) -> None:
+        self._prefetch_room = self.room
+        targets = self._prefetch_targets()
+        for idx in list(self._board_cache):
+            if idx not in targets:
+                del self._board_cache[idx]
+        self._prefetch_queue = deque(idx for idx in targets if self._cached_board_surface(idx) is None)
+        self._prefetch_job = None
+
+    def _cached_board_surface(self, idx: int) -> pygame.Surface | None:
+        entry = self._board_cache.get(idx)
+        if entry is None or not (0 <= idx < len(self.world.rooms)) or entry[0] is not self.world.rooms[idx]:
+            return None
+        return entry[1]
+
+    def _board_target_surface(self) -> pygame.Surface:
+        target = self._renderer.offscreen()
+        entry = self._board_cache.get(self.world.inv.room)
+        if self._cached_board_surface(self.world.inv.room) is None or self.room.room_info.is_dark:
+            self._draw_board(target)
+            return target.screen
+        # Entering a board moves its player stat; patch just those rows.  The
+        # rest was drawn at the prefetch's tick, so animated cells are redrawn.
+        target.screen.blit(entry[1], (0, 0))
+        (old_x, old_y), p = entry[2], self.player
+        patched = {y for y in {old_y, p.y} if 1 <= y <= c.YS} if (old_x, old_y) != (p.x, p.y) else set()
+        for y in range(1, c.YS + 1):
+            self._draw_board(target, rows=range(y, y + 1), only_dynamic=y not in patched)
+        return target.screen
+
+    def _service_prefetch(self, rows: int | None = None) -> None:
+        # Boards only change while they are current, so neighbours and passage
+        # targets can be rendered a few rows per frame ahead of a transition.
+        if self._renderer is None:
+            return
+        if self._prefetch_room is not self.room:
+            self._refresh_prefetch()
+        budget = self.PREFETCH_ROWS_PER_FRAME if rows is None else rows
+        while budget > 0:
+            if self._prefetch_job is None:
+                if not self._prefetch_queue:
+                    return
+                idx = self._prefetch_queue.popleft()
+                if not (0 <= idx < len(self.world.rooms)):
+                    continue
+                room = self.world.rooms[idx]
+                self._prefetch_job = (idx, room, self._renderer.offscreen(), 1, (room.objs[0].x, room.objs[0].y))
+            idx, room, target, y, player_xy = self._prefetch_job
+            if idx >= len(self.world.rooms) or self.world.rooms[idx] is not room:
+                self._prefetch_job = None
+                continue
+            y_end = min(c.YS + 1, y + budget)
+            self._draw_board(target, room, range(y, y_end))
+            budget -= y_end - y
+            if y_end > c.YS:
+                self._board_cache[idx] = (room, target.screen, player_xy)
+                self._prefetch_job = None
+            else:
+                self._prefetch_job = (idx, room, target, y_end, player_xy)
+
     def pdraw_board(self) -> None:
         if self._renderer is None or self._screen is None:
             return
-        cells = [(x, y) for y in range(1, c.YS + 1) for x in range(1, c.XS + 1)]
-        self.random.shuffle(cells)
-        for idx, (x, y) in enumerate(cells):
+        self.transition = BoardTransition(_dissolve_order(self._fx_random.randrange(self.DISSOLVE_ORDERS)))
+
+    def step_transition(self) -> bool:
+        """Advance the board dissolve by one frame; False once nothing is running."""
+        t = self.transition
+        if t is None or self._renderer is None or self._screen is None:
+            self.transition = None
+            return False
+        if t.target is None:
+            t.target = self._board_target_surface()
+        end = min(len(t.order), t.pos + self.DISSOLVE_CELLS_PER_FRAME)
+        for idx in range(t.pos, end):
+            x, y = t.order[idx]
             self._renderer.draw_glyph(x - 1, y - 1, 0xB1, 0x08 + (idx % 7))
-            if (idx % 120) == 0:
-                self._service_sound()
-                pygame.display.flip()
-        self._renderer.clear()
-        self._draw_board(self._renderer)
-        self._draw_panel(self._renderer)
-        pygame.display.flip()
+        t.pos = end
+        if end >= len(t.order):
+            self._renderer.clear()
+            self._screen.blit(t.target, (0, 0))
+            self._draw_panel(self._renderer)
+            self.transition = None
+            self.cycle_last_ms = pygame.time.get_ticks()
+        return True
 
     def _handle_monitor_key(self, key: str) -> None:
         key_u = key.upper()
@@ -718,10 +958,15 @@ class GameEngine:
             return
 
         if key_u == "H":
-            self._load_hi_scores()
+            self._load_hi_scores(self.HI_PREFETCH_WAIT_S)
             self._view_hi(1)
             return
 
+        if key_u == self.REWIND_KEY:
+            if not self.rewind():
+                self.put_bot_msg(120, "Nothing to rewind.")
+            return
+
         if key_u == "A":
             self.put_bot_msg(180, "About/help docs: ref/HELP/ABOUT.HLP")
             return
@@ -787,9 +1032,10 @@ class GameEngine:
         room.board[x][y].kind = kind
         return len(room.objs) - 1
 
-    def obj_at(self, x: int, y: int) -> int:
-        for idx, obj in enumerate(self.room.objs):
-            if obj.x == x and obj.y == y:
+    def obj_at(self, x: int, y: int, room: Room | None = None) -> int:
+        objs = (room or self.room).objs
+        for idx, (ox, oy) in enumerate(zip(objs.x, objs.y)):
+            if ox == x and oy == y:
                 return idx
         return -1
 
@@ -804,6 +1050,9 @@ class GameEngine:
         obj.cycle = cycle
         obj.under = copy.deepcopy(self.room.board[x][y]) if y > 0 else BoardCell(c.EMPTY, 0)
         obj.offset = 0
+        # Pascal AddObj clones the prototype's text, so copies start unbound.
+        obj.inside = self.world.intern_program(obj.inside)
+        obj.bind = 0
         self.room.objs.append(obj)
 
         if y > 0:
@@ -818,44 +1067,49 @@ class GameEngine:
         if n <= 0 or n >= len(self.room.objs):
             return
 
-        obj = self.room.objs[n]
-        if obj.y > 0:
-            self.room.board[obj.x][obj.y] = copy.deepcopy(obj.under)
+        room = self.room
+        objs = room.objs
+        if objs.y[n] > 0:
+            room.board[objs.x[n]][objs.y[n]] = BoardCell(objs.under_kind[n], objs.under_color[n])
 
-        for i in range(1, len(self.room.objs)):
-            if self.room.objs[i].child >= n:
-                self.room.objs[i].child = -1 if self.room.objs[i].child == n else self.room.objs[i].child - 1
-            if self.room.objs[i].parent >= n:
-                self.room.objs[i].parent = -1 if self.room.objs[i].parent == n else self.room.objs[i].parent - 1
+        child, parent = objs.child, objs.parent
+        for i in range(1, len(objs)):
+            if child[i] >= n:
+                child[i] = -1 if child[i] == n else child[i] - 1
+            if parent[i] >= n:
+                parent[i] = -1 if parent[i] == n else parent[i] - 1
 
-        del self.room.objs[n]
+        del objs[n]
         if n < self.obj_num:
             self.obj_num -= 1
 
     def move_obj(self, n: int, x: int, y: int) -> None:
-        if n < 0 or n >= len(self.room.objs):
+        room = self.room
+        objs = room.objs
+        if n < 0 or n >= len(objs):
             return
-        obj = self.room.objs[n]
-        old_x, old_y = obj.x, obj.y
-
-        old_under = copy.deepcopy(obj.under)
-        obj.under = copy.deepcopy(self.room.board[x][y])
+        board = room.board
+        old_x, old_y = objs.x[n], objs.y[n]
+        src = board[old_x][old_y]
+        dst = board[x][y]
+        src_kind, src_color = src.kind, src.color
+        dst_kind, dst_color = dst.kind, dst.color
 
-        src_kind = self.room.board[old_x][old_y].kind
-        src_color = self.room.board[old_x][old_y].color
-        dst_kind = self.room.board[x][y].kind
-        dst_color = self.room.board[x][y].color
+        old_under = BoardCell(objs.under_kind[n], objs.under_color[n])
+        objs.under_kind[n] = dst_kind
+        objs.under_color[n] = dst_color
 
         if src_kind == c.PLAYER:
-            self.room.board[x][y].color = src_color
+            dst.color = src_color
         elif dst_kind == c.EMPTY:
-            self.room.board[x][y].color = src_color & 0x0F
+            dst.color = src_color & 0x0F
         else:
-            self.room.board[x][y].color = (src_color & 0x0F) + (dst_color & 0x70)
-        self.room.board[x][y].kind = src_kind
+            dst.color = (src_color & 0x0F) + (dst_color & 0x70)
+        dst.kind = src_kind
 
-        self.room.board[old_x][old_y] = old_under
-        obj.x, obj.y = x, y
+        board[old_x][old_y] = old_under
+        objs.x[n] = x
+        objs.y[n] = y
 
     def move_to(self, x1: int, y1: int, x2: int, y2: int) -> None:
         obj_idx = self.obj_at(x1, y1)
@@ -987,6 +1241,7 @@ class GameEngine:
             return
         if n == self.world.inv.room:
             return
+        self.quicksave.mark_dirty(self.world.inv.room)
         self.world.inv.room = n
         self.pdraw_board()
 
@@ -1118,13 +1373,14 @@ class GameEngine:
         method(x, y, p, dir_xy)
 
     def invoke_update(self, obj_idx: int) -> None:
-        if obj_idx >= len(self.room.objs):
+        room = self.room
+        objs = room.objs
+        if obj_idx >= len(objs):
             return
-        obj = self.room.objs[obj_idx]
-        if obj.x <= 0 or obj.y <= 0 or obj.x > c.XS or obj.y > c.YS:
+        x, y = objs.x[obj_idx], objs.y[obj_idx]
+        if x <= 0 or y <= 0 or x > c.XS or y > c.YS:
             return
-        kind = self.room.board[obj.x][obj.y].kind
-        update_name = self.info[kind].update
+        update_name = self.info[room.board[x][y].kind].update
         method = getattr(self, update_name, self.upd_nothing)
         method(obj_idx)
 
@@ -1864,6 +2120,10 @@ class GameEngine:
             self.sound_stop()
         elif key == "H":
             self.put_bot_msg(200, "Help docs: ref/HELP/GAME.HLP")
+        elif key == self.REWIND_KEY:
+            # Restoring mid-update would leave stale stat references; defer
+            # until the object loop for this tick has finished.
+            self._rewind_requested = True
 
         if self.world.inv.torch_time > 0:
             self.world.inv.torch_time -= 1
@@ -1959,124 +2219,24 @@ class GameEngine:
         else:
             o.room -= 1
 
-    def _dynamic_char(self, x: int, y: int, kind: int) -> int:
-        if kind == c.SHOOTER:
-            phase = self.counter % 8
-            if phase in (0, 1):
-                return 0x18
-            if phase in (2, 3):
-                return 0x1A
-            if phase in (4, 5):
-                return 0x19
-            return 0x1B
-        if kind == c.LINE2:
-            a = 1
-            k = 1
-            for i in range(4):
-                nk = self.room.board[x + c.UDLR_X[i]][y + c.UDLR_Y[i]].kind
-                if nk in (c.LINE2, c.BOUND):
-                    a += k
-                k *= 2
-            line2 = [0xF9, 0xD0, 0xD2, 0xBA, 0xB5, 0xBC, 0xBB, 0xB9, 0xC6, 0xC8, 0xC9, 0xCC, 0xCD, 0xCA, 0xCB, 0xCE]
-            return line2[max(1, min(16, a)) - 1]
-        if kind == c.CONVEYOR_CW:
-            phase = (self.counter // max(1, self.info[c.CONVEYOR_CW].cycle)) % 4
-            return (0xB3, ord("/"), 0xC4, ord("\\"))[phase]
-        if kind == c.CONVEYOR_CCW:
-            phase = (self.counter // max(1, self.info[c.CONVEYOR_CCW].cycle)) % 4
-            return (ord("\\"), 0xC4, ord("/"), 0xB3)[phase]
-        if kind == c.BOMB:
-            idx = self.obj_at(x, y)
-            if idx >= 0:
-                intel = self.room.objs[idx].intel
-                return 0x0B if intel <= 1 else ord(str(min(9, intel)))
-            return 0x0B
-        if kind == c.XPORTER:
-            idx = self.obj_at(x, y)
-            if idx >= 0:
-                o = self.room.objs[idx]
-                h = "^~^-v_v-"
-                v = "(<(|)>)|"
-                xd = self.signf(o.xd)
-                yd = self.signf(o.yd)
-                phase = (self.counter // max(1, o.cycle)) % 4
-                if o.xd == 0:
-                    return ord(h[yd * 2 + 3 + phase - 1])
-                return ord(v[xd * 2 + 3 + phase - 1])
-            return 0xC5
-        if kind == c.SBOMB:
-            seq = (0xB3, ord("/"), 0xC4, ord("\\"))
-            self.room.board[x][y].color += 1
-            if self.room.board[x][y].color > 0x0F:
-                self.room.board[x][y].color = 0x09
-            return seq[self.counter % 4]
-        if kind == c.DUPER:
-            idx = self.obj_at(x, y)
-            if idx >= 0:
-                return {1: 0xFA, 2: 0xF9, 3: 0xF8, 4: ord("o"), 5: ord("O")}.get(self.room.objs[idx].intel, 0xFA)
-            return 0xFA
-        if kind == c.PROG:
-            idx = self.obj_at(x, y)
-            if idx >= 0:
-                return self.room.objs[idx].intel & 0xFF
-            return 0x02
-        if kind == c.PUSHER:
-            idx = self.obj_at(x, y)
-            if idx >= 0:
-                o = self.room.objs[idx]
-                if o.xd == 1:
-                    return 0x10
-                if o.xd == -1:
-                    return 0x11
-                if o.yd == -1:
-                    return 0x1E
-                return 0x1F
-            return 0x10
-        if kind == c.BLINK_WALL:
-            return 0xCE
-        return self.info[kind].ch
-
-    def _cell_visible(self, x: int, y: int) -> bool:
-        cell = self.room.board[x][y]
-        if not self.room.room_info.is_dark:
-            return True
-        if self.info[cell.kind].show_in_dark:
-            return True
-        if self.world.inv.torch_time > 0:
-            p = self.player
-            if (p.x - x) ** 2 + 2 * (p.y - y) ** 2 < c.TORCH_SIZE:
-                return True
-        return False
-
-    def _draw_board(self, renderer: Renderer) -> None:
-        for y in range(1, c.YS + 1):
-            for x in range(1, c.XS + 1):
-                cell = self.room.board[x][y]
-                kind = cell.kind
-                if not self._cell_visible(x, y):
-                    renderer.draw_glyph(x - 1, y - 1, 0xB0, 0x07)
-                    continue
+    def _dynamic_char(self, x: int, y: int, kind: int, room: Room | None = None) -> int:
+        return dynamic_char(room or self.room, x, y, kind, self.info, self.counter)
 
-                if (
-                    kind == c.PLAYER
-                    and self.play_mode == c.PLAYER
-                    and self.standby
-                    and not self._standby_blink_visible
-                ):
-                    renderer.draw_glyph(x - 1, y - 1, ord(" "), 0x0F)
-                    continue
+    def _cell_visible(self, x: int, y: int, room: Room | None = None) -> bool:
+        return cell_visible(room or self.room, x, y, self.info, self.world.inv.torch_time)
 
-                if kind == c.EMPTY:
-                    renderer.draw_glyph(x - 1, y - 1, ord(" "), 0x0F)
-                elif kind < c.TEXT_COL:
-                    ch = self._dynamic_char(x, y, kind) if self.info[kind].print_dynamic else self.info[kind].ch
-                    renderer.draw_glyph(x - 1, y - 1, ch, cell.color)
-                else:
-                    if kind == c.TEXT_COL + c.NUM_TEXT_COLS:
-                        renderer.draw_glyph(x - 1, y - 1, cell.color, 0x0F)
-                    else:
-                        attr = ((kind - c.TEXT_COL + 1) << 4) + 0x0F
-                        renderer.draw_glyph(x - 1, y - 1, cell.color, attr)
+    def _draw_board(
+        self,
+        renderer: Renderer,
+        room: Room | None = None,
+        rows: range | None = None,
+        only_dynamic: bool = False,
+    ) -> None:
+        room = room or self.room
+        live = room is self.room
+        hide_player = live and self.play_mode == c.PLAYER and self.standby and not self._standby_blink_visible
+        torch_time = self.world.inv.torch_time
+        draw_board(renderer, room, self.info, self.counter, torch_time, hide_player, rows, live, only_dynamic)
 
     def _draw_panel(self, renderer: Renderer) -> None:
         panel_x = 61
@@ -2527,16 +2687,35 @@ class GameEngine:
 
     def _update_active_objects(self) -> None:
         self.obj_num = 0
-        while self.obj_num <= self.room.num_objs:
-            if self.obj_num < len(self.room.objs):
-                obj = self.room.objs[self.obj_num]
-                cyc = obj.cycle
-                if cyc != 0 and (self.counter % cyc) == (self.obj_num % cyc):
-                    self.invoke_update(self.obj_num)
+        counter = self.counter
+        objs = self.room.objs
+        due = self.scheduler.due(objs, counter)
+        version = objs.version
+        pos = 0
+        while pos < len(due):
+            idx = self.obj_num = due[pos]
+            self.invoke_update(idx)
             self.obj_num += 1
+            pos += 1
+            # Walk the due list once; an update that adds, removes or
+            # re-cycles stats, moves obj_num or takes a passage (new board
+            # and counter) forces a re-sync from the current obj_num.
+            if (
+                self.room.objs is not objs
+                or objs.version != version
+                or self.obj_num != idx + 1
+                or self.counter != counter
+            ):
+                counter = self.counter
+                objs = self.room.objs
+                due = self.scheduler.due(objs, counter)
+                version = objs.version
+                pos = bisect_left(due, self.obj_num)
 
     def _tick_game(self, now_ms: int) -> None:
         self._service_sound(now_ms)
+        if self.hiscores.failed:
+            self._report_hi_score_failures()
         if self.play_mode == c.PLAYER and self.world.inv.strength <= 0:
             self._handle_player_death()
             return
@@ -2558,6 +2737,9 @@ class GameEngine:
             if self.control.key in {"\x1b", "q", "Q"}:
                 self.ask_quit_game()
                 return
+            if self.control.key == self.REWIND_KEY:
+                self.rewind()
+                return
             if self.control.dx or self.control.dy:
                 dxy = [self.control.dx, self.control.dy]
                 self.invoke_touch(self.player.x + dxy[0], self.player.y + dxy[1], 0, dxy)
@@ -2584,6 +2766,12 @@ class GameEngine:
             self.cycle_last_ms += self.game_cycle_ms
             self._read_control()
             self._update_active_objects()
+            if self._rewind_requested:
+                self._rewind_requested = False
+                self.rewind()
+                return
+            self._autosave_step()
+            self._rewind_step()
             if self.bot_msg_ticks > 0:
                 self.bot_msg_ticks -= 1
                 if self.bot_msg_ticks <= 0:
@@ -2595,11 +2783,14 @@ class GameEngine:
     def run(self) -> None:
         pygame.mixer.pre_init(44100, -16, 1, 512)
         pygame.init()
-        self.sound.bind_pygame()
+        self.sound.bind_pygame(self.audio_stream)
         self.sound.set_enabled(self.sound_enabled)
+        if self.audio_thread:
+            self.sound.start_thread()
         pygame.display.set_caption("almost-of-zzt")
         self._apply_display_mode()
         self._clock = pygame.time.Clock()
+        self.catalog.refresh()
 
         if self.play_mode == c.PLAYER:
             self.note_enter_new_room()
@@ -2609,14 +2800,20 @@ class GameEngine:
         while not self.exit_program:
             self._pump_events()
             now = pygame.time.get_ticks()
-            self._tick_game(now)
+            if self.transition is None:
+                self._tick_game(now)
+            else:
+                self._service_sound(now)
 
-            self._renderer.clear()
-            self._draw_board(self._renderer)
-            self._draw_panel(self._renderer)
+            if not self.step_transition():
+                self._renderer.clear()
+                self._draw_board(self._renderer)
+                self._draw_panel(self._renderer)
             pygame.display.flip()
+            self._service_prefetch()
             self._clock.tick(self.TARGET_RENDER_FPS)
 
+        self.hiscores.flush(self.HI_FLUSH_TIMEOUT_S)
         self.sound.shutdown()
         pygame.quit()
         self._screen = None
@@ -0,0 +1,220 @@
+"""High-score tables (.HI files) behind an in-memory cache and a write-behind thread.
+
+Reads are served from the cache while the file's mtime is unchanged;
+`prefetch` warms it off the game thread and `peek` never touches the disk.
+`store` updates the cache immediately and queues the file write; queued writes
+to the same file coalesce, and each lands with a temp-file + rename so a crash
+never leaves a torn table.  A table built before the file was read is stored
+with ``merge=True`` and folded into the file's entries by the writer.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import constants as c
+
+HI_ENTRY_SIZE = 53
+
+HiTable = list[tuple[str, int]]
+
+
+def empty_table() -> HiTable:
+    return [("", -1) for _ in range(c.NUM_HI)]
+
+
+def decode_table(raw: bytes) -> HiTable:
+    if len(raw) < HI_ENTRY_SIZE * c.NUM_HI:
+        return empty_table()
+    table: HiTable = []
+    for idx in range(c.NUM_HI):
+        ofs = idx * HI_ENTRY_SIZE
+        name_len = min(raw[ofs], 50)
+        name = raw[ofs + 1 : ofs + 1 + name_len].decode("cp437", errors="replace")
+        score = int.from_bytes(raw[ofs + 51 : ofs + 53], byteorder="little", signed=True)
+        table.append((name, score))
+    return table
+
+
+def merge_tables(base: HiTable, extra: HiTable) -> HiTable:
+    """``base`` plus the entries of ``extra`` it lacks, best first, cut to NUM_HI."""
+    blank = ("", -1)
+    rows = [row for row in base if row != blank]
+    unmatched = list(rows)
+    for row in extra:
+        if row == blank:
+            continue
+        if row in unmatched:
+            unmatched.remove(row)
+        else:
+            rows.append(row)
+    rows.sort(key=lambda row: -row[1])
+    rows = rows[: c.NUM_HI]
+    return rows + [blank] * (c.NUM_HI - len(rows))
+
+
+def encode_table(table: HiTable) -> bytes:
+    payload = bytearray()
+    for idx in range(c.NUM_HI):
+        name, score = table[idx] if idx < len(table) else ("", -1)
+        enc = name.encode("cp437", errors="replace")[:50]
+        payload.append(len(enc))
+        payload.extend(enc.ljust(50, b"\x00"))
+        payload.extend(int(score).to_bytes(2, byteorder="little", signed=True))
+    return bytes(payload)
+
+
+@dataclass(frozen=True, slots=True)
+class HiScoreRow:
+    world: str
+    name: str
+    score: int
+
+
+class HiScoreService:
+    def __init__(self) -> None:
+        self._tables: dict[Path, HiTable] = {}
+        # File stamp each cached table was read at; None while our own store
+        # is newer than the file.
+        self._stamps: dict[Path, tuple[int, int] | None] = {}
+        self._pending: dict[Path, HiTable] = {}
+        self._merge: set[Path] = set()
+        self._cond = threading.Condition()
+        self._writer: threading.Thread | None = None
+        self._busy = False
+        self.failed: list[Path] = []
+
+    @staticmethod
+    def _key(path: str | Path) -> Path:
+        return Path(path).absolute()
+
+    @staticmethod
+    def _stamp(key: Path) -> tuple[int, int]:
+        try:
+            st = key.stat()
+        except OSError:
+            return (-1, -1)
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _read(key: Path) -> HiTable:
+        try:
+            return decode_table(key.read_bytes())
+        except OSError:
+            return empty_table()
+
+    def load(self, path: str | Path) -> HiTable:
+        """Return a copy of the table for ``path``, re-reading the file when its mtime moved."""
+        key = self._key(path)
+        stamp = self._stamp(key)
+        with self._cond:
+            table = self._tables.get(key)
+            cached = self._stamps.get(key, stamp)
+            if table is not None and (cached is None or cached == stamp):
+                return list(table)
+        table = self._read(key)
+        with self._cond:
+            if self._stamps.get(key, stamp) is not None:
+                self._tables[key] = table
+                self._stamps[key] = stamp
+            self._cond.notify_all()
+            return list(self._tables[key])
+
+    def peek(self, path: str | Path, timeout: float = 0.0) -> HiTable | None:
+        """Cached copy of the table for ``path``, or None; never reads the file.
+
+        With ``timeout``, wait that long for a prefetch still in flight.
+        """
+        key = self._key(path)
+        with self._cond:
+            if timeout > 0:
+                self._cond.wait_for(lambda: key in self._tables, timeout)
+            table = self._tables.get(key)
+        return None if table is None else list(table)
+
+    def prefetch(self, path: str | Path) -> None:
+        if self._key(path) not in self._tables:
+            threading.Thread(target=self.load, args=(path,), name="hiscore-read", daemon=True).start()
+
+    def store(self, path: str | Path, table: HiTable, merge: bool = False) -> None:
+        """Cache ``table`` now and write it to ``path`` in the background.
+
+        With ``merge``, ``table`` was built without the file's entries; the
+        writer folds them back in before replacing the file.
+        """
+        key = self._key(path)
+        with self._cond:
+            self._tables[key] = list(table)
+            self._stamps[key] = None
+            self._pending[key] = list(table)
+            if merge:
+                self._merge.add(key)
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="hiscore-write", daemon=True)
+                self._writer.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued write has landed; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def take_failures(self) -> list[Path]:
+        with self._cond:
+            failed, self.failed = self.failed, []
+        return failed
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._cond.wait_for(lambda: self._pending, timeout=5.0):
+                    self._writer = None
+                    return
+                key = next(iter(self._pending))
+                table = self._pending.pop(key)
+                merge = key in self._merge
+                self._merge.discard(key)
+                self._busy = True
+            try:
+                if merge:
+                    table = merge_tables(self._read(key), table)
+                tmp = key.with_name(f".{key.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(encode_table(table))
+                os.replace(tmp, key)
+                with self._cond:
+                    if key not in self._pending:
+                        self._tables[key] = table
+                        self._stamps[key] = self._stamp(key)
+            except OSError:
+                with self._cond:
+                    self.failed.append(key)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def index(self, directory: str | Path) -> list[HiScoreRow]:
+        """Every named entry from the .HI files in ``directory``, best first."""
+        rows: list[HiScoreRow] = []
+        for path in sorted(Path(directory).glob(f"*{c.HI_EXT}")):
+            for name, score in self.load(path):
+                if name and score >= 0:
+                    rows.append(HiScoreRow(path.stem, name, score))
+        rows.sort(key=lambda row: (-row.score, row.world, row.name))
+        return rows
+
+
+_default: HiScoreService | None = None
+
+
+def default_service() -> HiScoreService:
+    """Process-wide service, so every engine shares one cache and writer."""
+    global _default
+    if _default is None:
+        _default = HiScoreService()
+        atexit.register(_default.flush, 5.0)
+    return _default
@@ -0,0 +1,257 @@
+"""Memory report for loaded worlds.
+
+`memory_report` sizes what an engine currently holds: per board, the cell
+grid, the stat columns and the program text; per world, the interned program
+pool; per engine, the compiled-program cache, the glyph cache and the
+synthesized sound buffers.  `profile_world` wraps repeated
+``new_game``/``_load_world_from_path`` cycles in `tracemalloc` snapshots, so
+allocations that survive a reload show up as growth by source line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import pygame
+
+from . import constants as c
+from .engine import GameEngine
+from .model import GameWorld, Room, StatTable
+from .oopcode import Program
+
+_PACKAGE_DIR = str(Path(__file__).resolve().parent)
+_NOT_TRACEMALLOC = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+
+@dataclass(slots=True)
+class BoardMemory:
+    index: int
+    title: str
+    cells: int
+    stats: int
+    program: int
+
+
+@dataclass(slots=True)
+class MemoryReport:
+    world: str
+    boards: list[BoardMemory] = field(default_factory=list)
+    program_unique: int = 0
+    program_pool: int = 0
+    program_pool_bytes: int = 0
+    compiled: int = 0
+    compiled_bytes: int = 0
+    glyph_cache: int = 0
+    glyphs: int = 0
+    sound_cache: int = 0
+    sounds: int = 0
+    traced_load: int | None = None
+    traced_by_file: dict[str, int] = field(default_factory=dict)
+    growth: list[tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def boards_total(self) -> int:
+        return sum(b.cells + b.stats for b in self.boards)
+
+
+def _cells_size(room: Room) -> int:
+    seen: set[int] = set()
+    total = sys.getsizeof(room.board)
+    for column in room.board:
+        total += sys.getsizeof(column)
+        for cell in column:
+            if id(cell) not in seen:
+                seen.add(id(cell))
+                total += sys.getsizeof(cell)
+    return total
+
+
+def _stats_size(objs: StatTable) -> int:
+    total = sys.getsizeof(objs)
+    for name in StatTable.__slots__[:-2]:
+        total += sys.getsizeof(getattr(objs, name))
+    total += sum(sys.getsizeof(pad) for pad in objs.pad)
+    total += sys.getsizeof(objs._refs) + sum(sys.getsizeof(ref) for ref in objs._refs if ref is not None)
+    return total
+
+
+def _compiled_size(programs: dict[bytes, Program]) -> int:
+    """The cache, its `Program` dicts and their compiled lines and label tables.
+
+    Program text is left out: it is the world's pool, counted on its own.
+    """
+    seen: set[int] = set()
+
+    def size(value: object) -> int:
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        total = sys.getsizeof(value)
+        if isinstance(value, (tuple, list, frozenset)):
+            total += sum(size(item) for item in value)
+        elif isinstance(value, dict):
+            total += sum(size(k) + size(v) for k, v in value.items())
+        return total
+
+    total = sys.getsizeof(programs)
+    for prog in programs.values():
+        total += sys.getsizeof(prog) + size(prog.labels)
+        total += sum(size(line) for line in prog.values())
+    return total
+
+
+def board_memory(index: int, room: Room) -> BoardMemory:
+    """Sizes for one board; program text counts each distinct buffer once."""
+    texts = {id(text): text for text in room.objs.inside}
+    program = sum(sys.getsizeof(text) for text in texts.values() if text)
+    return BoardMemory(index, room.title, _cells_size(room), _stats_size(room.objs), program)
+
+
+def _surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_pitch() * surf.get_height()
+
+
+def _clip_bytes(clip: pygame.mixer.Sound | memoryview) -> int:
+    return clip.nbytes if isinstance(clip, memoryview) else len(clip.get_raw())
+
+
+def memory_report(engine: GameEngine, name: str = "") -> MemoryReport:
+    world: GameWorld = engine.world
+    report = MemoryReport(name or world.game_name)
+    texts: dict[int, bytes] = {}
+    for index, room in enumerate(world.rooms):
+        report.boards.append(board_memory(index, room))
+        texts.update((id(text), text) for text in room.objs.inside if text)
+    report.program_unique = sum(sys.getsizeof(text) for text in texts.values())
+    report.program_pool = len(world.programs)
+    report.program_pool_bytes = sys.getsizeof(world.programs) + sum(sys.getsizeof(text) for text in world.programs)
+    report.compiled = len(engine.oop._programs)
+    report.compiled_bytes = _compiled_size(engine.oop._programs)
+
+    if engine._renderer is not None:
+        glyphs = engine._renderer.glyph_cache
+        report.glyphs = len(glyphs)
+        report.glyph_cache = sum(_surface_bytes(s) for s in glyphs.values())
+
+    speaker = engine.sound._speaker
+    for cache in (getattr(speaker, "_tone_cache", {}), getattr(speaker, "_digit_cache", {})):
+        report.sounds += len(cache)
+        report.sound_cache += sum(_clip_bytes(clip) for clip in cache.values())
+    return report
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_NOT_TRACEMALLOC)
+
+
+def _traced_by_file(snapshot: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot) -> dict[str, int]:
+    out: dict[str, int] = {}
+    for stat in snapshot.compare_to(baseline, "filename"):
+        filename = stat.traceback[0].filename
+        if filename.startswith(_PACKAGE_DIR) and stat.size_diff:
+            out[Path(filename).name] = stat.size_diff
+    return dict(sorted(out.items(), key=lambda item: -item[1]))
+
+
+def profile_world(path: str | Path, cycles: int = 3, top: int = 10, render: bool = False) -> MemoryReport:
+    """Load ``path`` ``cycles`` times in one engine and report what it retains.
+
+    ``traced_load`` is the traced growth from an empty engine to the first
+    load; ``growth`` lists the source lines whose allocations kept growing
+    between the first and last load, which is what a leak looks like.
+    """
+    path = Path(path)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        engine = GameEngine(GameWorld())
+        gc.collect()
+        baseline = _snapshot()
+        first = None
+        for _ in range(max(1, cycles)):
+            engine.new_game()
+            if not engine._load_world_from_path(path):
+                raise ValueError(f"Could not load {path}")
+            if render:
+                _render_boards(engine)
+            gc.collect()
+            snapshot = _snapshot()
+            if first is None:
+                first = snapshot
+        report = memory_report(engine, path.name)
+        report.traced_load = sum(stat.size_diff for stat in first.compare_to(baseline, "filename"))
+        report.traced_by_file = _traced_by_file(first, baseline)
+        if cycles > 1:
+            report.growth = [
+                (f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}", s.size_diff)
+                for s in snapshot.compare_to(first, "lineno")[:top]
+                if s.size_diff > 0
+            ]
+        return report
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def _render_boards(engine: GameEngine) -> None:
+    if engine._renderer is None:
+        from .render import Renderer
+
+        pygame.font.init()
+        engine._renderer = Renderer(pygame.Surface((c.XS * c.CELL_W, c.BOARD_OFFSET_Y + c.YS * c.CELL_H)))
+    for room in engine.world.rooms:
+        engine._draw_board(engine._renderer, room)
+
+
+def format_report(report: MemoryReport) -> str:
+    lines = [f"{report.world}: {len(report.boards)} boards"]
+    lines.append(f"  {'#':>3}  {'cells':>8} {'stats':>8} {'program':>8}  title")
+    for b in report.boards:
+        lines.append(f"  {b.index:>3}  {b.cells:>8} {b.stats:>8} {b.program:>8}  {b.title}")
+    lines.append(f"  boards (cells+stats) {report.boards_total} B")
+    lines.append(f"  program text (distinct) {report.program_unique} B")
+    lines.append(f"  program pool {report.program_pool_bytes} B in {report.program_pool} entries")
+    lines.append(f"  compiled programs {report.compiled_bytes} B in {report.compiled} entries")
+    lines.append(f"  glyph cache {report.glyph_cache} B in {report.glyphs} surfaces")
+    lines.append(f"  sound cache {report.sound_cache} B in {report.sounds} clips")
+    if report.traced_load is not None:
+        lines.append(f"  traced at load {report.traced_load} B")
+        for name, size in report.traced_by_file.items():
+            lines.append(f"    {name} {size} B")
+    if report.growth:
+        lines.append("  growth between first and last load:")
+        for where, size in report.growth:
+            lines.append(f"    {where} +{size} B")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Report memory held per world and per board")
+    p.add_argument("worlds", nargs="+")
+    p.add_argument("--cycles", type=int, default=3, help="Load each world this many times to expose leaks")
+    p.add_argument("--top", type=int, default=10, help="Number of growing source lines to list")
+    p.add_argument("--render", action="store_true", help="Draw every board so the glyph cache is populated")
+    p.add_argument("--json", action="store_true")
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    reports = [profile_world(world, args.cycles, args.top, args.render) for world in args.worlds]
+    if args.json:
+        json.dump([asdict(r) for r in reports], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    for report in reports:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
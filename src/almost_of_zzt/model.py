@@ -1,15 +1,60 @@
 from __future__ import annotations
 
+import itertools
+from array import array
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 
 from . import constants as c
 
 
+_BIND_IDS = itertools.count(1)
+_SWAPPED_MARK = {ord(":"): ord("'"), ord("'"): ord(":")}
+
+
+def bake_labels(inside: bytes, flips: frozenset[int]) -> bytes:
+    """``inside`` with the ``:``/``'`` label markers at ``flips`` swapped, as saved."""
+    if not flips:
+        return inside
+    data = bytearray(inside)
+    for pos in flips:
+        data[pos] = _SWAPPED_MARK[data[pos]]
+    return bytes(data)
+
+
+def new_bind_id() -> int:
+    return next(_BIND_IDS)
+
+
 @dataclass(slots=True)
 class BoardCell:
     kind: int = c.EMPTY
     color: int = 0
 
+    def __copy__(self) -> BoardCell:
+        return BoardCell(self.kind, self.color)
+
+    def __deepcopy__(self, memo) -> BoardCell:
+        return BoardCell(self.kind, self.color)
+
+
+class FrozenCell(BoardCell):
+    """Read-only view of a stat's under cell; assign a new cell to .under."""
+
+    __slots__ = ()
+
+    def __init__(self, kind: int, color: int) -> None:
+        object.__setattr__(self, "kind", kind)
+        object.__setattr__(self, "color", color)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("stat under cells are read-only; assign a new cell to .under")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoardCell):
+            return NotImplemented
+        return self.kind == other.kind and self.color == other.color
+
 
 @dataclass(slots=True)
 class Obj:
@@ -27,6 +72,214 @@ class Obj:
     offset: int = 0
     inside: bytes = b""
     pad: bytes = b"\x00" * 8
+    # Objects sharing a nonzero bind id behave like Pascal stats whose Inside
+    # pointers alias (#BIND or a negative-length record); 0 means unbound.
+    bind: int = 0
+    # Offsets of label markers #ZAP/#RESTORE has swapped; `inside` itself is
+    # never rewritten, so compiled programs stay valid (see `bake_labels`).
+    label_flips: frozenset[int] = frozenset()
+
+
+STAT_COLUMNS = ("x", "y", "xd", "yd", "cycle", "intel", "rate", "room", "child", "parent", "offset")
+
+
+class StatTable:
+    """A room's stats stored as parallel columns.
+
+    Indexing returns a cached `StatRef` per row.  The refs follow their row
+    across deletions, so code holding a stat keeps seeing the same one, just
+    as it would with a list of `Obj`.  ``version`` changes whenever rows are
+    added, removed or replaced, or a cycle is written through a ref.
+    """
+
+    __slots__ = (*STAT_COLUMNS, "under_kind", "under_color", "inside", "pad", "bind", "label_flips", "_refs", "version")
+
+    def __init__(self, objs: Iterable[Obj] = ()) -> None:
+        for name in STAT_COLUMNS:
+            setattr(self, name, array("i"))
+        self.under_kind = array("B")
+        self.under_color = array("B")
+        self.inside: list[bytes] = []
+        self.pad: list[bytes] = []
+        self.bind = array("q")
+        self.label_flips: list[frozenset[int]] = []
+        self._refs: list[StatRef | None] = []
+        self.version = 0
+        for obj in objs:
+            self.append(obj)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def append(self, obj: Obj | StatRef) -> None:
+        for name in STAT_COLUMNS:
+            getattr(self, name).append(getattr(obj, name))
+        under = obj.under
+        self.under_kind.append(under.kind)
+        self.under_color.append(under.color)
+        self.inside.append(obj.inside)
+        self.pad.append(obj.pad)
+        self.bind.append(obj.bind)
+        self.label_flips.append(obj.label_flips)
+        self._refs.append(None)
+        self.version += 1
+
+    def _index(self, idx: int) -> int:
+        n = len(self.x)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError("stat index out of range")
+        return idx
+
+    def __getitem__(self, idx):
+        if type(idx) is slice:
+            return [self[i] for i in range(*idx.indices(len(self.x)))]
+        if idx >= 0:
+            try:
+                ref = self._refs[idx]
+            except IndexError:
+                raise IndexError("stat index out of range") from None
+            if ref is not None:
+                return ref
+        idx = self._index(idx)
+        ref = self._refs[idx]
+        if ref is None:
+            ref = self._refs[idx] = StatRef(self, idx)
+        return ref
+
+    def __setitem__(self, idx: int, obj: Obj | StatRef) -> None:
+        idx = self._index(idx)
+        for name in STAT_COLUMNS:
+            getattr(self, name)[idx] = getattr(obj, name)
+        under = obj.under
+        self.under_kind[idx] = under.kind
+        self.under_color[idx] = under.color
+        self.inside[idx] = obj.inside
+        self.pad[idx] = obj.pad
+        self.bind[idx] = obj.bind
+        self.label_flips[idx] = obj.label_flips
+        self.version += 1
+
+    def __delitem__(self, idx: int) -> None:
+        idx = self._index(idx)
+        ref = self._refs[idx]
+        if ref is not None:
+            ref._detach()
+        for name in self.__slots__[:-2]:
+            del getattr(self, name)[idx]
+        del self._refs[idx]
+        for ref in self._refs[idx:]:
+            if ref is not None:
+                ref._i -= 1
+        self.version += 1
+
+    def __iter__(self):
+        for idx in range(len(self.x)):
+            yield self[idx]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StatTable):
+            return all(getattr(self, name) == getattr(other, name) for name in self.__slots__[:-2])
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __copy__(self) -> StatTable:
+        return StatTable(self)
+
+    def __deepcopy__(self, memo) -> StatTable:
+        return StatTable(self)
+
+    def __reduce__(self):
+        return (StatTable, ([ref.to_obj() for ref in self],))
+
+    def __repr__(self) -> str:
+        return f"StatTable({[ref.to_obj() for ref in self]!r})"
+
+
+def _stat_column(name: str) -> property:
+    def fget(self: StatRef) -> int:
+        return getattr(self._t, name)[self._i]
+
+    def fset(self: StatRef, value: int) -> None:
+        getattr(self._t, name)[self._i] = value
+
+    return property(fget, fset)
+
+
+def _cycle_column() -> property:
+    def fget(self: StatRef) -> int:
+        return self._t.cycle[self._i]
+
+    def fset(self: StatRef, value: int) -> None:
+        table = self._t
+        if table.cycle[self._i] != value:
+            table.cycle[self._i] = value
+            table.version += 1
+
+    return property(fget, fset)
+
+
+class StatRef:
+    """Live view of one `StatTable` row with the `Obj` attribute API."""
+
+    __slots__ = ("_t", "_i")
+
+    def __init__(self, table: StatTable, idx: int) -> None:
+        self._t = table
+        self._i = idx
+
+    @property
+    def under(self) -> BoardCell:
+        return FrozenCell(self._t.under_kind[self._i], self._t.under_color[self._i])
+
+    @under.setter
+    def under(self, cell: BoardCell) -> None:
+        self._t.under_kind[self._i] = cell.kind
+        self._t.under_color[self._i] = cell.color
+
+    def _detach(self) -> None:
+        # A removed stat keeps its last values in a private one-row table.
+        table = StatTable((self,))
+        table._refs[0] = self
+        self._t = table
+        self._i = 0
+
+    def to_obj(self) -> Obj:
+        t, i = self._t, self._i
+        return Obj(
+            **{name: getattr(t, name)[i] for name in STAT_COLUMNS},
+            under=BoardCell(t.under_kind[i], t.under_color[i]),
+            inside=t.inside[i],
+            pad=t.pad[i],
+            bind=t.bind[i],
+            label_flips=t.label_flips[i],
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StatRef):
+            return self.to_obj() == other.to_obj()
+        if isinstance(other, Obj):
+            return self.to_obj() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __copy__(self) -> Obj:
+        return self.to_obj()
+
+    def __deepcopy__(self, memo) -> Obj:
+        return self.to_obj()
+
+    def __repr__(self) -> str:
+        return f"StatRef({self._i}, {self.to_obj()!r})"
+
+
+for _name in (*STAT_COLUMNS, "inside", "pad", "bind", "label_flips"):
+    setattr(StatRef, _name, _stat_column(_name))
+del _name
+StatRef.cycle = _cycle_column()
 
 
 @dataclass(slots=True)
@@ -46,9 +299,13 @@ class RoomInfo:
 class Room:
     title: str = ""
     board: list[list[BoardCell]] = field(default_factory=list)
-    objs: list[Obj] = field(default_factory=list)
+    objs: StatTable = field(default_factory=StatTable)
     room_info: RoomInfo = field(default_factory=RoomInfo)
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.objs, StatTable):
+            self.objs = StatTable(self.objs)
+
     @property
     def num_objs(self) -> int:
         return max(0, len(self.objs) - 1)
@@ -72,6 +329,73 @@ def make_empty_board() -> list[list[BoardCell]]:
     return board
 
 
+class FlagTable(list):
+    """The world's `NUM_FLAGS` flag slots, plus an index of the set ones.
+
+    The slots are what gets saved, in Pascal order; the index maps each
+    uppercased flag to its first slot so lookups need no scan.  Every
+    in-place write reindexes, and anything that would change the number of
+    slots raises `TypeError`.
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, flags: Iterable[str] = ()) -> None:
+        flags = list(flags)[: c.NUM_FLAGS]
+        super().__init__(flags + [""] * (c.NUM_FLAGS - len(flags)))
+        self._reindex()
+
+    def __reduce__(self):
+        return FlagTable, (list(self),)
+
+    def _reindex(self) -> None:
+        index: dict[str, int] = {}
+        for idx, flag in enumerate(self):
+            if flag:
+                index.setdefault(flag.upper(), idx)
+        self._index = index
+
+    def __setitem__(self, idx, value) -> None:
+        if isinstance(idx, slice):
+            value = list(value)
+            if len(value) != len(range(*idx.indices(len(self)))):
+                raise TypeError(f"FlagTable has exactly {c.NUM_FLAGS} slots")
+        super().__setitem__(idx, value)
+        self._reindex()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._reindex()
+
+    def _resize(self, *args, **kwargs):
+        raise TypeError(f"FlagTable has exactly {c.NUM_FLAGS} slots")
+
+    append = extend = insert = pop = remove = clear = _resize
+    __delitem__ = __iadd__ = __imul__ = _resize
+
+    def find(self, word: str) -> int:
+        return self._index.get(word.upper(), -1)
+
+    def add(self, word: str) -> None:
+        """Set ``word`` in the first free slot; a no-op if set or full."""
+        word = word.upper()
+        if word in self._index:
+            return
+        for idx, flag in enumerate(self):
+            if not flag:
+                self[idx] = word
+                return
+
+    def discard(self, word: str) -> None:
+        idx = self.find(word)
+        if idx >= 0:
+            self[idx] = ""
+
+
 @dataclass(slots=True)
 class Inventory:
     ammo: int = 0
@@ -85,7 +409,7 @@ class Inventory:
     inviso_time: int = 0
     score: int = 0
     orig_name: str = ""
-    flags: list[str] = field(default_factory=lambda: [""] * c.NUM_FLAGS)
+    flags: FlagTable = field(default_factory=FlagTable)
     room_time: int = 0
     last_sec: int = 0
     play_flag: bool = False
@@ -114,6 +438,20 @@ class GameWorld:
     inv: Inventory = field(default_factory=Inventory)
     first: FirstFlags = field(default_factory=FirstFlags)
     game_name: str = ""
+    # Distinct program texts, so stats running the same script share one
+    # buffer.  It lives and dies with the world.
+    programs: dict[bytes, bytes] = field(default_factory=dict, repr=False, compare=False)
+
+    def intern_program(self, data: bytes) -> bytes:
+        """Return the buffer this world shares for ``data``'s program text."""
+        if not data:
+            return b""
+        data = bytes(data)
+        return self.programs.setdefault(data, data)
+
+    def prune_programs(self) -> None:
+        """Forget texts that no stat holds any more."""
+        self.programs = {text: text for room in self.rooms for text in room.objs.inside if text}
 
 
 def make_default_room() -> Room:
@@ -0,0 +1,140 @@
+"""Offline rendering of ZZT music to WAV files.
+
+Note bytes are stepped exactly like `SoundEngine._timer_step` (one step per
+`TIMER_INTERVAL_MS`, a note holding for ``speed * duration`` steps), but
+against a sample clock instead of the wall clock, using the same note table,
+square waves and drum digits as the live speaker.  Drum digits come from the
+`SoundEngine`'s RNG, so callers inside the game pass the engine's ``sound``;
+only the command line falls back to a fixed-seed engine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import wave
+from array import array
+from pathlib import Path
+
+from .model import GameWorld
+from .sound import AMPLITUDE, TIMER_INTERVAL_MS, SoundEngine, digit_samples, square_wave
+from .world import load_world
+
+SAMPLE_RATE = 44100
+
+
+def standalone_sound() -> SoundEngine:
+    """Fixed-seed sound engine for renders made outside a running game."""
+    return SoundEngine(random.Random(0))
+
+
+def render_pcm(
+    seq: bytes,
+    sound: SoundEngine,
+    sample_rate: int = SAMPLE_RATE,
+    amplitude: int = AMPLITUDE,
+) -> array:
+    """Mono signed 16-bit samples for the note sequence ``seq`` as ``sound`` plays it."""
+    out = array("h")
+    steps = 0
+    tones: dict[int, array] = {}
+    drums: dict[int, array] = {}
+    for pos in range(0, len(seq) - 1, 2):
+        note, duration = seq[pos], seq[pos + 1]
+        start = steps * sample_rate * TIMER_INTERVAL_MS // 1000
+        steps += max(1, sound.sound_speed * duration)
+        length = steps * sample_rate * TIMER_INTERVAL_MS // 1000 - start
+        if note == 0 or (note >= 0xF0 and note - 0xF0 > 9):
+            out.extend(array("h", [0]) * length)
+        elif note < 0xF0:
+            freq = sound._note_table[note]
+            period = tones.get(freq)
+            if period is None:
+                period = tones[freq] = square_wave(sample_rate, freq, amplitude)
+            out.extend((period * (length // len(period) + 1))[:length])
+        else:
+            digit = note - 0xF0
+            clip = drums.get(digit)
+            if clip is None:
+                clip = drums[digit] = digit_samples(sample_rate, sound._digits[digit], amplitude)
+            clip = clip[:length]
+            out.extend(clip)
+            out.extend(array("h", [0]) * (length - len(clip)))
+    return out
+
+
+def write_wav(path: str | Path, samples: array, sample_rate: int = SAMPLE_RATE) -> None:
+    with wave.open(str(path), "wb") as fh:
+        fh.setnchannels(1)
+        fh.setsampwidth(2)
+        fh.setframerate(sample_rate)
+        fh.writeframes(samples.tobytes() if sys.byteorder == "little" else _swapped(samples))
+
+
+def _swapped(samples: array) -> bytes:
+    copy = array("h", samples)
+    copy.byteswap()
+    return copy.tobytes()
+
+
+def play_lines(program: bytes) -> list[str]:
+    """The music notation of each ``#play`` line in an object's program."""
+    tunes = []
+    for line in program.decode("cp437", errors="replace").split("\r"):
+        line = line.strip()
+        if line[:5].upper() == "#PLAY":
+            tunes.append("".join(line[5:].split()))
+    return tunes
+
+
+def world_tunes(world: GameWorld) -> list[tuple[int, int, str]]:
+    """``(board, stat, notation)`` for every object that plays music, one tune per object."""
+    found = []
+    for board, room in enumerate(world.rooms):
+        for idx, program in enumerate(room.objs.inside):
+            tunes = play_lines(program)
+            if tunes:
+                found.append((board, idx, "".join(tunes)))
+    return found
+
+
+def export_world(
+    path: str | Path,
+    out_dir: str | Path,
+    sound: SoundEngine,
+    sample_rate: int = SAMPLE_RATE,
+) -> list[Path]:
+    world = load_world(str(path))
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for board, idx, notation in world_tunes(world):
+        target = out_dir / f"{Path(path).stem}_b{board:02d}_s{idx:03d}.wav"
+        write_wav(target, render_pcm(sound.music(notation), sound, sample_rate), sample_rate)
+        written.append(target)
+    return written
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Render ZZT #play music to WAV files")
+    p.add_argument("source", help="World file, or music notation with --notation")
+    p.add_argument("-o", "--output", required=True, help="Output directory (or .wav file with --notation)")
+    p.add_argument("--notation", action="store_true", help="Treat SOURCE as #play notation")
+    p.add_argument("--rate", type=int, default=SAMPLE_RATE)
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    sound = standalone_sound()
+    if args.notation:
+        write_wav(args.output, render_pcm(sound.music(args.source), sound, args.rate), args.rate)
+        print(args.output)
+        return
+    for path in export_world(args.source, args.output, sound, args.rate):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
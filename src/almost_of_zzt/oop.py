@@ -1,48 +1,110 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 from . import constants as c
 from . import sound as snd
-from .model import BoardCell
+from .model import BoardCell, new_bind_id
+from .oopcode import (
+    C_ALIGNED,
+    C_ANY,
+    C_BLOCKED,
+    C_CONTACT,
+    C_ENERGIZED,
+    C_FLAG,
+    C_NOT,
+    D_CCW,
+    D_CONST,
+    D_CW,
+    D_FLOW,
+    D_RND,
+    D_RNDNE,
+    D_RNDNS,
+    D_RNDP,
+    D_SEEK,
+    L_BLANK,
+    L_CMD,
+    L_EMPTY_CMD,
+    L_MOVE,
+    L_SKIP,
+    OP_BECOME,
+    OP_BIND,
+    OP_CHANGE,
+    OP_CHAR,
+    OP_CLEAR,
+    OP_CYCLE,
+    OP_DIE,
+    OP_DIR_HALT,
+    OP_END,
+    OP_ENDGAME,
+    OP_GIVE,
+    OP_GO,
+    OP_HALT,
+    OP_IDLE,
+    OP_IF,
+    OP_LABEL,
+    OP_LOCK,
+    OP_NOP,
+    OP_PLAY,
+    OP_PUT,
+    OP_RESTART,
+    OP_RESTORE,
+    OP_SEND,
+    OP_SET,
+    OP_SHOOT,
+    OP_THROWSTAR,
+    OP_TRY,
+    OP_UNLOCK,
+    OP_WALK,
+    OP_ZAP,
+    Program,
+    compile_dir,
+    kind_names,
+)
 
 if TYPE_CHECKING:
     from .engine import GameEngine
 
+# Outcomes of one command, in place of Pascal's flag variables.
+R_NEXT, R_POLL, R_REDO, R_HALT, R_JUMP, R_DIE = range(6)
+
 
 @dataclass(slots=True)
 class OOPRunner:
+    PROGRAM_CACHE_SIZE = 512
+
     engine: "GameEngine"
+    _programs: dict[bytes, Program] = field(default_factory=dict, repr=False)
+    _kinds: dict[str, int] | None = field(default=None, repr=False)
+    _die_cell: BoardCell | None = field(default=None, repr=False)
+
+    def program(self, buf: bytes) -> Program:
+        """The compiled form of ``buf``, shared by every object running it."""
+        prog = self._programs.get(buf)
+        if prog is None:
+            if self._kinds is None:
+                self._kinds = kind_names(self.engine.info)
+            if len(self._programs) >= self.PROGRAM_CACHE_SIZE:
+                self._programs.clear()
+            prog = self._programs[buf] = Program(buf, self._kinds)
+        return prog
+
+    def clear_programs(self) -> None:
+        """Drop every compiled program; called when the engine swaps worlds."""
+        self._programs.clear()
 
     def flag_num(self, word: str) -> int:
-        word_u = word.upper()
-        for idx, flag in enumerate(self.engine.world.inv.flags):
-            if flag.upper() == word_u and flag:
-                return idx
-        return -1
+        return self.engine.world.inv.flags.find(word)
 
     def set_flag(self, word: str) -> None:
-        if self.flag_num(word) >= 0:
-            return
-        for idx, flag in enumerate(self.engine.world.inv.flags):
-            if not flag:
-                self.engine.world.inv.flags[idx] = word.upper()
-                return
+        self.engine.world.inv.flags.add(word)
 
     def clear_flag(self, word: str) -> None:
-        idx = self.flag_num(word)
-        if idx >= 0:
-            self.engine.world.inv.flags[idx] = ""
+        self.engine.world.inv.flags.discard(word)
 
     def _object_name(self, obj_idx: int) -> str:
-        obj = self.engine.room.objs[obj_idx]
-        if not obj.inside:
-            return ""
-        first = obj.inside.split(b"\r", 1)[0].decode("cp437", errors="replace").strip()
-        if first.startswith("@"):
-            return first[1:].strip().upper()
-        return ""
+        return self.program(self.engine.room.objs[obj_idx].inside).name
 
     def _iter_targets(self, sender: int, target: str) -> list[int]:
         target_u = target.upper()
@@ -62,28 +124,8 @@ class OOPRunner:
         return found
 
     def _find_label(self, obj_idx: int, label: str, before: str = ":") -> int:
-        data = self.engine.room.objs[obj_idx].inside
-        if not data:
-            return -1
-
-        pat = ("\r" + before + label.upper()).encode("cp437")
-        up = data.upper()
-        pos = 0
-        while True:
-            idx = up.find(pat, pos)
-            if idx < 0:
-                return -1
-            end = idx + len(pat)
-            next_b = up[end : end + 1]
-            if not next_b:
-                return idx
-            ch = next_b[0]
-            # Match Pascal LSeek boundary behavior: letters and underscore
-            # continue words; digits do not block a match.
-            is_word = (ord("A") <= ch <= ord("Z")) or ch == ord("_")
-            if not is_word:
-                return idx
-            pos = idx + 1
+        objs = self.engine.room.objs
+        return self.program(objs.inside[obj_idx]).find_label(label, before, objs.label_flips[obj_idx])
 
     def lsend_msg(self, sender: int, msg: str, ignore_lock: bool = False) -> bool:
         extern = sender < 0
@@ -112,31 +154,6 @@ class OOPRunner:
 
         return changed_sender
 
-    def _xupcase(self, value: str) -> str:
-        return "".join(ch.upper() for ch in value if ch.isalnum())
-
-    def _parse_kind(self, tokens: list[str], start: int) -> tuple[BoardCell | None, int]:
-        if start >= len(tokens):
-            return None, start
-
-        idx = start
-        color = 0
-        tok = tokens[idx].upper()
-
-        for ci in range(1, 8):
-            if tok == c.COLORS[ci].upper():
-                color = ci + 8
-                idx += 1
-                if idx >= len(tokens):
-                    return None, idx
-                tok = tokens[idx].upper()
-                break
-
-        for kind in range(c.NUM_CLASSES + 1):
-            if tok == self._xupcase(self.engine.info[kind].descr):
-                return BoardCell(kind, color), idx + 1
-        return None, idx + 1
-
     def _real_color(self, cell: BoardCell) -> int:
         info = self.engine.info[cell.kind]
         if info.col < 0xF0:
@@ -188,144 +205,77 @@ class OOPRunner:
             room.board[x][y].color = temp_color
 
     def _note_dir(self, obj_idx: int, tokens: list[str], idx: int) -> tuple[tuple[int, int] | None, int]:
-        if idx >= len(tokens):
-            return None, idx
-
-        obj = self.engine.room.objs[obj_idx]
-        tok = tokens[idx].upper()
-
-        if tok in {"N", "NORTH"}:
-            return (0, -1), idx + 1
-        if tok in {"S", "SOUTH"}:
-            return (0, 1), idx + 1
-        if tok in {"E", "EAST"}:
-            return (1, 0), idx + 1
-        if tok in {"W", "WEST"}:
-            return (-1, 0), idx + 1
-        if tok in {"I", "IDLE"}:
-            return (0, 0), idx + 1
-        if tok == "SEEK":
-            return self.engine.seek_player(obj.x, obj.y), idx + 1
-        if tok == "FLOW":
-            return (obj.xd, obj.yd), idx + 1
-        if tok == "RND":
-            return self.engine.pick_random_dir(), idx + 1
-        if tok == "RNDNS":
-            return (0, -1 if self.engine.random.randrange(2) == 0 else 1), idx + 1
-        if tok == "RNDNE":
-            return ((0, -1) if self.engine.random.randrange(2) == 0 else (1, 0)), idx + 1
-
-        if tok in {"CW", "CCW", "RNDP", "OPP"}:
-            base, j = self._note_dir(obj_idx, tokens, idx + 1)
-            if base is None:
-                return None, j
-            dx, dy = base
-            if tok == "CW":
-                return (-dy, dx), j
-            if tok == "CCW":
-                return (dy, -dx), j
-            if tok == "RNDP":
-                if self.engine.random.randrange(2) == 0:
-                    return (-dy, dx), j
-                return (dy, -dx), j
-            return (-dx, -dy), j
-
-        return None, idx + 1
-
-    def _eval_condition(self, obj_idx: int, tokens: list[str], idx: int) -> tuple[bool, int]:
+        node, j = compile_dir(tokens, idx)
+        if node is None:
+            return None, j
+        return self._eval_dir(self.engine.room.objs[obj_idx], node), j
+
+    def _eval_dir(self, obj, node: tuple) -> tuple[int, int]:
+        op = node[0]
+        if op == D_CONST:
+            return node[1], node[2]
+        if op == D_SEEK:
+            return self.engine.seek_player(obj.x, obj.y)
+        if op == D_FLOW:
+            return obj.xd, obj.yd
+        if op == D_RND:
+            return self.engine.pick_random_dir()
+        if op == D_RNDNS:
+            return 0, -1 if self.engine.random.randrange(2) == 0 else 1
+        if op == D_RNDNE:
+            return (0, -1) if self.engine.random.randrange(2) == 0 else (1, 0)
+        dx, dy = self._eval_dir(obj, node[1])
+        if op == D_CW:
+            return -dy, dx
+        if op == D_CCW:
+            return dy, -dx
+        if op == D_RNDP:
+            if self.engine.random.randrange(2) == 0:
+                return -dy, dx
+            return dy, -dx
+        return -dx, -dy  # D_OPP
+
+    def _eval_condition(self, obj, cond: tuple) -> bool:
+        op = cond[0]
+        if op == C_FLAG:
+            return self.flag_num(cond[1]) >= 0
         room = self.engine.room
-        obj = room.objs[obj_idx]
-
-        if idx >= len(tokens):
-            return False, idx
-
-        tok = tokens[idx].upper()
-
-        if tok == "NOT":
-            res, j = self._eval_condition(obj_idx, tokens, idx + 1)
-            return (not res), j
-
-        if tok in {"ALLIGNED", "ALIGNED"}:
-            return (obj.x == room.objs[0].x or obj.y == room.objs[0].y), idx + 1
-
-        if tok == "CONTACT":
-            return ((obj.x - room.objs[0].x) ** 2 + (obj.y - room.objs[0].y) ** 2) == 1, idx + 1
-
-        if tok == "BLOCKED":
-            d, j = self._note_dir(obj_idx, tokens, idx + 1)
-            if d is None:
-                return False, j
-            dx, dy = d
-            return (not self.engine.info[room.board[obj.x + dx][obj.y + dy].kind].go_thru), j
-
-        if tok == "ENERGIZED":
-            return self.engine.world.inv.ener_time > 0, idx + 1
-
-        if tok == "ANY":
-            target, j = self._parse_kind(tokens, idx + 1)
-            if target is None:
-                return False, j
-            found = self._locate_kind(0, 1, target) is not None
-            return found, j
-
-        return self.flag_num(tok) >= 0, idx + 1
+        if op == C_NOT:
+            return not self._eval_condition(obj, cond[1])
+        if op == C_ALIGNED:
+            player = room.objs[0]
+            return obj.x == player.x or obj.y == player.y
+        if op == C_CONTACT:
+            player = room.objs[0]
+            return ((obj.x - player.x) ** 2 + (obj.y - player.y) ** 2) == 1
+        if op == C_BLOCKED:
+            dx, dy = self._eval_dir(obj, cond[1])
+            return not self.engine.info[room.board[obj.x + dx][obj.y + dy].kind].go_thru
+        if op == C_ENERGIZED:
+            return self.engine.world.inv.ener_time > 0
+        if op == C_ANY:
+            return self._locate_kind(0, 1, BoardCell(cond[1], cond[2])) is not None
+        return False
 
     def _set_oop_char(self, obj_idx: int, code: int) -> None:
         obj = self.engine.room.objs[obj_idx]
         obj.intel = code
 
-    def _apply_take_or_give(self, tokens: list[str], idx: int, take: bool) -> tuple[bool, int]:
-        if idx >= len(tokens):
-            return False, idx
-
-        item = tokens[idx].upper()
-        idx += 1
-        if idx >= len(tokens):
-            return False, idx
-
-        try:
-            amount = int(tokens[idx])
-        except ValueError:
-            return False, idx + 1
-        idx += 1
-
-        if amount <= 0:
-            return True, idx
-
-        if take:
-            amount = -amount
-
-        inv = self.engine.world.inv
-
-        if item == "HEALTH":
-            current = inv.strength
-            setter = lambda v: setattr(inv, "strength", v)
-        elif item == "AMMO":
-            current = inv.ammo
-            setter = lambda v: setattr(inv, "ammo", v)
-        elif item == "GEMS":
-            current = inv.gems
-            setter = lambda v: setattr(inv, "gems", v)
-        elif item == "TORCHES":
-            current = inv.torches
-            setter = lambda v: setattr(inv, "torches", v)
-        elif item == "SCORE":
-            current = inv.score
-            setter = lambda v: setattr(inv, "score", v)
-        elif item == "TIME":
-            current = inv.room_time
-            setter = lambda v: setattr(inv, "room_time", v)
-        else:
-            return True, idx
-
-        if current + amount < 0:
-            return False, idx
-
-        setter(current + amount)
-        return True, idx
+    def _flip_labels(self, obj_idx: int, lines: list[int]) -> None:
+        """Swap the label markers after ``lines`` for this stat and all stats bound to it."""
+        objs = self.engine.room.objs
+        old = objs.label_flips[obj_idx]
+        new = old.symmetric_difference(ofs + 1 for ofs in lines)
+        bind = objs.bind[obj_idx]
+        if bind == 0:
+            objs.label_flips[obj_idx] = new
+            return
+        inside = objs.inside[obj_idx]
+        for idx, other in enumerate(objs.bind):
+            if other == bind and objs.inside[idx] is inside and objs.label_flips[idx] == old:
+                objs.label_flips[idx] = new
 
     def _zap_label(self, sender: int, msg: str) -> None:
-        room = self.engine.room
         dest_obj = 0
         while True:
             target = None
@@ -339,393 +289,258 @@ class OOPRunner:
 
             label = msg.split(":", 1)[1] if ":" in msg else msg
             ofs = self._find_label(dest_obj, label, before=":")
-            if ofs < 0:
-                continue
-            old_inside = room.objs[dest_obj].inside
-            data = bytearray(old_inside)
-            if ofs + 1 < len(data):
-                data[ofs + 1] = ord("'")
-                new_inside = bytes(data)
-                for obj in room.objs:
-                    if obj.inside is old_inside:
-                        obj.inside = new_inside
+            if ofs >= 0:
+                self._flip_labels(dest_obj, [ofs])
 
     def _restore_label(self, sender: int, msg: str) -> None:
-        room = self.engine.room
         label = msg.split(":", 1)[1] if ":" in msg else msg
+        objs = self.engine.room.objs
         for dest_obj in self._iter_targets(sender, msg.split(":", 1)[0] if ":" in msg else "SELF"):
-            while True:
-                ofs = self._find_label(dest_obj, label, before="'")
-                if ofs < 0:
-                    break
-                old_inside = room.objs[dest_obj].inside
-                data = bytearray(old_inside)
-                if ofs + 1 < len(data):
-                    data[ofs + 1] = ord(":")
-                    new_inside = bytes(data)
-                    for obj in room.objs:
-                        if obj.inside is old_inside:
-                            obj.inside = new_inside
-                else:
-                    break
-
-    def _exec_command(
-        self,
-        obj_idx: int,
-        tokens: list[str],
-        idx: int,
-    ) -> tuple[bool, bool, bool, int, bool, BoardCell | None]:
-        """Run one command.
-
-        Returns tuple:
-        (poll, redo, halt, next_idx, die_flag, die_cell).
-        next_idx is -1 for commands that changed the sender offset and
-        should continue from that offset (Pascal NewLineF=false behavior).
-        """
-        room = self.engine.room
-        obj = room.objs[obj_idx]
-
-        if idx >= len(tokens):
-            return False, False, False, idx, False, None
-
-        cmd = tokens[idx].upper()
-        idx += 1
-
-        if cmd == "THEN":
-            if idx >= len(tokens):
-                return False, False, False, idx, False, None
-            cmd = tokens[idx].upper()
-            idx += 1
-
-        if cmd == "GO":
-            d, j = self._note_dir(obj_idx, tokens, idx)
-            if d is None:
-                return False, False, True, j, False, None
-            idx = j
-            dx, dy = d
-            tx, ty = obj.x + dx, obj.y + dy
-            if not self.engine.info[room.board[tx][ty].kind].go_thru:
-                self.engine.push(tx, ty, dx, dy)
-            if self.engine.info[room.board[tx][ty].kind].go_thru:
-                self.engine.move_obj(obj_idx, tx, ty)
-                return True, False, False, idx, False, None
-            return False, True, False, idx, False, None
-
-        if cmd == "TRY":
-            d, j = self._note_dir(obj_idx, tokens, idx)
-            if d is None:
-                return False, False, True, j, False, None
-            idx = j
-            dx, dy = d
-            tx, ty = obj.x + dx, obj.y + dy
-            if not self.engine.info[room.board[tx][ty].kind].go_thru:
-                self.engine.push(tx, ty, dx, dy)
-            if self.engine.info[room.board[tx][ty].kind].go_thru:
-                self.engine.move_obj(obj_idx, tx, ty)
-                return True, False, False, idx, False, None
+            zapped = self.program(objs.inside[dest_obj]).find_labels(label, "'", objs.label_flips[dest_obj])
+            if zapped:
+                self._flip_labels(dest_obj, zapped)
+
+    def _move(self, obj_idx: int, obj, dx: int, dy: int) -> bool:
+        engine = self.engine
+        board = engine.room.board
+        tx, ty = obj.x + dx, obj.y + dy
+        if not engine.info[board[tx][ty].kind].go_thru:
+            engine.push(tx, ty, dx, dy)
+        if engine.info[board[tx][ty].kind].go_thru:
+            engine.move_obj(obj_idx, tx, ty)
+            return True
+        return False
+
+    def _run(self, obj_idx: int, obj, op: tuple) -> int:
+        """Execute one compiled command for the stat at ``obj_idx``; returns an ``R_*`` outcome."""
+        code = op[0]
+        if code == OP_IF:
+            if self._eval_condition(obj, op[1]):
+                return self._run(obj_idx, obj, op[2])
+            return R_NEXT
+        if code == OP_SET:
+            self.set_flag(op[1])
+            return R_NEXT
+        if code == OP_CLEAR:
+            self.clear_flag(op[1])
+            return R_NEXT
+        if code == OP_LABEL:
+            if self.lsend_msg(obj_idx, op[1], ignore_lock=False):
+                return R_JUMP
+            if ":" not in op[1]:
+                obj.offset = -1
+                self.engine.put_bot_msg(200, f"ERR: Bad command {op[1]}")
+                self.engine.sound_add(5, snd.SFX_OOP_ERROR)
+                return R_HALT
+            return R_NEXT
+        if code == OP_SEND:
+            return R_JUMP if self.lsend_msg(obj_idx, op[1], ignore_lock=False) else R_NEXT
+        if code == OP_GO:
+            dx, dy = self._eval_dir(obj, op[1])
+            return R_POLL if self._move(obj_idx, obj, dx, dy) else R_REDO
+        if code == OP_TRY:
+            dx, dy = self._eval_dir(obj, op[1])
+            if self._move(obj_idx, obj, dx, dy):
+                return R_POLL
             # Pascal uses `goto GetCmd` here to run same-line fallback command.
-            return self._exec_command(obj_idx, tokens, idx)
-
-        if cmd == "WALK":
-            d, j = self._note_dir(obj_idx, tokens, idx)
-            if d is not None:
-                obj.xd, obj.yd = d
-            return False, False, False, j, False, None
-
-        if cmd == "SET":
-            if idx < len(tokens):
-                self.set_flag(tokens[idx])
-                idx += 1
-            return False, False, False, idx, False, None
-
-        if cmd == "CLEAR":
-            if idx < len(tokens):
-                self.clear_flag(tokens[idx])
-                idx += 1
-            return False, False, False, idx, False, None
-
-        if cmd == "IF":
-            ok, j = self._eval_condition(obj_idx, tokens, idx)
-            idx = j
-            if ok:
-                return self._exec_command(obj_idx, tokens, idx)
-            return False, False, False, idx, False, None
-
-        if cmd == "SHOOT":
-            d, j = self._note_dir(obj_idx, tokens, idx)
-            if d is not None:
-                if self.engine.try_fire(c.BULLET, obj.x, obj.y, d[0], d[1], 1):
-                    self.engine.sound_add(2, snd.SFX_OOP_SHOOT)
-            return True, False, False, j, False, None
-
-        if cmd == "THROWSTAR":
-            d, j = self._note_dir(obj_idx, tokens, idx)
-            if d is not None:
-                self.engine.try_fire(c.SBOMB, obj.x, obj.y, d[0], d[1], 1)
-            return True, False, False, j, False, None
-
-        if cmd in {"GIVE", "TAKE"}:
-            ok, j = self._apply_take_or_give(tokens, idx, take=(cmd == "TAKE"))
-            if ok:
-                return False, False, False, j, False, None
-            return self._exec_command(obj_idx, tokens, j)
-
-        if cmd == "END":
-            room.objs[obj_idx].offset = -1
-            return False, False, True, idx, False, None
-
-        if cmd == "ENDGAME":
+            return self._run(obj_idx, self.engine.room.objs[obj_idx], op[2])
+        if code == OP_WALK:
+            if op[1] is not None:
+                obj.xd, obj.yd = self._eval_dir(obj, op[1])
+            return R_NEXT
+        if code == OP_GIVE:
+            inv = self.engine.world.inv
+            value = getattr(inv, op[1]) + op[2]
+            if value < 0:
+                return self._run(obj_idx, obj, op[3])
+            setattr(inv, op[1], value)
+            return R_NEXT
+        if code == OP_NOP:
+            return R_NEXT
+        if code == OP_HALT:
+            return R_HALT
+        if code == OP_IDLE:
+            return R_POLL
+        if code == OP_END:
+            obj.offset = -1
+            return R_HALT
+        if code == OP_RESTART:
+            obj.offset = 0
+            return R_HALT
+        if code == OP_CYCLE:
+            obj.cycle = op[1]
+            return R_NEXT
+        if code == OP_CHAR:
+            self._set_oop_char(obj_idx, op[1])
+            return R_NEXT
+        if code == OP_SHOOT or code == OP_THROWSTAR:
+            if op[1] is not None:
+                dx, dy = self._eval_dir(obj, op[1])
+                if code == OP_SHOOT:
+                    if self.engine.try_fire(c.BULLET, obj.x, obj.y, dx, dy, 1):
+                        self.engine.sound_add(2, snd.SFX_OOP_SHOOT)
+                else:
+                    self.engine.try_fire(c.SBOMB, obj.x, obj.y, dx, dy, 1)
+            return R_POLL
+        if code == OP_LOCK:
+            obj.rate = 1
+            return R_NEXT
+        if code == OP_UNLOCK:
+            obj.rate = 0
+            return R_NEXT
+        if code == OP_ZAP:
+            self._zap_label(obj_idx, op[1])
+            return R_NEXT
+        if code == OP_RESTORE:
+            self._restore_label(obj_idx, op[1])
+            return R_NEXT
+        if code == OP_PLAY:
+            music = self.engine.sound_music(op[1])
+            if music:
+                self.engine.sound_add(-1, music)
+            return R_NEXT
+        if code == OP_ENDGAME:
             self.engine.world.inv.strength = 0
-            return False, False, False, idx, False, None
-
-        if cmd == "IDLE":
-            return True, False, False, idx, False, None
-
-        if cmd == "RESTART":
-            room.objs[obj_idx].offset = 0
-            return False, False, True, idx, False, None
-
-        if cmd == "ZAP":
-            if idx < len(tokens):
-                self._zap_label(obj_idx, tokens[idx])
-                idx += 1
-            return False, False, False, idx, False, None
-
-        if cmd == "RESTORE":
-            if idx < len(tokens):
-                self._restore_label(obj_idx, tokens[idx])
-                idx += 1
-            return False, False, False, idx, False, None
-
-        if cmd == "LOCK":
-            room.objs[obj_idx].rate = 1
-            return False, False, False, idx, False, None
-
-        if cmd == "UNLOCK":
-            room.objs[obj_idx].rate = 0
-            return False, False, False, idx, False, None
-
-        if cmd == "SEND":
-            if idx < len(tokens):
-                changed_sender = self.lsend_msg(obj_idx, tokens[idx], ignore_lock=False)
-                idx += 1
-                if changed_sender:
-                    return False, False, False, -1, False, None
-            return False, False, False, idx, False, None
-
-        if cmd == "BIND":
-            if idx < len(tokens):
-                target = tokens[idx]
-                idx += 1
-                dest = None
-                for candidate in self._iter_targets(obj_idx, target):
-                    dest = candidate
-                    break
-                if dest is not None:
-                    room.objs[obj_idx].inside = room.objs[dest].inside
-                    room.objs[obj_idx].offset = 0
-                    return False, False, False, -1, False, None
-            return False, False, False, idx, False, None
-
-        if cmd == "BECOME":
-            target, j = self._parse_kind(tokens, idx)
-            if target is None:
-                return False, False, True, j, False, None
-            return False, False, False, j, True, target
-
-        if cmd == "PUT":
-            d, j = self._note_dir(obj_idx, tokens, idx)
-            if d is None:
-                return False, False, True, j, False, None
-            idx = j
-            target, j = self._parse_kind(tokens, idx)
-            if target is None:
-                return False, False, True, j, False, None
-            idx = j
-            dx, dy = d
+            return R_NEXT
+        if code == OP_DIE:
+            self._die_cell = BoardCell(c.EMPTY, 0x0F)
+            return R_DIE
+        if code == OP_BECOME:
+            self._die_cell = BoardCell(op[1], op[2])
+            return R_DIE
+        if code == OP_PUT:
+            dx, dy = self._eval_dir(obj, op[1])
             if dx == 0 and dy == 0:
-                return False, False, True, idx, False, None
+                return R_HALT
             tx, ty = obj.x + dx, obj.y + dy
             if 1 <= tx <= c.XS and 1 <= ty <= c.YS:
-                if not self.engine.info[room.board[tx][ty].kind].go_thru:
+                if not self.engine.info[self.engine.room.board[tx][ty].kind].go_thru:
                     self.engine.push(tx, ty, dx, dy)
-                self._change_cell(tx, ty, target)
-            return False, False, False, idx, False, None
-
-        if cmd == "CHANGE":
-            src, j = self._parse_kind(tokens, idx)
-            if src is None:
-                return False, False, True, j, False, None
-            idx = j
-            dst, j = self._parse_kind(tokens, idx)
-            if dst is None:
-                return False, False, True, j, False, None
-            idx = j
-
-            if dst.color == 0 and self.engine.info[dst.kind].col < 0xF0:
-                dst.color = self.engine.info[dst.kind].col
-
+                self._change_cell(tx, ty, BoardCell(op[2], op[3]))
+            return R_NEXT
+        if code == OP_DIR_HALT:
+            self._eval_dir(obj, op[1])
+            return R_HALT
+        if code == OP_CHANGE:
+            src = BoardCell(op[1], op[2])
+            dst_kind, dst_color = op[3], op[4]
+            if dst_color == 0 and self.engine.info[dst_kind].col < 0xF0:
+                dst_color = self.engine.info[dst_kind].col
             x, y = 0, 1
             while True:
                 found = self._locate_kind(x, y, src)
                 if found is None:
                     break
                 x, y = found
-                self._change_cell(x, y, BoardCell(dst.kind, dst.color))
-            return False, False, False, idx, False, None
-
-        if cmd == "PLAY":
-            music = self.engine.sound_music("".join(tokens[idx:]))
-            if music:
-                self.engine.sound_add(-1, music)
-            return False, False, False, len(tokens), False, None
-
-        if cmd == "CYCLE":
-            if idx < len(tokens):
-                try:
-                    val = int(tokens[idx])
-                    if val > 0:
-                        room.objs[obj_idx].cycle = val
-                except ValueError:
-                    pass
-                idx += 1
-            return False, False, False, idx, False, None
-
-        if cmd == "CHAR":
-            if idx < len(tokens):
-                try:
-                    val = int(tokens[idx])
-                    if 0 < val <= 255:
-                        self._set_oop_char(obj_idx, val)
-                except ValueError:
-                    pass
-                idx += 1
-            return False, False, False, idx, False, None
-
-        if cmd == "DIE":
-            return False, False, False, idx, True, BoardCell(c.EMPTY, 0x0F)
-
-        changed_sender = self.lsend_msg(obj_idx, cmd, ignore_lock=False)
-        if changed_sender:
-            return False, False, False, -1, False, None
-        if ":" not in cmd:
-            room.objs[obj_idx].offset = -1
-            self.engine.put_bot_msg(200, f"ERR: Bad command {cmd}")
-            self.engine.sound_add(5, snd.SFX_OOP_ERROR)
-            return False, False, True, idx, False, None
-        return False, False, False, idx, False, None
+                self._change_cell(x, y, BoardCell(dst_kind, dst_color))
+            return R_NEXT
+        if code == OP_BIND:
+            room = self.engine.room
+            dest = None
+            for candidate in self._iter_targets(obj_idx, op[1]):
+                dest = candidate
+                break
+            if dest is None:
+                return R_NEXT
+            src = room.objs[dest]
+            if src.bind == 0:
+                src.bind = new_bind_id()
+            obj.inside = src.inside
+            obj.label_flips = src.label_flips
+            obj.bind = src.bind
+            obj.offset = 0
+            return R_JUMP
+        raise ValueError(f"Unknown opcode {code}")
 
     def exec_obj(self, obj_idx: int, title: str = "Interaction") -> None:
         room = self.engine.room
         if not (0 <= obj_idx <= room.num_objs):
             return
 
-        obj = room.objs[obj_idx]
-        if obj.offset < 0:
-            return
-
-        if not obj.inside:
+        objs = room.objs
+        # Offsets and programs are read and written by index through the
+        # columns, as Pascal does; `obj` is refetched whenever stats move.
+        offsets, insides = objs.offset, objs.inside
+        ofs = offsets[obj_idx]
+        if ofs < 0 or not insides[obj_idx]:
             return
 
-        ofs = obj.offset
+        obj = objs[obj_idx]
         cmds_exec = 0
         text_lines: list[str] = []
+        version = objs.version
+        prog = None
 
         while cmds_exec <= 32:
-            buf = room.objs[obj_idx].inside
+            buf = insides[obj_idx]
             if not (0 <= ofs < len(buf)):
                 break
+            if prog is None or prog.buf is not buf:
+                prog = self.program(buf)
 
             start_ofs = ofs
-            next_cr = buf.find(b"\r", ofs)
-            if next_cr < 0:
-                line_b = buf[ofs:]
-                ofs = len(buf)
-            else:
-                line_b = buf[ofs:next_cr]
-                ofs = next_cr + 1
+            kind, ofs, payload = prog[start_ofs]
 
-            raw = line_b.decode("cp437", errors="replace")
-            stripped = raw.strip()
-            if not stripped:
-                if text_lines:
-                    text_lines.append("")
-                continue
+            if kind == L_CMD:
+                cmds_exec += 1
+                if objs.version != version:
+                    version = objs.version
+                    obj = objs[obj_idx]
+                result = self._run(obj_idx, obj, payload)
+                if result == R_NEXT:
+                    offsets[obj_idx] = ofs
+                    continue
+                if result == R_JUMP:
+                    ofs = offsets[obj_idx]
+                    continue
+                if result == R_POLL:
+                    offsets[obj_idx] = ofs
+                    return
+                if result == R_REDO:
+                    offsets[obj_idx] = start_ofs
+                    return
+                if result == R_DIE:
+                    ox, oy = objs.x[obj_idx], objs.y[obj_idx]
+                    self.engine.zap_obj(obj_idx)
+                    self._change_cell(ox, oy, self._die_cell)
+                    return
+                if offsets[obj_idx] < 0:
+                    ofs = len(buf)
+                elif offsets[obj_idx] == 0:
+                    ofs = 0
+                else:
+                    offsets[obj_idx] = ofs
+                break
 
-            if stripped.startswith(":"):
+            if kind == L_SKIP:
                 continue
-            if stripped.startswith("'"):
+            if kind == L_BLANK:
+                if text_lines:
+                    text_lines.append("")
                 continue
-            if stripped.startswith("@"):
+            if kind == L_EMPTY_CMD:
+                cmds_exec += 1
                 continue
 
-            if stripped.startswith("/") or stripped.startswith("?"):
-                redo = stripped.startswith("/")
-                parts = stripped[1:].strip().split()
-                d, _ = self._note_dir(obj_idx, parts, 0)
+            if kind == L_MOVE:
+                redo, d = payload
                 if d is None:
-                    room.objs[obj_idx].offset = ofs
+                    offsets[obj_idx] = ofs
                     return
-                dx, dy = d
+                if objs.version != version:
+                    obj = objs[obj_idx]
+                dx, dy = self._eval_dir(obj, d)
                 if dx != 0 or dy != 0:
-                    tx, ty = room.objs[obj_idx].x + dx, room.objs[obj_idx].y + dy
-                    if not self.engine.info[room.board[tx][ty].kind].go_thru:
-                        self.engine.push(tx, ty, dx, dy)
-                    if self.engine.info[room.board[tx][ty].kind].go_thru:
-                        self.engine.move_obj(obj_idx, tx, ty)
-                        room.objs[obj_idx].offset = ofs
+                    if self._move(obj_idx, obj, dx, dy):
+                        offsets[obj_idx] = ofs
                         return
-                if redo:
-                    room.objs[obj_idx].offset = start_ofs
-                else:
-                    room.objs[obj_idx].offset = ofs
+                offsets[obj_idx] = start_ofs if redo else ofs
                 return
 
-            if stripped.startswith("#"):
-                cmds_exec += 1
-                tokens = stripped[1:].strip().split()
-                if not tokens:
-                    continue
-
-                poll, redo, halt, next_idx, die_flag, die_cell = self._exec_command(obj_idx, tokens, 0)
-
-                if die_flag and die_cell is not None:
-                    ox, oy = room.objs[obj_idx].x, room.objs[obj_idx].y
-                    self.engine.zap_obj(obj_idx)
-                    self._change_cell(ox, oy, die_cell)
-                    return
-
-                if halt:
-                    if room.objs[obj_idx].offset < 0:
-                        ofs = len(buf)
-                    elif room.objs[obj_idx].offset == 0:
-                        ofs = 0
-                    else:
-                        room.objs[obj_idx].offset = ofs
-                    break
-
-                if redo:
-                    room.objs[obj_idx].offset = start_ofs
-                    return
+            text_lines.append(payload)
 
-                if poll:
-                    room.objs[obj_idx].offset = ofs
-                    return
-
-                if next_idx == -1:
-                    ofs = room.objs[obj_idx].offset
-                    continue
-
-                room.objs[obj_idx].offset = ofs
-                continue
-
-            text_lines.append(raw)
-
-        buf = room.objs[obj_idx].inside
-        if ofs >= len(buf):
-            room.objs[obj_idx].offset = -1
-        else:
-            room.objs[obj_idx].offset = ofs
+        buf = insides[obj_idx]
+        offsets[obj_idx] = -1 if ofs >= len(buf) else ofs
 
         if text_lines:
             if len(text_lines) == 1:
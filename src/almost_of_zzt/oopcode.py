@@ -0,0 +1,361 @@
+"""ZZT-OOP compiled to nested opcode tuples.
+
+A program buffer is compiled one line at a time, on first use, keyed by the
+line's start offset; execution still walks byte offsets exactly as the
+Pascal interpreter does, so labels, `#send` jumps and saved offsets keep
+their meaning.  A command line becomes an op tuple whose first element is
+an ``OP_*`` code.  Directions, conditions, kinds, flag names and numbers
+are resolved at compile time; anything that consumes randomness or reads
+the board is left as a small node evaluated when the op runs.  Ops that
+halt or do nothing because of a bad argument carry a trailing ``P_*`` tag
+naming what was wrong; the runner ignores it and the linter reports it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from . import constants as c
+
+# Line kinds: (kind, next_ofs, payload)
+L_BLANK, L_SKIP, L_TEXT, L_MOVE, L_CMD, L_EMPTY_CMD = range(6)
+
+# Direction nodes.
+D_CONST, D_SEEK, D_FLOW, D_RND, D_RNDNS, D_RNDNE, D_CW, D_CCW, D_RNDP, D_OPP = range(10)
+
+# Condition nodes.
+C_FALSE, C_NOT, C_ALIGNED, C_CONTACT, C_BLOCKED, C_ENERGIZED, C_ANY, C_FLAG = range(8)
+
+# Problem tags on (OP_HALT, P_*), (OP_NOP, P_ITEM) and (C_FALSE, P_*).
+P_DIRECTION, P_KIND, P_ITEM, P_CONDITION = "direction", "kind", "item", "condition"
+
+(
+    OP_NOP,
+    OP_HALT,
+    OP_GO,
+    OP_TRY,
+    OP_WALK,
+    OP_SET,
+    OP_CLEAR,
+    OP_IF,
+    OP_SHOOT,
+    OP_THROWSTAR,
+    OP_GIVE,
+    OP_END,
+    OP_ENDGAME,
+    OP_IDLE,
+    OP_RESTART,
+    OP_ZAP,
+    OP_RESTORE,
+    OP_LOCK,
+    OP_UNLOCK,
+    OP_SEND,
+    OP_BIND,
+    OP_BECOME,
+    OP_PUT,
+    OP_DIR_HALT,
+    OP_CHANGE,
+    OP_PLAY,
+    OP_CYCLE,
+    OP_CHAR,
+    OP_DIE,
+    OP_LABEL,
+) = range(30)
+
+COMMANDS = frozenset(
+    (
+        "THEN", "GO", "TRY", "WALK", "SET", "CLEAR", "IF", "SHOOT", "THROWSTAR", "GIVE", "TAKE", "END",
+        "ENDGAME", "IDLE", "RESTART", "ZAP", "RESTORE", "LOCK", "UNLOCK", "SEND", "BIND", "BECOME", "PUT",
+        "CHANGE", "PLAY", "CYCLE", "CHAR", "DIE",
+    )
+)
+
+_SIMPLE_DIRS = {
+    "N": (D_CONST, 0, -1),
+    "NORTH": (D_CONST, 0, -1),
+    "S": (D_CONST, 0, 1),
+    "SOUTH": (D_CONST, 0, 1),
+    "E": (D_CONST, 1, 0),
+    "EAST": (D_CONST, 1, 0),
+    "W": (D_CONST, -1, 0),
+    "WEST": (D_CONST, -1, 0),
+    "I": (D_CONST, 0, 0),
+    "IDLE": (D_CONST, 0, 0),
+    "SEEK": (D_SEEK,),
+    "FLOW": (D_FLOW,),
+    "RND": (D_RND,),
+    "RNDNS": (D_RNDNS,),
+    "RNDNE": (D_RNDNE,),
+}
+_DIR_MODIFIERS = {"CW": D_CW, "CCW": D_CCW, "RNDP": D_RNDP, "OPP": D_OPP}
+
+_GIVE_ITEMS = {
+    "HEALTH": "strength",
+    "AMMO": "ammo",
+    "GEMS": "gems",
+    "TORCHES": "torches",
+    "SCORE": "score",
+    "TIME": "room_time",
+}
+
+_COLOR_NAMES = {c.COLORS[ci].upper(): ci + 8 for ci in range(1, 8)}
+
+
+def _xupcase(value: str) -> str:
+    return "".join(ch.upper() for ch in value if ch.isalnum())
+
+
+def kind_names(info: Sequence) -> dict[str, int]:
+    """Element names as `#put`/`#change` spell them, first kind winning."""
+    names: dict[str, int] = {}
+    for kind in range(c.NUM_CLASSES + 1):
+        names.setdefault(_xupcase(info[kind].descr), kind)
+    return names
+
+
+def compile_dir(tokens: Sequence[str], idx: int) -> tuple[tuple | None, int]:
+    if idx >= len(tokens):
+        return None, idx
+    tok = tokens[idx].upper()
+    node = _SIMPLE_DIRS.get(tok)
+    if node is not None:
+        return node, idx + 1
+    mod = _DIR_MODIFIERS.get(tok)
+    if mod is not None:
+        base, j = compile_dir(tokens, idx + 1)
+        if base is None:
+            return None, j
+        return (mod, base), j
+    return None, idx + 1
+
+
+def compile_kind(tokens: Sequence[str], idx: int, kinds: dict[str, int]) -> tuple[tuple[int, int] | None, int]:
+    if idx >= len(tokens):
+        return None, idx
+    tok = tokens[idx].upper()
+    color = _COLOR_NAMES.get(tok, 0)
+    if color:
+        idx += 1
+        if idx >= len(tokens):
+            return None, idx
+        tok = tokens[idx].upper()
+    kind = kinds.get(tok)
+    if kind is None:
+        return None, idx + 1
+    return (kind, color), idx + 1
+
+
+def compile_condition(tokens: Sequence[str], idx: int, kinds: dict[str, int]) -> tuple[tuple, int]:
+    if idx >= len(tokens):
+        return (C_FALSE, P_CONDITION), idx
+    tok = tokens[idx].upper()
+    if tok == "NOT":
+        inner, j = compile_condition(tokens, idx + 1, kinds)
+        return (C_NOT, inner), j
+    if tok in ("ALLIGNED", "ALIGNED"):
+        return (C_ALIGNED,), idx + 1
+    if tok == "CONTACT":
+        return (C_CONTACT,), idx + 1
+    if tok == "BLOCKED":
+        d, j = compile_dir(tokens, idx + 1)
+        return ((C_FALSE, P_DIRECTION) if d is None else (C_BLOCKED, d)), j
+    if tok == "ENERGIZED":
+        return (C_ENERGIZED,), idx + 1
+    if tok == "ANY":
+        target, j = compile_kind(tokens, idx + 1, kinds)
+        return ((C_FALSE, P_KIND) if target is None else (C_ANY, *target)), j
+    return (C_FLAG, tok), idx + 1
+
+
+def _int(tok: str) -> int | None:
+    try:
+        return int(tok)
+    except ValueError:
+        return None
+
+
+def compile_command(tokens: Sequence[str], idx: int, kinds: dict[str, int]) -> tuple:
+    """Compile the command starting at ``tokens[idx]``; trailing tokens are ignored."""
+    n = len(tokens)
+    if idx >= n:
+        return (OP_NOP,)
+    cmd = tokens[idx].upper()
+    idx += 1
+    if cmd == "THEN":
+        if idx >= n:
+            return (OP_NOP,)
+        cmd = tokens[idx].upper()
+        idx += 1
+
+    if cmd in ("GO", "TRY"):
+        d, j = compile_dir(tokens, idx)
+        if d is None:
+            return (OP_HALT, P_DIRECTION)
+        if cmd == "GO":
+            return (OP_GO, d)
+        return (OP_TRY, d, compile_command(tokens, j, kinds))
+    if cmd == "WALK":
+        return (OP_WALK, compile_dir(tokens, idx)[0])
+    if cmd in ("SET", "CLEAR", "ZAP", "RESTORE", "SEND", "BIND"):
+        if idx >= n:
+            return (OP_NOP,)
+        op = {"SET": OP_SET, "CLEAR": OP_CLEAR, "ZAP": OP_ZAP, "RESTORE": OP_RESTORE, "SEND": OP_SEND, "BIND": OP_BIND}[cmd]
+        return (op, tokens[idx])
+    if cmd == "IF":
+        cond, j = compile_condition(tokens, idx, kinds)
+        return (OP_IF, cond, compile_command(tokens, j, kinds))
+    if cmd in ("SHOOT", "THROWSTAR"):
+        return (OP_SHOOT if cmd == "SHOOT" else OP_THROWSTAR, compile_dir(tokens, idx)[0])
+    if cmd in ("GIVE", "TAKE"):
+        if idx >= n:
+            return compile_command(tokens, idx, kinds)
+        item = tokens[idx].upper()
+        idx += 1
+        if idx >= n:
+            return compile_command(tokens, idx, kinds)
+        amount = _int(tokens[idx])
+        if amount is None:
+            return compile_command(tokens, idx + 1, kinds)
+        idx += 1
+        attr = _GIVE_ITEMS.get(item)
+        if attr is None:
+            return (OP_NOP, P_ITEM)
+        if amount <= 0:
+            return (OP_NOP,)
+        return (OP_GIVE, attr, -amount if cmd == "TAKE" else amount, compile_command(tokens, idx, kinds))
+    if cmd == "END":
+        return (OP_END,)
+    if cmd == "ENDGAME":
+        return (OP_ENDGAME,)
+    if cmd == "IDLE":
+        return (OP_IDLE,)
+    if cmd == "RESTART":
+        return (OP_RESTART,)
+    if cmd == "LOCK":
+        return (OP_LOCK,)
+    if cmd == "UNLOCK":
+        return (OP_UNLOCK,)
+    if cmd == "BECOME":
+        target, _ = compile_kind(tokens, idx, kinds)
+        return (OP_HALT, P_KIND) if target is None else (OP_BECOME, *target)
+    if cmd == "PUT":
+        d, j = compile_dir(tokens, idx)
+        if d is None:
+            return (OP_HALT, P_DIRECTION)
+        target, _ = compile_kind(tokens, j, kinds)
+        # The direction is still evaluated (and may draw a random number).
+        return (OP_DIR_HALT, d) if target is None else (OP_PUT, d, *target)
+    if cmd == "CHANGE":
+        src, j = compile_kind(tokens, idx, kinds)
+        if src is None:
+            return (OP_HALT, P_KIND)
+        dst, _ = compile_kind(tokens, j, kinds)
+        if dst is None:
+            return (OP_HALT, P_KIND)
+        return (OP_CHANGE, *src, *dst)
+    if cmd == "PLAY":
+        return (OP_PLAY, "".join(tokens[idx:]))
+    if cmd in ("CYCLE", "CHAR"):
+        val = _int(tokens[idx]) if idx < n else None
+        if cmd == "CYCLE":
+            return (OP_CYCLE, val) if val is not None and val > 0 else (OP_NOP,)
+        return (OP_CHAR, val) if val is not None and 0 < val <= 255 else (OP_NOP,)
+    if cmd == "DIE":
+        return (OP_DIE,)
+    # Anything else is a label to send to, or an error if it has no target.
+    return (OP_LABEL, cmd)
+
+
+def compile_line(buf: bytes, ofs: int, kinds: dict[str, int]) -> tuple:
+    """Compile the line starting at ``ofs``: ``(L_*, next_ofs, payload)``."""
+    next_cr = buf.find(b"\r", ofs)
+    if next_cr < 0:
+        line_b, next_ofs = buf[ofs:], len(buf)
+    else:
+        line_b, next_ofs = buf[ofs:next_cr], next_cr + 1
+    raw = line_b.decode("cp437", errors="replace")
+    stripped = raw.strip()
+    if not stripped:
+        return (L_BLANK, next_ofs, None)
+    lead = stripped[0]
+    if lead in ":'@":
+        return (L_SKIP, next_ofs, None)
+    if lead in "/?":
+        d, _ = compile_dir(stripped[1:].strip().split(), 0)
+        return (L_MOVE, next_ofs, (lead == "/", d))
+    if lead == "#":
+        tokens = stripped[1:].strip().split()
+        if not tokens:
+            return (L_EMPTY_CMD, next_ofs, None)
+        return (L_CMD, next_ofs, compile_command(tokens, 0, kinds))
+    return (L_TEXT, next_ofs, raw)
+
+
+class Program(dict):
+    """Compiled lines of one program buffer, keyed by start offset.
+
+    Lines compile on first lookup.  Label lines and the object's ``@name``
+    are cached here too, since they only depend on the buffer; whether a
+    label is currently zapped comes from the caller's ``flips``.
+    """
+
+    __slots__ = ("buf", "kinds", "labels", "_name")
+
+    def __init__(self, buf: bytes, kinds: dict[str, int]) -> None:
+        super().__init__()
+        self.buf = buf
+        self.kinds = kinds
+        self.labels: dict[str, tuple[int, ...]] = {}
+        self._name: str | None = None
+
+    def __missing__(self, ofs: int) -> tuple:
+        line = self[ofs] = compile_line(self.buf, ofs, self.kinds)
+        return line
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            first = self.buf.split(b"\r", 1)[0].decode("cp437", errors="replace").strip()
+            self._name = first[1:].strip().upper() if first.startswith("@") else ""
+        return self._name
+
+    def label_lines(self, label: str) -> tuple[int, ...]:
+        """Offsets of the ``\\r`` before every ``:label`` or ``'label`` line."""
+        label = label.upper()
+        lines = self.labels.get(label)
+        if lines is None:
+            lines = self.labels[label] = _scan_labels(self.buf, label)
+        return lines
+
+    def find_labels(self, label: str, before: str = ":", flips: frozenset[int] = frozenset()) -> list[int]:
+        """Label lines currently marked ``before``, once ``flips`` are applied."""
+        mark = ord(before)
+        buf = self.buf
+        return [ofs for ofs in self.label_lines(label) if (buf[ofs + 1] == mark) != (ofs + 1 in flips)]
+
+    def find_label(self, label: str, before: str = ":", flips: frozenset[int] = frozenset()) -> int:
+        mark = ord(before)
+        buf = self.buf
+        for ofs in self.label_lines(label):
+            if (buf[ofs + 1] == mark) != (ofs + 1 in flips):
+                return ofs
+        return -1
+
+
+def _scan_labels(data: bytes, label: str) -> tuple[int, ...]:
+    up = data.upper()
+    found = []
+    for before in ":'":
+        pat = ("\r" + before + label).encode("cp437")
+        pos = 0
+        while True:
+            idx = up.find(pat, pos)
+            if idx < 0:
+                break
+            pos = idx + 1
+            next_b = up[idx + len(pat) : idx + len(pat) + 1]
+            # Match Pascal LSeek boundary behavior: letters and underscore
+            # continue words; digits do not block a match.
+            if not next_b or not (ord("A") <= next_b[0] <= ord("Z") or next_b[0] == ord("_")):
+                found.append(idx)
+    return tuple(sorted(found))
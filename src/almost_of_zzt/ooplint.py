@@ -0,0 +1,375 @@
+"""Offline checks for object scripts.
+
+Every object program is compiled with `oopcode`, exactly as the runner would,
+and the result is checked for what only shows up during play today: commands
+that are neither built in nor a label of the object (``ERR: Bad command``),
+bad directions, kinds and items, `#send`/`#zap`/`#bind` targets and labels
+that do not exist on the board (noting when the target lives on another
+board), labels nothing can send to, flags tested but never set anywhere in
+the world, and board exits or passages leading to missing boards.
+`lint_paths` checks whole directories of worlds on a process pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from . import constants as c
+from .info import init_info_play
+from .model import GameWorld, Room
+from .oopcode import (
+    C_FALSE,
+    C_FLAG,
+    C_NOT,
+    L_CMD,
+    L_MOVE,
+    L_TEXT,
+    OP_BIND,
+    OP_DIR_HALT,
+    OP_GIVE,
+    OP_HALT,
+    OP_IF,
+    OP_LABEL,
+    OP_NOP,
+    OP_RESTORE,
+    OP_SEND,
+    OP_SET,
+    OP_SHOOT,
+    OP_THROWSTAR,
+    OP_TRY,
+    OP_WALK,
+    OP_ZAP,
+    P_CONDITION,
+    P_DIRECTION,
+    P_ITEM,
+    P_KIND,
+    Program,
+    kind_names,
+)
+from .pool import map_in_processes
+from .world import load_world
+
+ERROR, WARNING = "error", "warning"
+
+# Labels the engine sends by itself.
+BUILTIN_LABELS = frozenset(("TOUCH", "SHOT", "BOMBED", "THUD", "ENERGIZE"))
+
+_PROBLEMS = {
+    P_DIRECTION: ("bad-direction", "bad or missing direction"),
+    P_KIND: ("bad-kind", "unknown or missing element kind"),
+    P_ITEM: ("bad-item", "unknown #give/#take item"),
+    P_CONDITION: ("bad-condition", "missing #if condition"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Issue:
+    world: str
+    board: int
+    stat: int
+    x: int
+    y: int
+    line: int
+    severity: str
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        where = f"board {self.board}"
+        if self.stat >= 0:
+            where += f" stat {self.stat} ({self.x},{self.y})"
+        if self.line:
+            where += f" line {self.line}"
+        return f"{self.world}: {where}: {self.severity}: {self.message} [{self.code}]"
+
+
+@dataclass(slots=True)
+class LintReport:
+    world: str
+    boards: int = 0
+    objects: int = 0
+    issues: list[Issue] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def errors(self) -> int:
+        return sum(issue.severity == ERROR for issue in self.issues)
+
+
+@dataclass(slots=True)
+class _Ref:
+    line: int
+    verb: str
+    msg: str
+
+    def __str__(self) -> str:
+        if self.verb == "command":
+            return f"#{self.msg}"
+        if self.verb == "link":
+            return f"!{self.msg}"
+        return f"#{self.verb} {self.msg}"
+
+
+@dataclass(slots=True)
+class _Script:
+    stat: int
+    x: int
+    y: int
+    prog: Program
+    lines: dict[int, int] = field(default_factory=dict)
+    refs: list[_Ref] = field(default_factory=list)
+    reached: set[int] = field(default_factory=set)
+
+
+class _WorldLint:
+    def __init__(self, world: GameWorld, name: str) -> None:
+        self.world = world
+        self.report = LintReport(name, boards=len(world.rooms))
+        self.kinds = kind_names(init_info_play())
+        self.programs: dict[bytes, Program] = {}
+        self.names: dict[str, set[int]] = {}
+        self.flags_set: set[str] = set()
+        self.flags_tested: dict[str, tuple[int, _Script, int]] = {}
+
+    def issue(self, board: int, script: _Script | None, line: int, severity: str, code: str, message: str) -> None:
+        stat, x, y = (script.stat, script.x, script.y) if script else (-1, 0, 0)
+        self.report.issues.append(Issue(self.report.world, board, stat, x, y, line, severity, code, message))
+
+    def check_passage(self, board: int, room: Room, stat: int) -> None:
+        objs = room.objs
+        x, y, dest = objs.x[stat], objs.y[stat], objs.room[stat]
+        if 1 <= x <= c.XS and 1 <= y <= c.YS and room.board[x][y].kind == c.PASSAGE and dest >= len(self.world.rooms):
+            text = f"passage leads to missing board {dest}"
+            self.report.issues.append(Issue(self.report.world, board, stat, x, y, 0, ERROR, "bad-passage", text))
+
+    def run(self) -> LintReport:
+        boards = [self.scan_board(index, room) for index, room in enumerate(self.world.rooms)]
+        for index, scripts in enumerate(boards):
+            self.resolve_board(index, scripts)
+        for flag, (board, script, line) in sorted(self.flags_tested.items()):
+            if flag not in self.flags_set:
+                self.issue(board, script, line, WARNING, "flag-never-set", f"flag {flag} is tested but never #set")
+        self.report.issues.sort(key=lambda i: (i.board, i.stat, i.line, i.code))
+        return self.report
+
+    def scan_board(self, index: int, room: Room) -> list[_Script]:
+        for side, dest in zip("NSWE", room.room_info.room_udlr):
+            if dest >= len(self.world.rooms):
+                self.issue(index, None, 0, ERROR, "bad-exit", f"{side} exit leads to missing board {dest}")
+
+        objs = room.objs
+        scripts = []
+        for stat in range(len(objs)):
+            self.check_passage(index, room, stat)
+            buf = objs.inside[stat]
+            if not buf:
+                continue
+            prog = self.programs.get(buf)
+            if prog is None:
+                prog = self.programs[buf] = Program(buf, self.kinds)
+            script = _Script(stat, objs.x[stat], objs.y[stat], prog)
+            self.scan_script(index, script)
+            scripts.append(script)
+            if prog.name:
+                self.names.setdefault(prog.name, set()).add(index)
+        self.report.objects += len(scripts)
+        return scripts
+
+    def scan_script(self, board: int, script: _Script) -> None:
+        prog = script.prog
+        ofs, line = 0, 0
+        while ofs < len(prog.buf):
+            line += 1
+            script.lines[ofs] = line
+            kind, next_ofs, payload = prog[ofs]
+            if kind == L_CMD:
+                self.scan_op(board, script, line, payload)
+            elif kind == L_MOVE and payload[1] is None:
+                self.scan_move(board, script, line, prog.buf[ofs:next_ofs].decode("cp437", errors="replace"))
+            elif kind == L_TEXT and payload.startswith("!") and not payload.startswith("!-"):
+                script.refs.append(_Ref(line, "link", payload[1:].split(";", 1)[0].strip()))
+            ofs = next_ofs
+
+    def scan_move(self, board: int, script: _Script, line: int, text: str) -> None:
+        # The runner reads one direction per movement line and stops the
+        # object on anything else, so "/n/n?w#send go" never moves or sends.
+        text = text.strip()
+        if any(ch in text[1:] for ch in "/?#"):
+            detail = f"{text!r} packs several steps or a command onto one line, which this runner does not run"
+        else:
+            detail = f"bad or missing direction in {text!r}"
+        self.issue(board, script, line, ERROR, "bad-direction", detail)
+
+    def scan_op(self, board: int, script: _Script, line: int, op: tuple) -> None:
+        code = op[0]
+        if (code == OP_HALT or code == OP_NOP) and len(op) > 1 or code == OP_DIR_HALT:
+            problem = P_KIND if code == OP_DIR_HALT else op[1]
+            name, text = _PROBLEMS[problem]
+            self.issue(board, script, line, ERROR if code != OP_NOP else WARNING, name, text)
+        elif code in (OP_WALK, OP_SHOOT, OP_THROWSTAR) and op[1] is None:
+            self.issue(board, script, line, ERROR, "bad-direction", "bad or missing direction")
+        elif code == OP_IF:
+            self.scan_condition(board, script, line, op[1])
+            self.scan_op(board, script, line, op[2])
+        elif code == OP_TRY:
+            self.scan_op(board, script, line, op[2])
+        elif code == OP_GIVE:
+            self.scan_op(board, script, line, op[3])
+        elif code == OP_SET:
+            self.flags_set.add(op[1].upper())
+        elif code in _REF_VERBS:
+            script.refs.append(_Ref(line, _REF_VERBS[code], op[1]))
+
+    def scan_condition(self, board: int, script: _Script, line: int, cond: tuple) -> None:
+        if cond[0] == C_NOT:
+            self.scan_condition(board, script, line, cond[1])
+        elif cond[0] == C_FLAG:
+            self.flags_tested.setdefault(cond[1], (board, script, line))
+        elif cond[0] == C_FALSE and len(cond) > 1:
+            name, text = _PROBLEMS[cond[1]]
+            self.issue(board, script, line, ERROR, name, f"{text} in #if")
+
+    def resolve_board(self, board: int, scripts: list[_Script]) -> None:
+        by_name: dict[str, list[_Script]] = {}
+        for script in scripts:
+            by_name.setdefault(script.prog.name, []).append(script)
+
+        for script in scripts:
+            for ref in script.refs:
+                target, sep, label = ref.msg.partition(":")
+                if not sep:
+                    target, label = "SELF", ref.msg
+                if ref.verb == "bind":
+                    target, label = ref.msg, ""
+                dests = self.targets(script, target.upper(), scripts, by_name)
+                if dests is None:
+                    elsewhere = sorted(self.names.get(target.upper(), set()) - {board})
+                    if elsewhere:
+                        boards = ", ".join(map(str, elsewhere))
+                        text = f"{ref} targets {target}, which is only on board(s) {boards}"
+                        self.issue(board, script, ref.line, WARNING, "target-elsewhere", text)
+                    else:
+                        self.issue(board, script, ref.line, ERROR, "missing-target", f"no object @{target} for {ref}")
+                    continue
+                if not label or label.upper() == "RESTART" or not dests:
+                    continue
+                found = False
+                for dest in dests:
+                    # Only :label lines answer a message; 'label lines count
+                    # just for #restore, which turns them back into labels.
+                    if ref.verb == "restore":
+                        lines = dest.prog.label_lines(label)
+                    else:
+                        lines = dest.prog.find_labels(label, ":")
+                    dest.reached.update(lines)
+                    found = found or bool(lines)
+                if found:
+                    continue
+                if ref.verb == "command" and not sep:
+                    self.issue(board, script, ref.line, ERROR, "bad-command", f"#{label} is not a command or a label here")
+                else:
+                    self.issue(board, script, ref.line, WARNING, "missing-label", f"no :{label} in {target} for {ref}")
+
+        for script in scripts:
+            self.unreached_labels(board, script)
+
+    def targets(self, script: _Script, target: str, scripts: list[_Script], by_name: dict) -> list[_Script] | None:
+        if target in ("", "SELF"):
+            return [script] if script.stat > 0 else []
+        if target == "ALL":
+            return [s for s in scripts if s.stat > 0]
+        if target == "OTHERS":
+            return [s for s in scripts if s.stat > 0 and s is not script]
+        return by_name.get(target) or None
+
+    def unreached_labels(self, board: int, script: _Script) -> None:
+        buf = script.prog.buf
+        for start, line in script.lines.items():
+            if buf[start : start + 1] != b":" or (start - 1) in script.reached:
+                continue
+            label = _label_name(buf, start + 1)
+            if label in BUILTIN_LABELS:
+                continue
+            if start == 0:
+                self.issue(board, script, line, WARNING, "unreachable-label", f":{label} on the first line is never found")
+            else:
+                self.issue(board, script, line, WARNING, "unreachable-label", f"nothing sends to :{label}")
+
+
+_REF_VERBS = {OP_SEND: "send", OP_LABEL: "command", OP_ZAP: "zap", OP_RESTORE: "restore", OP_BIND: "bind"}
+
+
+def _label_name(buf: bytes, ofs: int) -> str:
+    end = ofs
+    while end < len(buf) and (chr(buf[end]).isalnum() or buf[end] == ord("_")):
+        end += 1
+    return buf[ofs:end].decode("cp437", errors="replace").upper()
+
+
+def lint_world(world: GameWorld, name: str = "") -> LintReport:
+    return _WorldLint(world, name or world.game_name).run()
+
+
+def lint_file(path: str | Path) -> LintReport:
+    path = Path(path)
+    try:
+        world = load_world(str(path))
+    except (OSError, ValueError) as exc:
+        return LintReport(path.name, error=str(exc))
+    return lint_world(world, path.name)
+
+
+def world_paths(targets: list[str | Path], exts: tuple[str, ...] = (c.WORLD_EXT,)) -> list[Path]:
+    """``targets`` with directories expanded to the worlds below them."""
+    paths: list[Path] = []
+    for target in map(Path, targets):
+        if target.is_dir():
+            paths.extend(sorted(p for p in target.rglob("*") if p.suffix.upper() in exts and p.is_file()))
+        else:
+            paths.append(target)
+    return paths
+
+
+def lint_paths(targets: list[str | Path], workers: int | None = None) -> list[LintReport]:
+    """Lint every world under ``targets`` on a process pool; reports keep path order."""
+    return map_in_processes(lint_file, world_paths(targets), workers)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Check ZZT-OOP object scripts without running them")
+    p.add_argument("paths", nargs="+", help="World files or directories of worlds")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.add_argument("--errors-only", action="store_true", help="Leave out warnings")
+    p.add_argument("--json", action="store_true", help="Print reports as JSON")
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Exits with status 1 when any error (not warning) is found."""
+    args = build_parser().parse_args(argv)
+    reports = lint_paths(args.paths, args.workers)
+    if args.errors_only:
+        for report in reports:
+            report.issues = [issue for issue in report.issues if issue.severity == ERROR]
+
+    if args.json:
+        json.dump([asdict(r) for r in reports], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for report in reports:
+            if report.error:
+                print(f"{report.world}: {report.error}")
+            for issue in report.issues:
+                print(issue)
+        issues = sum(len(r.issues) for r in reports)
+        print(f"{len(reports)} worlds, {sum(r.objects for r in reports)} objects, {issues} issues")
+    if any(r.errors or r.error for r in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Trace-driven parity harness.
+
+A trace is a gzip'd JSON-lines file.  The first line is a header naming the
+world, RNG kind and seed, and the per-tick input tokens (see `batch`).  Each
+following line is one tick: the board cells, stats and inventory fields that
+changed since the previous tick.  Checking a trace replays the inputs
+headlessly and reports the first tick where the engine's state differs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import constants as c
+from .batch import BatchEngine, BatchJob, RandomWalkBot, control_token, running, start_job
+from .model import STAT_COLUMNS
+
+TRACE_FORMAT = 1
+
+_PLANE_H = c.YS + 2
+_PLANE_SIZE = (c.XS + 2) * _PLANE_H
+_STAT_ROW = (*STAT_COLUMNS, "under_kind", "under_color")
+_INV_FIELDS = ("ammo", "gems", "strength", "torches", "score", "room", "torch_time", "ener_time")
+
+
+@dataclass(slots=True)
+class Trace:
+    world: str
+    seed: int = 0
+    rng: str = "pascal"
+    inputs: tuple[str, ...] = ()
+    ticks: list[dict] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class Divergence:
+    tick: int
+    where: str
+    expected: object
+    actual: object
+
+    def __str__(self) -> str:
+        return f"tick {self.tick}: {self.where} expected {self.expected!r}, got {self.actual!r}"
+
+
+@dataclass(slots=True)
+class _Frame:
+    room: int = -1
+    kinds: bytes = b""
+    colors: bytes = b""
+    stats: list[tuple[int, ...]] = field(default_factory=list)
+    inv: tuple = ()
+
+
+def _capture(engine: BatchEngine) -> _Frame:
+    cells = [cell for column in engine.room.board for cell in column]
+    objs = engine.room.objs
+    inv = engine.world.inv
+    return _Frame(
+        room=inv.room,
+        kinds=bytes([cell.kind for cell in cells]),
+        colors=bytes([cell.color for cell in cells]),
+        stats=list(zip(*(getattr(objs, name) for name in _STAT_ROW))),
+        inv=(*(getattr(inv, name) for name in _INV_FIELDS), *map(int, inv.keys)),
+    )
+
+
+def _delta(prev: _Frame, cur: _Frame) -> dict:
+    rec: dict = {}
+    if cur.room != prev.room:
+        rec["room"] = cur.room
+        prev = _Frame(kinds=bytes(_PLANE_SIZE), colors=bytes(_PLANE_SIZE))
+    if cur.kinds != prev.kinds or cur.colors != prev.colors:
+        rec["cells"] = [
+            [i, k, col]
+            for i, (k, col, pk, pc) in enumerate(zip(cur.kinds, cur.colors, prev.kinds, prev.colors))
+            if k != pk or col != pc
+        ]
+    if cur.stats != prev.stats:
+        rec["n"] = len(cur.stats)
+        rec["stats"] = [[i, *row] for i, row in enumerate(cur.stats) if i >= len(prev.stats) or prev.stats[i] != row]
+    if cur.inv != prev.inv:
+        rec["inv"] = list(cur.inv)
+    return rec
+
+
+def _apply(frame: _Frame, rec: dict) -> _Frame:
+    kinds, colors = frame.kinds, frame.colors
+    if "room" in rec:
+        frame.room = rec["room"]
+        kinds = colors = bytes(_PLANE_SIZE)
+    if "cells" in rec:
+        kinds, colors = bytearray(kinds), bytearray(colors)
+        for i, k, col in rec["cells"]:
+            kinds[i] = k
+            colors[i] = col
+    frame.kinds, frame.colors = bytes(kinds), bytes(colors)
+    if "stats" in rec:
+        stats = frame.stats[: rec["n"]]
+        stats.extend([()] * (rec["n"] - len(stats)))
+        for i, *row in rec["stats"]:
+            stats[i] = tuple(row)
+        frame.stats = stats
+    if "inv" in rec:
+        frame.inv = tuple(rec["inv"])
+    return frame
+
+
+def _first_difference(tick: int, expected: _Frame, actual: _Frame) -> Divergence | None:
+    if expected.room != actual.room:
+        return Divergence(tick, "board", expected.room, actual.room)
+    if expected.kinds != actual.kinds or expected.colors != actual.colors:
+        for i, (ek, ec, ak, ac) in enumerate(zip(expected.kinds, expected.colors, actual.kinds, actual.colors)):
+            if ek != ak or ec != ac:
+                x, y = divmod(i, _PLANE_H)
+                return Divergence(tick, f"cell ({x},{y}) kind/color", (ek, ec), (ak, ac))
+    if expected.stats != actual.stats:
+        if len(expected.stats) != len(actual.stats):
+            return Divergence(tick, "stat count", len(expected.stats), len(actual.stats))
+        for idx, (erow, arow) in enumerate(zip(expected.stats, actual.stats)):
+            for name, ev, av in zip(_STAT_ROW, erow, arow):
+                if ev != av:
+                    return Divergence(tick, f"stat {idx} {name}", ev, av)
+    if expected.inv != actual.inv:
+        names = (*_INV_FIELDS, *(f"key{k}" for k in range(1, 8)))
+        for name, ev, av in zip(names, expected.inv, actual.inv):
+            if ev != av:
+                return Divergence(tick, f"inventory {name}", ev, av)
+    return None
+
+
+def bot_inputs(seed: int, ticks: int) -> tuple[str, ...]:
+    bot = RandomWalkBot(seed)
+    return tuple(control_token(bot.next_control()) for _ in range(ticks))
+
+
+def record_trace(
+    world: str | Path,
+    ticks: int,
+    seed: int = 0,
+    rng: str = "pascal",
+    inputs: tuple[str, ...] | None = None,
+) -> Trace:
+    """Play ``world`` for up to ``ticks`` and record the per-tick deltas.
+
+    Without ``inputs`` the seeded random-walk bot's moves are recorded.
+    """
+    if inputs is None:
+        inputs = bot_inputs(seed, ticks)
+    trace = Trace(world=Path(world).name, seed=seed, rng=rng, inputs=tuple(inputs))
+    engine = start_job(BatchJob(str(world), seed, ticks, trace.inputs, rng))
+    prev = _Frame()
+    for step in range(1, ticks + 1):
+        if not running(engine):
+            break
+        engine._tick_game(step * engine.game_cycle_ms)
+        cur = _capture(engine)
+        trace.ticks.append(_delta(prev, cur))
+        prev = cur
+    return trace
+
+
+def check_trace(trace: Trace, world: str | Path) -> Divergence | None:
+    """Replay ``trace`` on ``world``; return the first divergence, or None."""
+    engine = start_job(BatchJob(str(world), trace.seed, len(trace.ticks), trace.inputs, trace.rng))
+    expected = _Frame()
+    for step, rec in enumerate(trace.ticks, start=1):
+        if not running(engine):
+            return Divergence(step, "end of play", "running", "stopped")
+        engine._tick_game(step * engine.game_cycle_ms)
+        expected = _apply(expected, rec)
+        diff = _first_difference(step, expected, _capture(engine))
+        if diff is not None:
+            return diff
+    return None
+
+
+def write_trace(path: str | Path, trace: Trace) -> None:
+    header = {"format": TRACE_FORMAT, "world": trace.world, "seed": trace.seed, "rng": trace.rng, "inputs": " ".join(trace.inputs)}
+    with gzip.open(path, "wt", encoding="ascii") as fh:
+        fh.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for rec in trace.ticks:
+            fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+
+
+def read_trace(path: str | Path) -> Trace:
+    with gzip.open(path, "rt", encoding="ascii") as fh:
+        header = json.loads(fh.readline())
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError("Unsupported trace format")
+        ticks = [json.loads(line) for line in fh]
+    return Trace(header["world"], header["seed"], header["rng"], tuple(header["inputs"].split()), ticks)
+
+
+def resolve_world(trace_path: str | Path, trace: Trace) -> Path:
+    for base in (Path(trace_path).parent, Path.cwd()):
+        candidate = base / trace.world
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"World {trace.world} for {trace_path} not found")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Record or check golden parity traces")
+    sub = p.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Record a golden trace")
+    rec.add_argument("world")
+    rec.add_argument("-o", "--output", required=True)
+    rec.add_argument("--ticks", type=int, default=2000)
+    rec.add_argument("--seed", type=int, default=0)
+    rec.add_argument("--rng", default="pascal")
+    rec.add_argument("--inputs", help="Input token file (defaults to the random-walk bot)")
+    chk = sub.add_parser("check", help="Replay traces and report the first divergence")
+    chk.add_argument("traces", nargs="+")
+    chk.add_argument("--world", help="World file to use instead of the one named in the trace")
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "record":
+        inputs = None
+        if args.inputs:
+            inputs = tuple(Path(args.inputs).read_text(encoding="latin-1").split())
+        trace = record_trace(args.world, args.ticks, args.seed, args.rng, inputs)
+        write_trace(args.output, trace)
+        print(f"{args.output}: {len(trace.ticks)} ticks")
+        return 0
+
+    failed = 0
+    for path in args.traces:
+        trace = read_trace(path)
+        diff = check_trace(trace, args.world or resolve_world(path, trace))
+        print(f"{path}: {'ok' if diff is None else diff}")
+        failed += diff is not None
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass, field
 from pathlib import Path
 
 import pygame
 
 from . import constants as c
+from .info import InfoDef
+from .model import BoardCell, Room
 
 
 def attr_to_colors(attr: int) -> tuple[tuple[int, int, int], tuple[int, int, int]]:
@@ -73,6 +76,15 @@ class Renderer:
             self.glyph_cache[key] = surf
         self.screen.blit(surf, (x, y))
 
+    def offscreen(self) -> "Renderer":
+        """Return a renderer drawing into a private board-sized surface.
+
+        The twin shares this renderer's font and glyph cache.
+        """
+        twin = copy.copy(self)
+        twin.screen = pygame.Surface((c.BOARD_OFFSET_X + c.XS * c.CELL_W, c.BOARD_OFFSET_Y + c.YS * c.CELL_H))
+        return twin
+
     def clear(self) -> None:
         self.screen.fill((0, 0, 0))
 
@@ -80,3 +92,155 @@ class Renderer:
         for i, ch in enumerate(text):
             b = ch.encode("cp437", errors="replace")[0]
             self.draw_glyph(col + i, row, b, attr)
+
+
+_LINE2_CHARS = (0xF9, 0xD0, 0xD2, 0xBA, 0xB5, 0xBC, 0xBB, 0xB9, 0xC6, 0xC8, 0xC9, 0xCC, 0xCD, 0xCA, 0xCB, 0xCE)
+
+
+def _stat_at(room: Room, x: int, y: int) -> int:
+    objs = room.objs
+    for idx, (ox, oy) in enumerate(zip(objs.x, objs.y)):
+        if ox == x and oy == y:
+            return idx
+    return -1
+
+
+def dynamic_char(room: Room, x: int, y: int, kind: int, info: list[InfoDef], counter: int) -> int:
+    """Glyph for a ``print_dynamic`` kind at ``(x, y)`` on tick ``counter``."""
+    if kind == c.SHOOTER:
+        phase = counter % 8
+        if phase in (0, 1):
+            return 0x18
+        if phase in (2, 3):
+            return 0x1A
+        if phase in (4, 5):
+            return 0x19
+        return 0x1B
+    if kind == c.LINE2:
+        a = 1
+        k = 1
+        for i in range(4):
+            nk = room.board[x + c.UDLR_X[i]][y + c.UDLR_Y[i]].kind
+            if nk in (c.LINE2, c.BOUND):
+                a += k
+            k *= 2
+        return _LINE2_CHARS[max(1, min(16, a)) - 1]
+    if kind == c.CONVEYOR_CW:
+        phase = (counter // max(1, info[c.CONVEYOR_CW].cycle)) % 4
+        return (0xB3, ord("/"), 0xC4, ord("\\"))[phase]
+    if kind == c.CONVEYOR_CCW:
+        phase = (counter // max(1, info[c.CONVEYOR_CCW].cycle)) % 4
+        return (ord("\\"), 0xC4, ord("/"), 0xB3)[phase]
+    if kind == c.BOMB:
+        idx = _stat_at(room, x, y)
+        if idx >= 0:
+            intel = room.objs[idx].intel
+            return 0x0B if intel <= 1 else ord(str(min(9, intel)))
+        return 0x0B
+    if kind == c.XPORTER:
+        idx = _stat_at(room, x, y)
+        if idx >= 0:
+            o = room.objs[idx]
+            h = "^~^-v_v-"
+            v = "(<(|)>)|"
+            xd = (o.xd > 0) - (o.xd < 0)
+            yd = (o.yd > 0) - (o.yd < 0)
+            phase = (counter // max(1, o.cycle)) % 4
+            if o.xd == 0:
+                return ord(h[yd * 2 + 3 + phase - 1])
+            return ord(v[xd * 2 + 3 + phase - 1])
+        return 0xC5
+    if kind == c.SBOMB:
+        return (0xB3, ord("/"), 0xC4, ord("\\"))[counter % 4]
+    if kind == c.DUPER:
+        idx = _stat_at(room, x, y)
+        if idx >= 0:
+            return {1: 0xFA, 2: 0xF9, 3: 0xF8, 4: ord("o"), 5: ord("O")}.get(room.objs[idx].intel, 0xFA)
+        return 0xFA
+    if kind == c.PROG:
+        idx = _stat_at(room, x, y)
+        if idx >= 0:
+            return room.objs[idx].intel & 0xFF
+        return 0x02
+    if kind == c.PUSHER:
+        idx = _stat_at(room, x, y)
+        if idx >= 0:
+            o = room.objs[idx]
+            if o.xd == 1:
+                return 0x10
+            if o.xd == -1:
+                return 0x11
+            if o.yd == -1:
+                return 0x1E
+            return 0x1F
+        return 0x10
+    if kind == c.BLINK_WALL:
+        return 0xCE
+    return info[kind].ch
+
+
+def cell_visible(room: Room, x: int, y: int, info: list[InfoDef], torch_time: int = 0) -> bool:
+    if not room.room_info.is_dark:
+        return True
+    if info[room.board[x][y].kind].show_in_dark:
+        return True
+    if torch_time > 0:
+        p = room.objs[0]
+        if (p.x - x) ** 2 + 2 * (p.y - y) ** 2 < c.TORCH_SIZE:
+            return True
+    return False
+
+
+def _star_color(cell: BoardCell, counter: int, live: bool) -> int:
+    if not live:
+        # Off-board previews (prefetch, thumbnails) must not write the board,
+        # so they derive the colour from the counter instead.
+        return 0x09 + counter % 7
+    # Pascal's ElementStarDraw steps the tile's colour each time the star is
+    # drawn, and only the board in play is ever drawn there.
+    cell.color = 0x09 if cell.color >= 0x0F else cell.color + 1
+    return cell.color
+
+
+def draw_board(
+    renderer: Renderer,
+    room: Room,
+    info: list[InfoDef],
+    counter: int = 0,
+    torch_time: int = 0,
+    hide_player: bool = False,
+    rows: range | None = None,
+    live: bool = False,
+    only_dynamic: bool = False,
+) -> None:
+    """Draw ``room``'s cells; needs only the kind table and a font atlas.
+
+    ``live`` marks the board in play, whose stars step their colour in the
+    board as Pascal's do.  ``only_dynamic`` redraws just the animated cells,
+    for refreshing a board drawn at an earlier tick.
+    """
+    for y in rows or range(1, c.YS + 1):
+        for x in range(1, c.XS + 1):
+            cell = room.board[x][y]
+            kind = cell.kind
+            if only_dynamic and (kind >= c.TEXT_COL or not info[kind].print_dynamic):
+                continue
+            if not cell_visible(room, x, y, info, torch_time):
+                renderer.draw_glyph(x - 1, y - 1, 0xB0, 0x07)
+                continue
+
+            if kind == c.PLAYER and hide_player:
+                renderer.draw_glyph(x - 1, y - 1, ord(" "), 0x0F)
+                continue
+
+            if kind == c.EMPTY:
+                renderer.draw_glyph(x - 1, y - 1, ord(" "), 0x0F)
+            elif kind < c.TEXT_COL:
+                ch = dynamic_char(room, x, y, kind, info, counter) if info[kind].print_dynamic else info[kind].ch
+                color = _star_color(cell, counter, live) if kind == c.SBOMB else cell.color
+                renderer.draw_glyph(x - 1, y - 1, ch, color)
+            elif kind == c.TEXT_COL + c.NUM_TEXT_COLS:
+                renderer.draw_glyph(x - 1, y - 1, cell.color, 0x0F)
+            else:
+                attr = ((kind - c.TEXT_COL + 1) << 4) + 0x0F
+                renderer.draw_glyph(x - 1, y - 1, cell.color, attr)
@@ -0,0 +1,61 @@
+"""Cycle-bucketed stat scheduling.
+
+A stat updates on ticks where ``counter % cycle == index % cycle``.  Grouping
+stat indices by ``(cycle, index % cycle)`` lets a tick visit only the stats
+that are due, in index order, instead of testing every stat.
+"""
+
+from __future__ import annotations
+
+from heapq import merge
+
+from .model import StatTable
+
+
+class CycleScheduler:
+    def __init__(self) -> None:
+        self._table: StatTable | None = None
+        self._version = -1
+        self._size = 0
+        self._buckets: dict[int, dict[int, list[int]]] = {}
+        self._counter: int | None = None
+        self._due: list[int] = []
+
+    def _rebuild(self, table: StatTable) -> None:
+        buckets: dict[int, dict[int, list[int]]] = {}
+        for idx, cyc in enumerate(table.cycle):
+            if cyc != 0:
+                buckets.setdefault(cyc, {}).setdefault(idx % cyc, []).append(idx)
+        self._table = table
+        self._buckets = buckets
+        self._counter = None
+
+    def _sync(self, table: StatTable) -> None:
+        if table is self._table and table.version == self._version:
+            return
+        size = len(table)
+        if table is self._table and table.version == self._version + 1 and size == self._size + 1:
+            # A single append only adds the new highest index to its bucket.
+            idx = size - 1
+            cyc = table.cycle[idx]
+            if cyc != 0:
+                self._buckets.setdefault(cyc, {}).setdefault(idx % cyc, []).append(idx)
+                if self._counter is not None and self._counter % cyc == idx % cyc:
+                    self._due.append(idx)
+        else:
+            self._rebuild(table)
+        self._version = table.version
+        self._size = size
+
+    def due(self, table: StatTable, counter: int) -> list[int]:
+        """Indices due on ``counter``, ascending."""
+        self._sync(table)
+        if counter != self._counter:
+            lists = [by_phase.get(counter % cyc) for cyc, by_phase in self._buckets.items()]
+            lists = [idxs for idxs in lists if idxs]
+            if len(lists) == 1:
+                self._due = list(lists[0])
+            else:
+                self._due = list(merge(*lists))
+            self._counter = counter
+        return self._due
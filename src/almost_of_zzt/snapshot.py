@@ -0,0 +1,337 @@
+"""Fast in-process quick-save snapshots.
+
+`.SAV` files stay the interchange format; snapshots are a private, versioned
+layout tuned for frequent autosaves and rewind.  Each board is stored as two
+column-major byte planes (kind, color) plus packed stat columns, compressed
+per board so that unchanged boards can be reused between captures.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import constants as c
+from .model import BoardCell, FirstFlags, GameWorld, Inventory, Obj, Room, bake_labels, new_bind_id
+from .world import (
+    _pack_inventory,
+    _pack_room_info,
+    _parse_inventory,
+    _parse_room_info,
+    _read_short_string,
+    _write_short_string,
+)
+
+if TYPE_CHECKING:
+    from .engine import GameEngine
+
+
+SNAPSHOT_MAGIC = b"AZQS"
+SNAPSHOT_VERSION = 1
+
+_HEAD = struct.Struct("<4sBhhhhBBhH")
+_ROOM_LEN = struct.Struct("<I")
+_INV_SIZE = len(_pack_inventory(Inventory()))
+_PLANE_W = c.XS + 2
+_PLANE_H = c.YS + 2
+_PLANE_SIZE = _PLANE_W * _PLANE_H
+_FIRST_FIELDS = FirstFlags.__slots__
+_STAT_FIELDS = ("x", "y", "xd", "yd", "cycle", "intel", "rate", "room", "child", "parent", "offset", "bind")
+_NO_PROGRAM = -1
+
+
+def _encode_room_blob(room: Room) -> bytes:
+    out = bytearray(_write_short_string(room.title, 50))
+    cells = [cell for column in room.board for cell in column]
+    out += bytes([cell.kind & 0xFF for cell in cells])
+    out += bytes([cell.color & 0xFF for cell in cells])
+    out += _pack_room_info(room.room_info)
+
+    objs = room.objs
+    out += struct.pack("<H", len(objs))
+    for name in _STAT_FIELDS:
+        out += array("i", getattr(objs, name)).tobytes()
+    out += objs.under_kind.tobytes()
+    out += objs.under_color.tobytes()
+    out += b"".join(pad[:8].ljust(8, b"\x00") for pad in objs.pad)
+
+    programs: dict[bytes, int] = {}
+    texts = map(bake_labels, objs.inside, objs.label_flips)
+    refs = array("i", [programs.setdefault(text, len(programs)) if text else _NO_PROGRAM for text in texts])
+    out += refs.tobytes()
+    out += struct.pack("<H", len(programs))
+    for text in programs:
+        out += _ROOM_LEN.pack(len(text))
+        out += text
+    return zlib.compress(bytes(out), 1)
+
+
+def _decode_room_blob(blob: bytes, world: GameWorld) -> Room:
+    data = memoryview(zlib.decompress(blob))
+    title, ofs = _read_short_string(data, 0, 50)
+    kinds = data[ofs : ofs + _PLANE_SIZE]
+    ofs += _PLANE_SIZE
+    colors = data[ofs : ofs + _PLANE_SIZE]
+    ofs += _PLANE_SIZE
+    board = [
+        list(map(BoardCell, kinds[x * _PLANE_H : (x + 1) * _PLANE_H], colors[x * _PLANE_H : (x + 1) * _PLANE_H]))
+        for x in range(_PLANE_W)
+    ]
+    room_info, ofs = _parse_room_info(data, ofs)
+
+    (count,) = struct.unpack_from("<H", data, ofs)
+    ofs += 2
+    columns: list[array] = []
+    for _ in _STAT_FIELDS:
+        col = array("i")
+        col.frombytes(data[ofs : ofs + count * col.itemsize])
+        ofs += count * col.itemsize
+        columns.append(col)
+    under_kinds = data[ofs : ofs + count]
+    ofs += count
+    under_colors = data[ofs : ofs + count]
+    ofs += count
+    pads = data[ofs : ofs + count * 8]
+    ofs += count * 8
+    refs = array("i")
+    refs.frombytes(data[ofs : ofs + count * refs.itemsize])
+    ofs += count * refs.itemsize
+
+    (num_programs,) = struct.unpack_from("<H", data, ofs)
+    ofs += 2
+    programs: list[bytes] = []
+    for _ in range(num_programs):
+        (length,) = _ROOM_LEN.unpack_from(data, ofs)
+        ofs += _ROOM_LEN.size
+        programs.append(world.intern_program(data[ofs : ofs + length]))
+        ofs += length
+
+    # Bind ids are process-local; give each restored group a fresh one.
+    bind_map: dict[int, int] = {}
+    objs: list[Obj] = []
+    for i in range(count):
+        fields = {name: columns[j][i] for j, name in enumerate(_STAT_FIELDS)}
+        bind = fields.pop("bind")
+        if bind:
+            bind = bind_map.setdefault(bind, new_bind_id())
+        objs.append(
+            Obj(
+                **fields,
+                under=BoardCell(under_kinds[i], under_colors[i]),
+                inside=programs[refs[i]] if refs[i] != _NO_PROGRAM else b"",
+                pad=bytes(pads[i * 8 : i * 8 + 8]),
+                bind=bind,
+            )
+        )
+    return Room(title=title, board=board, objs=objs, room_info=room_info)
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotFrame:
+    """Unjoined snapshot: header+inventory and one compressed blob per board.
+
+    Frames captured back to back share the blob objects of boards that did
+    not change, so keeping many frames costs little more than the boards that
+    were actually touched.
+    """
+
+    head: bytes
+    rooms: tuple[bytes, ...]
+
+    def to_bytes(self) -> bytes:
+        parts = [self.head]
+        for blob in self.rooms:
+            parts.append(_ROOM_LEN.pack(len(blob)))
+            parts.append(blob)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, snapshot: bytes) -> "SnapshotFrame":
+        data = memoryview(snapshot)
+        magic, version, num_rooms = _HEAD.unpack_from(data, 0)[:3]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot format")
+        ofs = _HEAD.size + _INV_SIZE
+        head = bytes(data[:ofs])
+        rooms: list[bytes] = []
+        for _ in range(num_rooms + 1):
+            (size,) = _ROOM_LEN.unpack_from(data, ofs)
+            ofs += _ROOM_LEN.size
+            rooms.append(bytes(data[ofs : ofs + size]))
+            ofs += size
+        return cls(head, tuple(rooms))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.head) + sum(len(blob) for blob in self.rooms)
+
+
+class QuickSave:
+    """Capture/restore engine state, reusing boards not touched since last capture."""
+
+    def __init__(self) -> None:
+        self._world_id = 0
+        self._room_blobs: dict[int, bytes] = {}
+        self._dirty: set[int] = set()
+
+    def mark_dirty(self, room_idx: int) -> None:
+        self._dirty.add(room_idx)
+
+    def invalidate(self) -> None:
+        self._room_blobs.clear()
+        self._dirty.clear()
+
+    def _sync_world(self, world: GameWorld) -> None:
+        if id(world) != self._world_id:
+            self._world_id = id(world)
+            self.invalidate()
+
+    def capture(self, engine: "GameEngine") -> bytes:
+        return self.capture_frame(engine).to_bytes()
+
+    def capture_frame(self, engine: "GameEngine") -> SnapshotFrame:
+        world = engine.world
+        self._sync_world(world)
+        self._dirty.add(world.inv.room)
+
+        first_bits = 0
+        for bit, name in enumerate(_FIRST_FIELDS):
+            if getattr(world.first, name):
+                first_bits |= 1 << bit
+
+        head = _HEAD.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            world.num_rooms,
+            engine.counter,
+            engine.entry_room,
+            engine.bot_msg_ticks,
+            engine.play_mode,
+            1 if engine.standby else 0,
+            engine.game_cycle_ms,
+            first_bits,
+        ) + _pack_inventory(world.inv)
+
+        rooms: list[bytes] = []
+        for idx in range(world.num_rooms + 1):
+            blob = self._room_blobs.get(idx)
+            if blob is None or idx in self._dirty:
+                blob = _encode_room_blob(world.rooms[idx])
+                self._room_blobs[idx] = blob
+            rooms.append(blob)
+        self._dirty.clear()
+        return SnapshotFrame(head, tuple(rooms))
+
+    def restore(self, engine: "GameEngine", snapshot: bytes) -> None:
+        self.restore_frame(engine, SnapshotFrame.from_bytes(snapshot))
+
+    def restore_frame(self, engine: "GameEngine", frame: SnapshotFrame) -> None:
+        (
+            _magic,
+            _version,
+            num_rooms,
+            counter,
+            entry_room,
+            bot_msg_ticks,
+            play_mode,
+            standby,
+            game_cycle_ms,
+            first_bits,
+        ) = _HEAD.unpack_from(frame.head, 0)
+        inv, _ = _parse_inventory(memoryview(frame.head), _HEAD.size)
+
+        world = engine.world
+        self._sync_world(world)
+        rooms: list[Room] = []
+        for idx, blob in enumerate(frame.rooms):
+            live_unchanged = (
+                idx < len(world.rooms)
+                and idx not in self._dirty
+                and idx != world.inv.room
+                and self._room_blobs.get(idx) == blob
+            )
+            rooms.append(world.rooms[idx] if live_unchanged else _decode_room_blob(blob, world))
+
+        world.rooms = rooms
+        world.num_rooms = num_rooms
+        world.inv = inv
+        world.prune_programs()
+        for bit, name in enumerate(_FIRST_FIELDS):
+            setattr(world.first, name, bool(first_bits & (1 << bit)))
+        self._room_blobs = dict(enumerate(frame.rooms))
+        self._dirty.clear()
+
+        engine.counter = counter
+        engine.entry_room = entry_room
+        engine.bot_msg_ticks = bot_msg_ticks
+        engine.play_mode = play_mode
+        engine.standby = bool(standby)
+        engine.game_cycle_ms = game_cycle_ms
+        engine.obj_num = engine.room.num_objs + 1
+
+
+class RewindBuffer:
+    """Ring of snapshot frames bounded by the bytes each frame introduced."""
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._frames: deque[tuple[int, SnapshotFrame]] = deque()
+        self._costs: deque[int] = deque()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def latest_tick(self) -> int:
+        return self._frames[-1][0] if self._frames else 0
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self._costs.clear()
+        self.total_bytes = 0
+
+    def push(self, tick: int, frame: SnapshotFrame) -> None:
+        cost = len(frame.head)
+        prev = self._frames[-1][1].rooms if self._frames else ()
+        for idx, blob in enumerate(frame.rooms):
+            if idx >= len(prev) or prev[idx] is not blob:
+                cost += len(blob)
+        self._frames.append((tick, frame))
+        self._costs.append(cost)
+        self.total_bytes += cost
+        while self.total_bytes > self.max_bytes and len(self._frames) > 1:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        _, old = self._frames.popleft()
+        cost = self._costs.popleft()
+        # Blobs still shared with the new oldest frame stay alive; move their
+        # cost onto it so the budget keeps tracking live memory.
+        nxt = self._frames[0][1].rooms
+        kept = sum(len(blob) for idx, blob in enumerate(old.rooms) if idx < len(nxt) and nxt[idx] is blob)
+        self._costs[0] += kept
+        self.total_bytes -= cost - kept
+
+    def rewind(self, ticks: int) -> SnapshotFrame | None:
+        """Drop frames newer than ``ticks`` before the latest and return the target."""
+        if not self._frames:
+            return None
+        target = self._frames[-1][0] - ticks
+        while len(self._frames) > 1 and self._frames[-1][0] > target:
+            self._frames.pop()
+            self.total_bytes -= self._costs.pop()
+        return self._frames[-1][1]
+
+
+def write_snapshot(path: str | Path, snapshot: bytes) -> None:
+    Path(path).write_bytes(snapshot)
+
+
+def read_snapshot(path: str | Path) -> bytes:
+    return Path(path).read_bytes()
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import math
-import random
+import threading
+import time
 from array import array
+from collections import deque
+from collections.abc import Callable
+from functools import lru_cache
 
 import pygame
 
+from .audiotrace import AudioTrace
+from .rng import GameRandom, make_rng
+
 TIMER_INTERVAL_MS = 55
+AMPLITUDE = 9000
+MUSIC_CACHE_SIZE = 256
 
 
 def _seq(*values: int) -> bytes:
@@ -134,6 +143,87 @@ SFX_TIMELIMIT_WARN = _seq(0x40, 6, 0x45, 6, 0x40, 6, 0x35, 6, 0x40, 6, 0x45, 6,
 SFX_SECRET_CMD = _seq(0x27, 4)
 
 
+def _square(half: int, period: int, amplitude: int) -> array:
+    return array("h", [amplitude]) * half + array("h", [-amplitude]) * (period - half)
+
+
+def square_wave(sample_rate: int, freq: int, amplitude: int) -> array:
+    """One period of the speaker's square wave at ``freq``."""
+    period = max(8, int(sample_rate / max(1, freq)))
+    return _square(period // 2, period, amplitude)
+
+
+def digit_samples(sample_rate: int, data: list[int], amplitude: int) -> array:
+    """A drum digit: one millisecond of square wave per entry of ``data``."""
+    frames_per_ms = max(1, sample_rate // 1000)
+    out = array("h")
+    count = max(0, min(data[0], len(data) - 1))
+    for i in range(1, count + 1):
+        freq = max(1, data[i])
+        half = max(1, int(sample_rate / (2 * freq)))
+        reps = -(-frames_per_ms // (2 * half))
+        out.extend((_square(half, 2 * half, amplitude) * reps)[:frames_per_ms])
+    if not out:
+        out.append(0)
+    return out
+
+
+@lru_cache(maxsize=MUSIC_CACHE_SIZE)
+def compile_music(spec: str) -> bytes:
+    """Compile ``#play`` notation to note/duration byte pairs.
+
+    Looping objects replay the same few strings, so results are memoized.
+    """
+    result: list[int] = []
+    octave = 3
+    duration = 1
+    i = 0
+    while i < len(spec):
+        ch = spec[i].upper()
+        i += 1
+        if ch == "T":
+            duration = 1
+        elif ch == "S":
+            duration = 2
+        elif ch == "I":
+            duration = 4
+        elif ch == "Q":
+            duration = 8
+        elif ch == "H":
+            duration = 16
+        elif ch == "W":
+            duration = 32
+        elif ch == ".":
+            duration = (duration * 3) // 2
+        elif ch == "3":
+            duration = duration // 3
+        elif ch == "+":
+            if octave < 6:
+                octave += 1
+        elif ch == "-":
+            if octave > 1:
+                octave -= 1
+        elif ch in "ABCDEFG":
+            base = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}[ch]
+            if i < len(spec):
+                nxt = spec[i].upper()
+                if nxt == "!":
+                    base -= 1
+                    i += 1
+                elif nxt == "#":
+                    base += 1
+                    i += 1
+            result.append((octave * 0x10 + base) & 0xFF)
+            result.append(duration & 0xFF)
+        elif ch == "X":
+            result.append(0)
+            result.append(duration & 0xFF)
+        elif "0" <= ch <= "9":
+            result.append(0xF0 + ord(ch) - ord("0"))
+            result.append(duration & 0xFF)
+    return bytes(result)
+
+
 class _NullSpeaker:
     def play_note(self, freq: int) -> None:
         del freq
@@ -144,6 +234,9 @@ class _NullSpeaker:
     def stop(self) -> None:
         return
 
+    def pump(self) -> None:
+        return
+
     def shutdown(self) -> None:
         return
 
@@ -151,7 +244,7 @@ class _NullSpeaker:
 class _PygameSpeaker:
     def __init__(self, sample_rate: int, digits: list[list[int]]) -> None:
         self.sample_rate = sample_rate
-        self.amplitude = 9000
+        self.amplitude = AMPLITUDE
         self._tone_cache: dict[int, pygame.mixer.Sound] = {}
         self._digit_cache: dict[int, pygame.mixer.Sound] = {}
         self._digits = digits
@@ -160,26 +253,19 @@ class _PygameSpeaker:
         self._channel = pygame.mixer.find_channel(True) or pygame.mixer.Channel(0)
 
     def _make_square_wave(self, freq: int) -> pygame.mixer.Sound:
-        period = max(8, int(self.sample_rate / max(1, freq)))
-        half = period // 2
-        data = array("h")
-        for i in range(period):
-            data.append(self.amplitude if i < half else -self.amplitude)
-        return pygame.mixer.Sound(buffer=data.tobytes())
+        return pygame.mixer.Sound(buffer=square_wave(self.sample_rate, freq, self.amplitude).tobytes())
 
     def _make_digit_sound(self, data: list[int]) -> pygame.mixer.Sound:
-        frames_per_ms = max(1, self.sample_rate // 1000)
-        out = array("h")
-        count = max(0, min(data[0], len(data) - 1))
-        for i in range(1, count + 1):
-            freq = max(1, data[i])
-            half = max(1, int(self.sample_rate / (2 * freq)))
-            cycle = half * 2
-            for j in range(frames_per_ms):
-                out.append(self.amplitude if (j % cycle) < half else -self.amplitude)
-        if not out:
-            out.append(0)
-        return pygame.mixer.Sound(buffer=out.tobytes())
+        return pygame.mixer.Sound(buffer=digit_samples(self.sample_rate, data, self.amplitude).tobytes())
+
+    def preload(self, freqs: list[int]) -> None:
+        """Synthesize every tone in ``freqs`` and every digit clip up front."""
+        for freq in freqs:
+            if freq > 0 and freq not in self._tone_cache:
+                self._tone_cache[freq] = self._make_square_wave(freq)
+        for digit, data in enumerate(self._digits):
+            if digit not in self._digit_cache:
+                self._digit_cache[digit] = self._make_digit_sound(data)
 
     def play_note(self, freq: int) -> None:
         if freq <= 0:
@@ -201,13 +287,124 @@ class _PygameSpeaker:
     def stop(self) -> None:
         self._channel.stop()
 
+    def pump(self) -> None:
+        return
+
     def shutdown(self) -> None:
         self.stop()
 
 
+class _StreamSpeaker:
+    """Renders the speaker into a ring of fixed-size mixer chunks.
+
+    One chunk plays, one is queued behind it, and `pump` renders the next
+    into the free one in place, so notes cost no allocation or
+    ``Channel.play`` call.  Tones are pre-tiled to at least a chunk, and a
+    note change keeps the position within the cycle, so there is no click.
+    """
+
+    CHUNK = 1024
+    RING = 3
+
+    def __init__(self, sample_rate: int, digits: list[list[int]]) -> None:
+        self.sample_rate = sample_rate
+        self.amplitude = AMPLITUDE
+        self._tone_cache: dict[int, memoryview] = {}
+        self._periods: dict[int, int] = {}
+        self._digit_cache: dict[int, memoryview] = {}
+        self._digits = digits
+        if pygame.mixer.get_init() is None:
+            pygame.mixer.init(frequency=sample_rate, size=-16, channels=1, buffer=512)
+        self._channel = pygame.mixer.find_channel(True) or pygame.mixer.Channel(0)
+        self._ring = [pygame.mixer.Sound(buffer=bytes(2 * self.CHUNK)) for _ in range(self.RING)]
+        self._views = [memoryview(chunk).cast("B").cast("h") for chunk in self._ring]
+        self._next = 0
+        self._silence = memoryview(array("h", [0]) * self.CHUNK)
+        self._wave = self._silence
+        self._period = self.CHUNK
+        self._phase = 0
+        self._clip: memoryview | None = None
+        self._clip_pos = 0
+
+    def _tone(self, freq: int) -> memoryview:
+        wave = self._tone_cache.get(freq)
+        if wave is None:
+            period = square_wave(self.sample_rate, freq, self.amplitude)
+            self._periods[freq] = len(period)
+            wave = self._tone_cache[freq] = memoryview(period * -(-self.CHUNK // len(period)))
+        return wave
+
+    def preload(self, freqs: list[int]) -> None:
+        for freq in freqs:
+            if freq > 0:
+                self._tone(freq)
+        for digit, data in enumerate(self._digits):
+            if digit not in self._digit_cache:
+                self._digit_cache[digit] = memoryview(digit_samples(self.sample_rate, data, self.amplitude))
+
+    def play_note(self, freq: int) -> None:
+        if freq <= 0:
+            self.stop()
+            return
+        wave = self._tone(freq)
+        period = self._periods[freq]
+        self._phase = (self._phase % self._period) * period // self._period
+        self._wave, self._period = wave, period
+        self._clip = None
+
+    def play_digit(self, digit: int, data: list[int]) -> None:
+        clip = self._digit_cache.get(digit)
+        if clip is None:
+            clip = self._digit_cache[digit] = memoryview(digit_samples(self.sample_rate, data, self.amplitude))
+        self._clip, self._clip_pos = clip, 0
+
+    def stop(self) -> None:
+        self._wave, self._period, self._phase = self._silence, self.CHUNK, 0
+        self._clip = None
+
+    def render(self, out: memoryview) -> None:
+        pos, n = 0, len(out)
+        while pos < n:
+            clip = self._clip
+            if clip is not None:
+                take = min(n - pos, len(clip) - self._clip_pos)
+                out[pos : pos + take] = clip[self._clip_pos : self._clip_pos + take]
+                self._clip_pos += take
+                if self._clip_pos >= len(clip):
+                    self._clip = None
+                    self.stop()
+            else:
+                wave = self._wave
+                take = min(n - pos, len(wave) - self._phase)
+                out[pos : pos + take] = wave[self._phase : self._phase + take]
+                self._phase = (self._phase + take) % len(wave)
+            pos += take
+
+    def _feed(self) -> pygame.mixer.Sound:
+        idx = self._next
+        self._next = (idx + 1) % self.RING
+        self.render(self._views[idx])
+        return self._ring[idx]
+
+    def pump(self) -> None:
+        channel = self._channel
+        if not channel.get_busy():
+            channel.play(self._feed())
+            channel.queue(self._feed())
+        elif channel.get_queue() is None:
+            channel.queue(self._feed())
+
+    def shutdown(self) -> None:
+        self.stop()
+        self._channel.stop()
+
+
 class SoundEngine:
-    def __init__(self, rng: random.Random | None = None) -> None:
-        self._rng = rng if rng is not None else random.Random()
+    MAX_TIMER_CATCHUP = 4
+    PUMP_INTERVAL_S = 0.005
+
+    def __init__(self, rng: GameRandom | None = None) -> None:
+        self._rng = rng if rng is not None else make_rng()
         self.sound_f = True
         self.sound_off = False
         self.note_priority = -1
@@ -219,37 +416,123 @@ class SoundEngine:
         self._last_tick_ms: int | None = None
         self._note_table = self._init_note_table()
         self._digits = self._init_digits()
-        self._speaker: _NullSpeaker | _PygameSpeaker = _NullSpeaker()
-
-    def bind_pygame(self) -> None:
+        self._speaker: _NullSpeaker | _PygameSpeaker | _StreamSpeaker = _NullSpeaker()
+        self.streaming = False
+        self.trace: AudioTrace | None = None
+        self._pending: deque[tuple[Callable[..., None], tuple]] = deque()
+        self._thread: threading.Thread | None = None
+        self._running = False
+
+    def bind_pygame(self, streaming: bool = False) -> None:
+        """Attach a mixer speaker; ``streaming`` feeds one continuous PCM stream."""
+        self.streaming = streaming
         try:
-            self._speaker = _PygameSpeaker(44100, self._digits)
+            speaker = (_StreamSpeaker if streaming else _PygameSpeaker)(44100, self._digits)
+            speaker.preload(sorted(set(self._note_table)))
+            self._speaker = speaker
         except pygame.error:
             self._speaker = _NullSpeaker()
 
+    @property
+    def threaded(self) -> bool:
+        return self._thread is not None
+
+    def start_thread(self) -> None:
+        """Step the sound timer from a background thread instead of `tick`.
+
+        Calls made from the game thread (`add`, `stop`, ...) are queued on a
+        deque, whose append/popleft are atomic, and applied by the audio
+        thread just before its next timer step.
+        """
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._thread_loop, name="sound-timer", daemon=True)
+        self._thread.start()
+
+    def stop_thread(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._running = False
+        thread.join()
+        self._thread = None
+        self._drain()
+
+    def _thread_loop(self) -> None:
+        interval = TIMER_INTERVAL_MS / 1000
+        nap = self.PUMP_INTERVAL_S if self.streaming else interval
+        deadline = time.perf_counter() + interval
+        while self._running:
+            now = time.perf_counter()
+            if now >= deadline:
+                if self.trace is not None:
+                    self.trace.record("step", drift_ms=(now - deadline) * 1000.0)
+                if now - deadline > interval * self.MAX_TIMER_CATCHUP:
+                    deadline = now
+                deadline += interval
+                self._drain()
+                self._timer_step()
+            self._speaker.pump()
+            time.sleep(max(0.0, min(deadline - time.perf_counter(), nap)))
+
+    def _drain(self) -> None:
+        pending = self._pending
+        while pending:
+            fn, args = pending.popleft()
+            fn(*args)
+
+    def _call(self, fn: Callable[..., None], *args) -> None:
+        if self._thread is None:
+            fn(*args)
+        else:
+            self._pending.append((fn, args))
+
     def set_enabled(self, enabled: bool) -> None:
+        self._call(self._set_enabled, enabled)
+
+    def set_off(self, off: bool) -> None:
+        self._call(self._set_off, off)
+
+    def stop(self) -> None:
+        self._call(self._stop)
+
+    def shutdown(self) -> None:
+        self.stop_thread()
+        self._stop()
+        self._speaker.shutdown()
+
+    def add(self, priority: int, seq: bytes) -> None:
+        if self.trace is not None:
+            self.trace.record("add", priority)
+        self._call(self._add, priority, seq)
+
+    def start_trace(self) -> AudioTrace:
+        """Start recording an `AudioTrace` of adds, timer steps and notes."""
+        self.trace = AudioTrace(TIMER_INTERVAL_MS)
+        return self.trace
+
+    def _set_enabled(self, enabled: bool) -> None:
         self.sound_f = enabled
         if not enabled:
             self.make_sound = False
             self._speaker.stop()
 
-    def set_off(self, off: bool) -> None:
+    def _set_off(self, off: bool) -> None:
         self.sound_off = off
         if off:
-            self.stop()
+            self._stop()
 
-    def stop(self) -> None:
+    def _stop(self) -> None:
+        if self.trace is not None and self.make_sound:
+            self.trace.record("stop")
         self.notes = b""
         self.make_sound = False
         self.sound_ptr = 0
         self.sound_count = 0
         self._speaker.stop()
 
-    def shutdown(self) -> None:
-        self.stop()
-        self._speaker.shutdown()
-
-    def add(self, priority: int, seq: bytes) -> None:
+    def _add(self, priority: int, seq: bytes) -> None:
         if self.sound_off or not seq:
             return
         if (not self.make_sound) or ((priority >= self.note_priority) and (self.note_priority != -1)) or priority == -1:
@@ -266,56 +549,16 @@ class SoundEngine:
             self.make_sound = True
 
     def music(self, spec: str) -> bytes:
-        result: list[int] = []
-        octave = 3
-        duration = 1
-        i = 0
-        while i < len(spec):
-            ch = spec[i].upper()
-            i += 1
-            if ch == "T":
-                duration = 1
-            elif ch == "S":
-                duration = 2
-            elif ch == "I":
-                duration = 4
-            elif ch == "Q":
-                duration = 8
-            elif ch == "H":
-                duration = 16
-            elif ch == "W":
-                duration = 32
-            elif ch == ".":
-                duration = (duration * 3) // 2
-            elif ch == "3":
-                duration = duration // 3
-            elif ch == "+":
-                if octave < 6:
-                    octave += 1
-            elif ch == "-":
-                if octave > 1:
-                    octave -= 1
-            elif ch in "ABCDEFG":
-                base = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}[ch]
-                if i < len(spec):
-                    nxt = spec[i].upper()
-                    if nxt == "!":
-                        base -= 1
-                        i += 1
-                    elif nxt == "#":
-                        base += 1
-                        i += 1
-                result.append((octave * 0x10 + base) & 0xFF)
-                result.append(duration & 0xFF)
-            elif ch == "X":
-                result.append(0)
-                result.append(duration & 0xFF)
-            elif "0" <= ch <= "9":
-                result.append(0xF0 + ord(ch) - ord("0"))
-                result.append(duration & 0xFF)
-        return bytes(result)
+        return compile_music(spec)
+
+    @staticmethod
+    def music_cache_info():
+        """Hit/miss counters of the shared `compile_music` cache."""
+        return compile_music.cache_info()
 
     def tick(self, now_ms: int) -> None:
+        if self._thread is not None:
+            return
         if self._last_tick_ms is None:
             self._last_tick_ms = now_ms
             return
@@ -324,7 +567,10 @@ class SoundEngine:
             return
         while now_ms - self._last_tick_ms >= TIMER_INTERVAL_MS:
             self._last_tick_ms += TIMER_INTERVAL_MS
+            if self.trace is not None:
+                self.trace.record("step", drift_ms=now_ms - self._last_tick_ms)
             self._timer_step()
+        self._speaker.pump()
 
     def _timer_step(self) -> None:
         if not self.sound_f:
@@ -340,19 +586,28 @@ class SoundEngine:
             return
 
         self._speaker.stop()
+        trace = self.trace
         if self.sound_ptr >= len(self.notes):
             self.make_sound = False
+            if trace is not None:
+                trace.record("stop")
             return
 
         note = self.notes[self.sound_ptr]
         if note == 0:
             self._speaker.stop()
+            if trace is not None:
+                trace.record("rest")
         elif note < 0xF0:
             self._speaker.play_note(self._note_table[note])
+            if trace is not None:
+                trace.record("note", self._note_table[note])
         else:
             digit = note - 0xF0
             if 0 <= digit <= 9:
                 self._speaker.play_digit(digit, self._digits[digit])
+                if trace is not None:
+                    trace.record("digit", digit)
 
         self.sound_ptr += 1
         if self.sound_ptr >= len(self.notes):
@@ -0,0 +1,136 @@
+"""Offscreen title-screen thumbnails for world files.
+
+Only board 0 is decoded.  It is drawn with the normal board renderer into an
+offscreen surface (no display needed), scaled down, and kept as a PNG in a
+disk cache keyed by the file's path, mtime and size.  Writing a thumbnail
+removes the older ones for the same path, and the cache keeps at most
+``max_entries`` files, dropping the least recently used.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import pygame
+
+from . import constants as c
+from .info import InfoDef, init_info_play
+from .render import Renderer, draw_board
+from .world import load_title_room
+
+THUMB_SIZE = (c.XS * c.CELL_W // 4, c.YS * c.CELL_H // 4)
+MAX_THUMBS = 256
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "almost-of-zzt" / "thumbs"
+
+
+class ThumbnailCache:
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        size: tuple[int, int] = THUMB_SIZE,
+        max_entries: int = MAX_THUMBS,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.size = size
+        self.max_entries = max_entries
+        self._memory: dict[str, pygame.Surface] = {}
+        self._renderer: Renderer | None = None
+        self._info: list[InfoDef] | None = None
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8", "surrogateescape")).hexdigest()[:20]
+
+    def _key(self, path: Path) -> str:
+        """``<path digest>-<version digest>``, so stale versions share a prefix."""
+        st = path.stat()
+        version = f"{st.st_mtime_ns}|{st.st_size}|{self.size[0]}x{self.size[1]}"
+        return f"{self._digest(str(path.resolve()))}-{self._digest(version)}"
+
+    def _board_renderer(self) -> tuple[Renderer, list[InfoDef]]:
+        if self._renderer is None:
+            pygame.font.init()
+            self._renderer = Renderer(pygame.Surface((c.XS * c.CELL_W, c.BOARD_OFFSET_Y + c.YS * c.CELL_H)))
+            self._info = init_info_play()
+        return self._renderer, self._info
+
+    def render(self, path: str | Path) -> pygame.Surface:
+        """Render a thumbnail of ``path``'s title screen, bypassing the caches."""
+        room = load_title_room(str(path))
+        renderer, info = self._board_renderer()
+        renderer.clear()
+        draw_board(renderer, room, info)
+        board = renderer.screen.subsurface((0, c.BOARD_OFFSET_Y, c.XS * c.CELL_W, c.YS * c.CELL_H))
+        return pygame.transform.smoothscale(board, self.size)
+
+    def thumbnail_file(self, path: str | Path) -> Path:
+        """Path of the cached PNG for ``path``, rendering it on a miss."""
+        path = Path(path)
+        out = self.cache_dir / f"{self._key(path)}.png"
+        if out.exists():
+            # Mark it used so pruning drops the least recently used files.
+            os.utime(out)
+            return out
+        surf = self.render(path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_suffix(f".{os.getpid()}.tmp.png")
+        pygame.image.save(surf, str(tmp))
+        os.replace(tmp, out)
+        self._memory[out.stem] = surf
+        self.prune(keep=out)
+        return out
+
+    def prune(self, keep: Path | None = None) -> None:
+        """Drop older thumbnails of ``keep``'s world and cut the cache to ``max_entries``."""
+        files = []
+        for entry in self.cache_dir.glob("*.png"):
+            if entry == keep or entry.name.endswith(".tmp.png"):
+                continue
+            stale = keep is not None and entry.stem.split("-")[0] == keep.stem.split("-")[0]
+            try:
+                if stale:
+                    entry.unlink()
+                    self._memory.pop(entry.stem, None)
+                else:
+                    files.append((entry.stat().st_mtime_ns, entry))
+            except OSError:
+                continue
+        files.sort()
+        excess = len(files) + (keep is not None) - self.max_entries
+        for _, entry in files[: max(0, excess)]:
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            self._memory.pop(entry.stem, None)
+
+    def thumbnail(self, path: str | Path) -> pygame.Surface:
+        out = self.thumbnail_file(path)
+        surf = self._memory.get(out.stem)
+        if surf is None:
+            surf = self._memory[out.stem] = pygame.image.load(str(out))
+        return surf
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    cache = ThumbnailCache()
+    for arg in args or ["."]:
+        target = Path(arg)
+        paths = sorted(target.glob(f"*{c.WORLD_EXT}")) if target.is_dir() else [target]
+        for path in paths:
+            try:
+                print(f"{path}: {cache.thumbnail_file(path)}")
+            except (OSError, ValueError) as exc:
+                print(f"{path}: {exc}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,22 @@ from __future__ import annotations
 
 import io
 import struct
+from collections.abc import Callable
 from dataclasses import replace
 
 from . import constants as c
-from .model import BoardCell, GameWorld, Inventory, Obj, Room, RoomInfo, make_new_world
+from .model import (
+    BoardCell,
+    FlagTable,
+    GameWorld,
+    Inventory,
+    Obj,
+    Room,
+    RoomInfo,
+    bake_labels,
+    make_new_world,
+    new_bind_id,
+)
 
 
 _INT16 = struct.Struct("<h")
@@ -47,7 +59,7 @@ def _parse_inventory(data: memoryview, ofs: int) -> tuple[Inventory, int]:
     for _ in range(c.NUM_FLAGS):
         flag, ofs = _read_short_string(data, ofs, 20)
         flags.append(flag)
-    inv.flags = flags
+    inv.flags = FlagTable(flags)
     inv.room_time, inv.last_sec = struct.unpack_from("<hH", data, ofs)
     ofs += 4
     inv.play_flag = bool(data[ofs])
@@ -113,7 +125,7 @@ def _pack_room_info(info: RoomInfo) -> bytes:
     return bytes(b)
 
 
-def _decode_room(blob: bytes) -> Room:
+def _decode_room(blob: bytes, world: GameWorld) -> Room:
     data = memoryview(blob)
     ofs = 0
     title, ofs = _read_short_string(data, ofs, 50)
@@ -174,16 +186,21 @@ def _decode_room(blob: bytes) -> Room:
         ofs += _OBJ_HEAD.size
 
         inside = b""
+        bind = 0
         if inside_len > 0:
             end = ofs + inside_len
             if end > len(data):
                 raise ValueError("Object inside decode overflow")
-            inside = bytes(data[ofs:end])
+            inside = world.intern_program(data[ofs:end])
             ofs = end
         elif inside_len < 0:
             ref_idx = -inside_len
             if 0 <= ref_idx < len(objs):
-                inside = objs[ref_idx].inside
+                ref = objs[ref_idx]
+                if ref.bind == 0:
+                    ref.bind = new_bind_id()
+                inside = ref.inside
+                bind = ref.bind
 
         obj = Obj(
             x=ox,
@@ -200,6 +217,7 @@ def _decode_room(blob: bytes) -> Room:
             offset=offset,
             inside=inside,
             pad=pad,
+            bind=bind,
         )
         objs.append(obj)
 
@@ -241,16 +259,21 @@ def _encode_room(room: Room) -> bytes:
     out.extend(_pack_room_info(room.room_info))
     out.extend(_INT16.pack(room.num_objs))
 
-    inside_alias: dict[int, int] = {}
+    # Bound stats (#BIND, or aliases read from the file) write their text
+    # once; later members of the group use the negative-length alias form
+    # pointing at the first.  Unbound stats always carry their own copy, even
+    # if it is identical, so they do not come back bound.  Stat 0 cannot be an
+    # alias target since -0 reads back as "no text".
+    inside_alias: dict[tuple[int, bytes], int] = {}
     for idx, obj in enumerate(room.objs):
-        inside_len = len(obj.inside)
-        inside_key = id(obj.inside) if inside_len > 0 else 0
-        inside_ref = 0
-        if inside_len > 0 and inside_key in inside_alias:
-            inside_ref = -inside_alias[inside_key]
-            inside_len = inside_ref
-        elif inside_len > 0:
-            inside_alias[inside_key] = idx
+        inside = bake_labels(obj.inside, obj.label_flips)
+        inside_len = len(inside)
+        if inside_len > 0 and obj.bind:
+            first_idx = inside_alias.get((obj.bind, inside))
+            if first_idx is not None:
+                inside_len = -first_idx
+            elif idx > 0:
+                inside_alias[obj.bind, inside] = idx
 
         out.extend(
             _OBJ_HEAD.pack(
@@ -273,13 +296,12 @@ def _encode_room(room: Room) -> bytes:
             )
         )
         if inside_len > 0:
-            out.extend(obj.inside)
+            out.extend(inside)
 
     return bytes(out)
 
 
-def load_world(path: str) -> GameWorld:
-    data = memoryview(open(path, "rb").read())
+def _parse_header(data: memoryview) -> tuple[int, Inventory]:
     if len(data) < c.HEADER_LEN:
         raise ValueError("World file is too short")
 
@@ -296,9 +318,35 @@ def load_world(path: str) -> GameWorld:
         num_rooms = first
 
     inv, _ = _parse_inventory(data, ofs)
+    return num_rooms, inv
+
+
+def read_title(path: str) -> tuple[int, Inventory, Room]:
+    """Return the board count, inventory and board 0, reading no further than it."""
+    with open(path, "rb") as f:
+        num_rooms, inv = _parse_header(memoryview(f.read(c.HEADER_LEN)))
+        size_raw = f.read(2)
+        if len(size_raw) < 2:
+            raise ValueError("Unexpected EOF while reading room size")
+        room_size = _INT16.unpack(size_raw)[0]
+        blob = f.read(room_size) if room_size >= 0 else b""
+    if room_size < 0 or len(blob) < room_size:
+        raise ValueError("Invalid room size")
+    return num_rooms, inv, _decode_room(blob, GameWorld())
+
+
+def load_title_room(path: str) -> Room:
+    """Decode only board 0 (the title screen)."""
+    return read_title(path)[2]
+
+
+def load_world(path: str, progress: Callable[[int, int], None] | None = None) -> GameWorld:
+    data = memoryview(open(path, "rb").read())
+    num_rooms, inv = _parse_header(data)
 
     cursor = c.HEADER_LEN
-    rooms: list[Room] = []
+    world = GameWorld(num_rooms=num_rooms, inv=inv)
+    rooms = world.rooms
     for _ in range(num_rooms + 1):
         if cursor + 2 > len(data):
             raise ValueError("Unexpected EOF while reading room size")
@@ -308,9 +356,10 @@ def load_world(path: str) -> GameWorld:
             raise ValueError("Invalid room size")
         blob = bytes(data[cursor : cursor + room_size])
         cursor += room_size
-        rooms.append(_decode_room(blob))
+        rooms.append(_decode_room(blob, world))
+        if progress is not None:
+            progress(len(rooms), num_rooms + 1)
 
-    world = GameWorld(num_rooms=num_rooms, rooms=rooms, inv=inv)
     world.game_name = path
     return world
 
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import csv
+import json
+import random
+from pathlib import Path
+
+from almost_of_zzt.audiotrace import AudioTrace
+from almost_of_zzt.batch import BatchJob, run_job
+from almost_of_zzt.model import make_new_world
+from almost_of_zzt.sound import TIMER_INTERVAL_MS, SoundEngine
+from almost_of_zzt.world import save_world
+
+
+def test_trace_records_adds_steps_notes_and_drift() -> None:
+    s = SoundEngine(random.Random(1))
+    trace = s.start_trace()
+
+    s.add(2, bytes((0x30, 1, 0, 1)))
+    s.tick(0)
+    s.tick(TIMER_INTERVAL_MS + 5)
+    s.tick(3 * TIMER_INTERVAL_MS + 1)
+
+    kinds = [(e.kind, e.value) for e in trace.events]
+    assert kinds == [("add", 2), ("step", 0), ("note", s._note_table[0x30]), ("step", 0), ("rest", 0), ("step", 0), ("stop", 0)]
+    drifts = [e.drift_ms for e in trace.events if e.kind == "step"]
+    assert drifts == [5, TIMER_INTERVAL_MS + 1, 1]
+
+    summary = trace.summary()
+    assert summary.adds == 1 and summary.notes == 1 and summary.steps == 3
+    assert summary.missed_steps == 1
+    assert summary.max_jitter_ms == TIMER_INTERVAL_MS + 1
+
+
+def test_trace_exports_csv_and_json(tmp_path: Path) -> None:
+    ticks = iter(range(0, 100, 10))
+    trace = AudioTrace(55, clock=lambda: next(ticks) / 1000)
+    trace.record("add", 3)
+    trace.record("step", drift_ms=12.5)
+
+    trace.write(tmp_path / "t.csv")
+    trace.write(tmp_path / "t.json")
+
+    with open(tmp_path / "t.csv", newline="") as fh:
+        rows = list(csv.reader(fh))
+    assert rows == [["t_ms", "kind", "value", "drift_ms"], ["10.000", "add", "3", "0.000"], ["20.000", "step", "0", "12.500"]]
+    payload = json.loads((tmp_path / "t.json").read_text())
+    assert payload["summary"]["max_jitter_ms"] == 12.5
+    assert [e["kind"] for e in payload["events"]] == ["add", "step"]
+
+
+def test_trace_keeps_a_bounded_window_but_summarizes_everything() -> None:
+    trace = AudioTrace(55, clock=lambda: 0.0, max_events=4)
+    for n in range(10):
+        trace.record("step", drift_ms=n * 10)
+    trace.record("add", 1)
+
+    assert [(e.kind, e.drift_ms) for e in trace.events] == [("step", 70), ("step", 80), ("step", 90), ("add", 0)]
+    summary = trace.summary()
+    assert (summary.events, summary.steps, summary.adds, summary.dropped) == (11, 10, 1, 7)
+    assert summary.missed_steps == 4 and summary.max_jitter_ms == 90 and summary.mean_jitter_ms == 45
+
+
+def test_batch_job_reports_audio_summary(tmp_path: Path) -> None:
+    path = tmp_path / "A.ZZT"
+    save_world(make_new_world(), str(path))
+
+    result = run_job(BatchJob(str(path), ticks=50, audio_trace=True))
+
+    assert result.error is None
+    assert result.audio is not None and result.audio["steps"] > 0
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.batch import BatchJob, BatchResult, run_batch, run_job
+from almost_of_zzt.model import BoardCell, make_new_world
+from almost_of_zzt.world import save_world
+
+
+def _world_file(tmp_path: Path) -> str:
+    world = make_new_world()
+    room = world.rooms[0]
+    px, py = room.objs[0].x, room.objs[0].y
+    room.board[px + 3][py] = BoardCell(c.GEM, 0x0A)
+    out = tmp_path / "BATCH.ZZT"
+    save_world(world, str(out))
+    return str(out)
+
+
+def _summary(result: BatchResult) -> tuple:
+    return (result.ticks, result.score, result.death_tick, result.boards_visited)
+
+
+def test_replayed_inputs_drive_the_player(tmp_path: Path) -> None:
+    path = _world_file(tmp_path)
+    result = run_job(BatchJob(path, seed=3, ticks=20, inputs=("E", "E", "E", ".")))
+
+    assert result.error is None
+    assert result.ticks == 20
+    assert result.score == 10
+    assert result.death_tick is None
+    assert result.boards_visited == [0]
+
+
+def test_batch_results_are_deterministic_per_seed_and_ordered(tmp_path: Path) -> None:
+    path = _world_file(tmp_path)
+    jobs = [BatchJob(path, seed=s, ticks=200) for s in (1, 2, 1)]
+
+    pooled = run_batch(jobs, workers=2)
+    serial = run_batch(jobs, workers=1)
+
+    assert [r.seed for r in pooled] == [1, 2, 1]
+    assert [_summary(r) for r in pooled] == [_summary(r) for r in serial]
+    assert _summary(pooled[0]) == _summary(pooled[2])
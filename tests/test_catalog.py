@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pygame
+import pytest
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.catalog import WorldCatalog
+from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.model import make_new_world
+from almost_of_zzt.render import Renderer
+from almost_of_zzt.world import save_world
+
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+def _save(path: Path, title: str) -> None:
+    world = make_new_world()
+    world.rooms[0].title = title
+    world.inv.orig_name = path.stem
+    save_world(world, str(path))
+
+
+def test_catalog_scans_in_background_and_reuses_unchanged_metadata(tmp_path: Path, monkeypatch) -> None:
+    _save(tmp_path / "B.ZZT", "Bravo")
+    _save(tmp_path / "A.ZZT", "Alpha")
+    (tmp_path / "notes.txt").write_text("x")
+
+    described: list[str] = []
+    real = WorldCatalog._describe
+    monkeypatch.setattr(WorldCatalog, "_describe", staticmethod(lambda p, st: described.append(p.name) or real(p, st)))
+
+    cat = WorldCatalog(tmp_path)
+    assert cat.entries(c.WORLD_EXT) is None
+    cat.refresh()
+    assert cat.wait(5)
+    entries = cat.entries(c.WORLD_EXT)
+    assert [(e.path.name, e.title, e.num_rooms, e.orig_name) for e in entries] == [
+        ("A.ZZT", "Alpha", 0, "A"),
+        ("B.ZZT", "Bravo", 0, "B"),
+    ]
+
+    _save(tmp_path / "C.ZZT", "Charlie")
+    st = (tmp_path / "A.ZZT").stat()
+    os.utime(tmp_path / "A.ZZT", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    described.clear()
+    cat.refresh()
+    cat.wait(5)
+    assert sorted(described) == ["A.ZZT", "C.ZZT"]
+    assert [e.path.name for e in cat.entries(c.WORLD_EXT)] == ["A.ZZT", "B.ZZT", "C.ZZT"]
+    assert cat.entries(c.SAVE_EXT) == []
+
+
+def test_world_loads_off_the_main_thread_with_progress(tmp_path: Path) -> None:
+    pygame.init()
+    screen = pygame.display.set_mode((c.SCREEN_W, c.SCREEN_H))
+    e = GameEngine(make_new_world())
+    e._screen = screen
+    e._renderer = Renderer(screen)
+    _save(tmp_path / "LOADME.ZZT", "Loaded")
+
+    threads: list[str] = []
+    real_load = e._in_background
+
+    def spy(label, work):
+        return real_load(label, lambda progress: threads.append(threading.current_thread().name) or work(progress))
+
+    e._in_background = spy  # type: ignore[method-assign]
+    assert e._load_world_from_path(tmp_path / "LOADME.ZZT")
+    assert e.world.rooms[0].title == "Loaded"
+    assert threads and threads[0] != threading.main_thread().name
+
+    with pytest.raises(ZeroDivisionError):
+        real_load("Failing", lambda progress: 1 // 0)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.hiscores import HiScoreRow, HiScoreService, decode_table, empty_table, encode_table, merge_tables
+
+
+def _table(*entries: tuple[str, int]) -> list[tuple[str, int]]:
+    table = empty_table()
+    table[: len(entries)] = entries
+    return table
+
+
+def test_encode_decode_round_trip_keeps_dos_layout() -> None:
+    table = _table(("Alice", 900), ("Bob", -5))
+    raw = encode_table(table)
+
+    assert len(raw) == c.NUM_HI * 53
+    assert raw[0] == 5 and raw[1:6] == b"Alice"
+    assert decode_table(raw) == table
+    assert decode_table(raw[:-1]) == empty_table()
+
+
+def test_store_serves_cache_immediately_and_writes_atomically(tmp_path: Path, monkeypatch) -> None:
+    svc = HiScoreService()
+    path = tmp_path / "W.HI"
+    gate = threading.Event()
+    real_replace = os.replace
+
+    def slow_replace(src, dst):
+        gate.wait(5.0)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", slow_replace)
+    svc.store(path, _table(("First", 10)))
+    svc.store(path, _table(("Second", 20)))
+
+    assert svc.load(path)[0] == ("Second", 20)
+    assert not path.exists()
+    gate.set()
+    assert svc.flush(5.0)
+    assert decode_table(path.read_bytes())[0] == ("Second", 20)
+    assert [p.name for p in tmp_path.iterdir()] == ["W.HI"]
+
+
+def test_load_caches_and_failed_writes_are_reported(tmp_path: Path) -> None:
+    path = tmp_path / "W.HI"
+    path.write_bytes(encode_table(_table(("Disk", 1))))
+    svc = HiScoreService()
+
+    assert svc.load(path)[0] == ("Disk", 1)
+    assert svc.peek(path)[0] == ("Disk", 1)
+    st = path.stat()
+    path.write_bytes(encode_table(_table(("Changed", 2))))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert svc.load(path)[0] == ("Disk", 1)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert svc.load(path)[0] == ("Changed", 2)
+    assert svc.peek(tmp_path / "OTHER.HI") is None
+
+    missing = tmp_path / "nope" / "X.HI"
+    svc.store(missing, _table(("Lost", 3)))
+    assert svc.flush(5.0)
+    assert svc.take_failures() == [missing.absolute()]
+    assert svc.take_failures() == []
+
+
+def test_merge_store_folds_in_entries_from_the_unread_file(tmp_path: Path) -> None:
+    path = tmp_path / "W.HI"
+    path.write_bytes(encode_table(_table(("Ann", 50), ("Bo", 5))))
+    svc = HiScoreService()
+
+    svc.store(path, _table(("New", 20)), merge=True)
+    assert svc.flush(5.0)
+
+    merged = _table(("Ann", 50), ("New", 20), ("Bo", 5))
+    assert decode_table(path.read_bytes()) == merged
+    assert svc.load(path) == merged
+    assert merge_tables(merged, merged) == merged
+
+
+def test_index_aggregates_named_entries_across_worlds(tmp_path: Path) -> None:
+    (tmp_path / "TOWN.HI").write_bytes(encode_table(_table(("Ann", 50), ("Bo", 5))))
+    (tmp_path / "CAVES.HI").write_bytes(encode_table(_table(("Cy", 70))))
+    (tmp_path / "EMPTY.HI").write_bytes(encode_table(empty_table()))
+
+    svc = HiScoreService()
+    rows = svc.index(tmp_path)
+
+    assert rows == [HiScoreRow("CAVES", "Cy", 70), HiScoreRow("TOWN", "Ann", 50), HiScoreRow("TOWN", "Bo", 5)]
+
+    town = tmp_path / "TOWN.HI"
+    st = town.stat()
+    town.write_bytes(encode_table(_table(("Dee", 60), ("Ann", 50))))
+    os.utime(town, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert svc.index(tmp_path)[1] == HiScoreRow("TOWN", "Dee", 60)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.memprof import format_report, memory_report, profile_world
+from almost_of_zzt.model import Obj, make_new_world
+from almost_of_zzt.world import save_world
+
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+def _world_with_programs():
+    world = make_new_world()
+    world.game_name = "MEM"
+    program = b"@bot\r#end\r"
+    world.rooms[0].objs.append(Obj(x=3, y=3, cycle=3, inside=program))
+    world.rooms[0].objs.append(Obj(x=4, y=3, cycle=3, inside=program))
+    world.rooms[0].objs.append(Obj(x=5, y=3, cycle=3, inside=b"#cycle 1\r"))
+    return world
+
+
+def test_memory_report_counts_shared_program_text_once() -> None:
+    report = memory_report(GameEngine(_world_with_programs()))
+
+    board = report.boards[0]
+    assert board.cells > 0 and board.stats > 0
+    assert len(b"@bot\r#end\r") + len(b"#cycle 1\r") < board.program < 2 * len(b"@bot\r#end\r") + 200
+    assert report.program_unique == board.program
+    assert report.glyph_cache == 0 and report.sound_cache == 0
+
+
+def test_profile_world_reports_traced_load_and_formats(tmp_path: Path) -> None:
+    path = tmp_path / "MEM.ZZT"
+    save_world(_world_with_programs(), str(path))
+
+    report = profile_world(path, cycles=2, render=True)
+
+    assert report.world == "MEM.ZZT"
+    assert report.traced_load is not None
+    assert report.traced_by_file["world.py"] > 0
+    assert report.glyphs > 0
+    text = format_report(report)
+    assert "MEM.ZZT: 1 boards" in text and "glyph cache" in text
+
+
+def test_program_pool_stays_bounded_across_reloads(tmp_path: Path) -> None:
+    path = tmp_path / "MEM.ZZT"
+    save_world(_world_with_programs(), str(path))
+    engine = GameEngine(make_new_world())
+
+    reports = []
+    for _ in range(4):
+        engine.new_game()
+        assert engine._load_world_from_path(path)
+        reports.append(memory_report(engine))
+
+    assert [r.program_pool for r in reports] == [2] * 4
+    assert len({r.program_pool_bytes for r in reports}) == 1
+    assert [r.compiled for r in reports] == [0] * 4
+
+    for idx in range(1, len(engine.room.objs)):
+        engine.oop.exec_obj(idx)
+    compiled = memory_report(engine)
+    assert compiled.compiled == 2 and compiled.compiled_bytes > 0
+    engine.new_game()
+    assert engine._load_world_from_path(path)
+    assert memory_report(engine).compiled == 0
+    assert reports[0].program_pool_bytes > len(b"@bot\r#end\r") + len(b"#cycle 1\r")
+    assert "program pool" in format_report(reports[-1]) and "compiled programs" in format_report(compiled)
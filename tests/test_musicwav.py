@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import random
+import wave
+from pathlib import Path
+
+from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.model import Obj, make_new_world
+from almost_of_zzt.musicwav import export_world, play_lines, render_pcm, standalone_sound, world_tunes, write_wav
+from almost_of_zzt.sound import AMPLITUDE, TIMER_INTERVAL_MS, SoundEngine, digit_samples
+from almost_of_zzt.world import save_world
+
+
+def _step_samples(steps: int, rate: int = 44100) -> int:
+    return steps * rate * TIMER_INTERVAL_MS // 1000
+
+
+def test_render_pcm_holds_each_note_for_its_timer_steps() -> None:
+    sound = SoundEngine(random.Random(0))
+    seq = sound.music("QC") + bytes((0, 2)) + bytes((0xF1, 1))
+
+    pcm = render_pcm(seq, sound)
+
+    assert len(pcm) == _step_samples(8 + 2 + 1)
+    tone = pcm[: _step_samples(8)]
+    assert set(tone) == {AMPLITUDE, -AMPLITUDE}
+    assert set(pcm[_step_samples(8) : _step_samples(10)]) == {0}
+    drum = pcm[_step_samples(10) :]
+    assert drum[0] == AMPLITUDE and drum[-1] == 0
+
+
+def test_play_lines_and_world_export(tmp_path: Path) -> None:
+    assert play_lines(b"@bard\r#play c d\r#end\r#PLAY e\r") == ["cd", "e"]
+
+    world = make_new_world()
+    world.rooms[0].objs.append(Obj(x=3, y=3, cycle=3, inside=b"@bard\r#play cde\r#play x\r"))
+    world.rooms[0].objs.append(Obj(x=4, y=3, cycle=3, inside=b"#end\r"))
+    assert world_tunes(world) == [(0, 1, "cdex")]
+    path = tmp_path / "SONGS.ZZT"
+    save_world(world, str(path))
+
+    written = export_world(path, tmp_path / "out", standalone_sound())
+
+    assert [p.name for p in written] == ["SONGS_b00_s001.wav"]
+    with wave.open(str(written[0]), "rb") as fh:
+        assert (fh.getnchannels(), fh.getsampwidth(), fh.getframerate()) == (1, 2, 44100)
+        assert fh.getnframes() == _step_samples(4)
+
+
+def test_write_wav_round_trips_samples(tmp_path: Path) -> None:
+    sound = standalone_sound()
+    pcm = render_pcm(sound.music("T+C"), sound, sample_rate=8000)
+    write_wav(tmp_path / "a.wav", pcm, 8000)
+    with wave.open(str(tmp_path / "a.wav"), "rb") as fh:
+        assert fh.readframes(fh.getnframes()) == pcm.tobytes()
+
+
+def test_render_pcm_uses_the_live_engine_drums() -> None:
+    engine = GameEngine(make_new_world(), rng=random.Random(9))
+    sound = engine.sound
+    assert sound._digits != standalone_sound()._digits
+
+    pcm = render_pcm(bytes((0xF3, 1)), sound)
+
+    clip = digit_samples(44100, sound._digits[3], AMPLITUDE)[: _step_samples(1)]
+    assert pcm[: len(clip)] == clip
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import copy
+from pathlib import Path
+
+import pytest
+
 from almost_of_zzt import constants as c
 from almost_of_zzt.engine import GameEngine
-from almost_of_zzt.model import BoardCell, Obj, make_new_world
+from almost_of_zzt.model import BoardCell, FlagTable, Obj, bake_labels, make_new_world
+from almost_of_zzt.world import save_world
 
 
 def _engine() -> GameEngine:
@@ -108,7 +114,8 @@ def test_oop_bind_alias_propagates_zap_mutation_to_all_bound_objects() -> None:
     e.oop.exec_obj(dst)
     e.oop._zap_label(dst, "PING")
 
-    assert b"\r'PING" in e.room.objs[src].inside
+    assert b"\r'PING" in bake_labels(e.room.objs[src].inside, e.room.objs[src].label_flips)
+    assert e.room.objs[src].inside is e.room.objs[dst].inside
 
 
 def test_oop_try_fail_executes_inline_fallback_command() -> None:
@@ -128,3 +135,137 @@ def test_oop_label_match_treats_digits_as_non_word_boundary_like_pascal() -> Non
     e.oop.exec_obj(idx)
 
     assert e.oop.flag_num("HIT") >= 0
+
+
+def test_oop_zap_on_duplicated_script_leaves_other_copies_intact() -> None:
+    e = _engine()
+    first = _add_prog(e, 10, 10, b"@BOT\r:PING\r#END\r")
+    second = _add_prog(e, 11, 10, b"@BOT\r:PING\r#END\r")
+    assert e.room.objs[first].inside is e.room.objs[second].inside
+
+    e.oop._zap_label(first, "PING")
+
+    assert b"\r'PING" in bake_labels(e.room.objs[first].inside, e.room.objs[first].label_flips)
+    assert b"\r:PING" in bake_labels(e.room.objs[second].inside, e.room.objs[second].label_flips)
+
+
+def test_compiled_program_is_shared_and_keeps_byte_offsets() -> None:
+    from almost_of_zzt.oopcode import L_CMD, OP_GIVE, OP_IF, OP_SET, C_FLAG
+
+    e = _engine()
+    script = b"@BOT\r:GO\r#IF READY GIVE GEMS 3\r#SET READY\r#END\r"
+    a = _add_prog(e, 4, 4, script)
+    b = _add_prog(e, 6, 4, bytes(script))
+
+    prog = e.oop.program(e.room.objs[a].inside)
+    assert e.oop.program(e.room.objs[b].inside) is prog
+    assert prog.name == "BOT"
+    assert prog.find_label("go") == 4
+
+    kind, next_ofs, op = prog[9]
+    assert (kind, next_ofs) == (L_CMD, 31)
+    assert op[:2] == (OP_IF, (C_FLAG, "READY")) and op[2][:3] == (OP_GIVE, "gems", 3)
+    assert prog[31][2] == (OP_SET, "READY")
+
+    gems = e.world.inv.gems
+    e.oop.lsend_msg(a, "GO", ignore_lock=False)
+    e.oop.exec_obj(a)
+    e.oop.lsend_msg(b, "GO", ignore_lock=False)
+    e.oop.exec_obj(b)
+    assert e.world.inv.gems == gems + 3
+
+
+def test_flag_index_tracks_slots_in_pascal_order() -> None:
+    e = _engine()
+    flags = e.world.inv.flags
+    e.oop.set_flag("one")
+    e.oop.set_flag("TWO")
+    e.oop.set_flag("One")
+    e.oop.clear_flag("ONE")
+    e.oop.set_flag("three")
+
+    assert flags[:3] == ["THREE", "TWO", ""]
+    assert e.oop.flag_num("two") == 1 and e.oop.flag_num("ONE") == -1
+
+    flags[1] = "Loaded"
+    assert e.oop.flag_num("LOADED") == 1 and e.oop.flag_num("TWO") == -1
+    for n in range(20):
+        e.oop.set_flag(f"F{n}")
+    assert len(flags) == c.NUM_FLAGS and e.oop.flag_num("F19") == -1
+
+
+def test_flag_table_keeps_its_slot_count_and_index() -> None:
+    flags = FlagTable(["a", "", "b"])
+    assert len(flags) == c.NUM_FLAGS and flags.find("B") == 2
+
+    for resize in (
+        lambda: flags.append("x"),
+        lambda: flags.extend(["x"]),
+        lambda: flags.insert(0, "x"),
+        lambda: flags.pop(),
+        lambda: flags.remove("a"),
+        lambda: flags.clear(),
+        lambda: flags.__delitem__(0),
+        lambda: flags.__iadd__(["x"]),
+        lambda: flags.__setitem__(slice(0, 2), ["x"]),
+    ):
+        with pytest.raises(TypeError):
+            resize()
+    assert len(flags) == c.NUM_FLAGS
+
+    flags[0:2] = ["", "c"]
+    flags.reverse()
+    assert flags.find("C") == c.NUM_FLAGS - 2 and flags.find("A") == -1
+    clone = copy.deepcopy(flags)
+    assert clone == flags and clone.find("B") == flags.find("B")
+
+
+def test_zap_and_restore_overlay_leaves_program_bytes_alone(tmp_path) -> None:
+    from almost_of_zzt.world import load_world, save_world
+
+    e = _engine()
+    script = b"@BOT\r:HIT\r#SET ONE\r#END\r:HIT\r#SET TWO\r#END\r'HIT\r"
+    idx = _add_prog(e, 10, 10, script)
+    prog = e.oop.program(e.room.objs[idx].inside)
+
+    e.oop._zap_label(idx, "HIT")
+    assert e.oop._find_label(idx, "HIT") == script.index(b"\r:HIT", 5)
+    e.oop._restore_label(idx, "HIT")
+    assert e.oop._find_label(idx, "HIT") == 4
+    e.oop._zap_label(idx, "HIT")
+
+    obj = e.room.objs[idx]
+    assert obj.inside == script
+    assert e.oop.program(obj.inside) is prog
+    e.oop.lsend_msg(idx, "HIT", ignore_lock=False)
+    e.oop.exec_obj(idx)
+    assert e.oop.flag_num("TWO") >= 0 and e.oop.flag_num("ONE") == -1
+
+    out = tmp_path / "zap.zzt"
+    save_world(e.world, str(out))
+    saved = load_world(str(out)).rooms[0].objs[idx].inside
+    assert saved == b"@BOT\r'HIT\r#SET ONE\r#END\r:HIT\r#SET TWO\r#END\r:HIT\r"
+
+
+def test_compiled_programs_are_dropped_when_the_world_changes(tmp_path: Path) -> None:
+    paths = []
+    for name, script in (("FIRST", b"@first\r#end\r"), ("SECOND", b"@second\r#end\r")):
+        world = make_new_world()
+        world.rooms[0].objs.append(Obj(x=10, y=10, cycle=1, inside=script))
+        world.rooms[0].board[10][10] = BoardCell(c.PROG, 0x0F)
+        paths.append(tmp_path / f"{name}.ZZT")
+        save_world(world, str(paths[-1]))
+
+    e = _engine()
+    assert e._load_world_from_path(paths[0])
+    first = e.room.objs[1].inside
+    e.oop.exec_obj(1)
+    assert first in e.oop._programs
+
+    assert e._load_world_from_path(paths[1])
+    assert first not in e.oop._programs
+    e.oop.exec_obj(1)
+    assert list(e.oop._programs) == [e.room.objs[1].inside]
+
+    e.new_game()
+    assert not e.oop._programs
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.model import Obj, make_default_room, make_new_world
+from almost_of_zzt.ooplint import lint_paths, lint_world, main
+from almost_of_zzt.world import save_world
+
+
+def _world(*boards: list[bytes]):
+    world = make_new_world()
+    world.game_name = "LINT"
+    world.rooms = []
+    for scripts in boards:
+        room = make_default_room()
+        for n, script in enumerate(scripts):
+            x = 10 + n
+            room.objs.append(Obj(x=x, y=10, cycle=3, inside=script))
+            room.board[x][10].kind = c.PROG
+        world.rooms.append(room)
+    world.num_rooms = len(world.rooms) - 1
+    return world
+
+
+def _codes(report) -> list[tuple[int, int, int, str]]:
+    return [(i.board, i.stat, i.line, i.code) for i in report.issues]
+
+
+def test_lint_reports_bad_commands_arguments_and_labels() -> None:
+    world = _world(
+        [
+            b"@BOT\r#end\r:touch\r#frobnicate\r#go sideways\r/n/x#send done\r#become nothing\r#give cash 5\r"
+            b"#if any blue nothing set seen\r:done\r#send guard:alarm\r:spare\r",
+            b"@guard\r:alarm\r#if seen end\r:quiet\r",
+        ]
+    )
+
+    report = lint_world(world)
+
+    assert _codes(report) == [
+        (0, 1, 4, "bad-command"),
+        (0, 1, 5, "bad-direction"),
+        (0, 1, 6, "bad-direction"),
+        (0, 1, 7, "bad-kind"),
+        (0, 1, 8, "bad-item"),
+        (0, 1, 9, "bad-kind"),
+        (0, 1, 10, "unreachable-label"),
+        (0, 1, 12, "unreachable-label"),
+        (0, 2, 4, "unreachable-label"),
+    ]
+    assert report.errors == 5 and report.objects == 2
+
+
+def test_lint_resolves_targets_across_boards_and_checks_links() -> None:
+    world = _world(
+        [b"@a\r#send b:go\r#if ready end\r!c:go;Ask C\r#zap nobody:go\r"],
+        [b"@b\r:go\r#end\r", b"@c\r:go\r#set elsewhere\r"],
+    )
+    world.rooms[0].room_info.room_udlr = [1, 5, 0, 0]
+
+    codes = [(i.board, i.line, i.code) for i in lint_world(world).issues]
+
+    assert codes == [
+        (0, 0, "bad-exit"),
+        (0, 2, "target-elsewhere"),
+        (0, 3, "flag-never-set"),
+        (0, 4, "target-elsewhere"),
+        (0, 5, "missing-target"),
+        (1, 2, "unreachable-label"),
+        (1, 2, "unreachable-label"),
+    ]
+
+
+def test_lint_flags_multi_step_moves_the_runner_cannot_run() -> None:
+    world = _world([b"@a\r/n\r?rndp n\r/n/n?w#send go\r:go\r"])
+
+    issues = lint_world(world).issues
+
+    assert [(i.line, i.code) for i in issues] == [(4, "bad-direction"), (5, "unreachable-label")]
+    assert "several steps" in issues[0].message
+
+
+def test_lint_counts_only_live_labels_except_for_restore() -> None:
+    zapped = _world([b"@a\r#frob\r#send b:go\r'frob\r", b"@b\r'go\r"])
+    restored = _world([b"@a\r#restore b:go\r#restore frob\r'frob\r", b"@b\r'go\r"])
+
+    assert _codes(lint_world(zapped)) == [(0, 1, 2, "bad-command"), (0, 1, 3, "missing-label")]
+    assert _codes(lint_world(restored)) == []
+
+
+def test_lint_paths_scans_directories_in_parallel_with_json(tmp_path: Path, capsys) -> None:
+    save_world(_world([b"@ok\r:touch\r#end\r"]), str(tmp_path / "GOOD.ZZT"))
+    (tmp_path / "sub").mkdir()
+    save_world(_world([b"#bogus\r"]), str(tmp_path / "sub" / "BAD.ZZT"))
+    (tmp_path / "BROKEN.ZZT").write_bytes(b"\x00")
+
+    reports = lint_paths([tmp_path], workers=2)
+    assert [(r.world, len(r.issues), r.error is not None) for r in reports] == [
+        ("BROKEN.ZZT", 0, True),
+        ("GOOD.ZZT", 0, False),
+        ("BAD.ZZT", 1, False),
+    ]
+
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path / "sub"), "--json", "--workers", "1"])
+    assert exc.value.code == 1
+    out = json.loads(capsys.readouterr().out)
+    assert out[0]["issues"][0]["code"] == "bad-command"
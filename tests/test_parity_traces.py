@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.model import BoardCell, make_new_world
+from almost_of_zzt.parity import check_trace, read_trace, record_trace, write_trace
+from almost_of_zzt.world import save_world
+
+
+ROOT = Path(__file__).resolve().parents[1]
+GOLDEN = sorted((ROOT / "tests" / "golden").glob("*.trace.gz"))
+
+
+@pytest.mark.parametrize("path", GOLDEN, ids=lambda p: p.name.split(".")[0])
+def test_golden_trace_replays_without_divergence(path: Path) -> None:
+    trace = read_trace(path)
+    assert check_trace(trace, ROOT / trace.world) is None
+
+
+def test_divergence_reports_first_tick_and_cell(tmp_path: Path) -> None:
+    world = make_new_world()
+    room = world.rooms[0]
+    room.board[room.objs[0].x + 2][room.objs[0].y] = BoardCell(c.GEM, 0x0A)
+    world_path = tmp_path / "PARITY.ZZT"
+    save_world(world, str(world_path))
+
+    trace = record_trace(world_path, 12, inputs=("E",) * 12)
+    write_trace(tmp_path / "parity.trace.gz", trace)
+    trace = read_trace(tmp_path / "parity.trace.gz")
+    assert check_trace(trace, world_path) is None
+
+    trace.ticks[5].setdefault("cells", []).append([3 * (c.YS + 2) + 4, c.BLOCK, 0x0E])
+    diff = check_trace(trace, world_path)
+    assert diff is not None
+    assert (diff.tick, diff.where) == (6, "cell (3,4) kind/color")
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import copy
 import os
+import threading
 from pathlib import Path
 
 import pygame
 
 from almost_of_zzt import constants as c
 from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.hiscores import HiScoreService, decode_table, empty_table, encode_table
 from almost_of_zzt.model import BoardCell, Obj, make_default_room, make_new_world
-from almost_of_zzt.render import Renderer
+from almost_of_zzt.render import Renderer, draw_board
 from almost_of_zzt.world import load_world
 
 
@@ -176,7 +179,7 @@ def test_monitor_restore_command_starts_play_mode() -> None:
 def test_monitor_high_scores_command_loads_and_views() -> None:
     e = _engine()
     calls: list[str] = []
-    e._load_hi_scores = lambda: calls.append("load")  # type: ignore[method-assign]
+    e._load_hi_scores = lambda wait=0.0: calls.append("load")  # type: ignore[method-assign]
     e._view_hi = lambda n: calls.append(f"view:{n}")  # type: ignore[method-assign]
 
     e._handle_monitor_key("H")
@@ -190,11 +193,12 @@ def test_note_score_persists_hi_file_round_trip(tmp_path: Path, monkeypatch) ->
     e = _engine()
     e.world.inv.orig_name = "TESTHI"
     e._world_origin_file = tmp_path / "TESTHI.ZZT"
-    e._load_hi_scores()
+    e._load_hi_scores(e.HI_PREFETCH_WAIT_S)
     e.show_scroll = lambda lines, title, obj_flag=True: None  # type: ignore[method-assign]
     e._prompt_high_score_name = lambda prompt: "Jared"  # type: ignore[method-assign]
 
     e._note_score(1234)
+    assert e.hiscores.flush(5.0)
 
     hi_path = tmp_path / "TESTHI.HI"
     assert hi_path.exists()
@@ -207,6 +211,49 @@ def test_note_score_persists_hi_file_round_trip(tmp_path: Path, monkeypatch) ->
     assert e2._hi_scores[0] == ("Jared", 1234)
 
 
+def _miss_engine(tmp_path: Path, monkeypatch) -> tuple[GameEngine, Path]:
+    hi_path = tmp_path / "MISSHI.HI"
+    hi_path.write_bytes(encode_table([("Old", 500)] + [("", -1)] * (c.NUM_HI - 1)))
+    e = _engine()
+    e.hiscores = HiScoreService()
+    e.world.inv.orig_name = "MISSHI"
+    e._world_origin_file = tmp_path / "MISSHI.ZZT"
+    monkeypatch.setattr(e.hiscores, "prefetch", lambda path: None)
+    return e, hi_path
+
+
+def test_hi_score_cache_miss_skips_the_prompt_and_merges_on_write(tmp_path: Path, monkeypatch) -> None:
+    e, hi_path = _miss_engine(tmp_path, monkeypatch)
+    real_load = e.hiscores.load
+    monkeypatch.setattr(e.hiscores, "load", None)
+
+    def no_prompt(*args, **kwargs):
+        raise AssertionError("the rank is unknown, so nothing may claim a place")
+
+    e.show_scroll = no_prompt  # type: ignore[method-assign]
+    e._prompt_high_score_name = no_prompt  # type: ignore[method-assign]
+
+    e._load_hi_scores(0.05)
+    assert e._hi_scores == empty_table()
+    e._note_score(90)
+    assert e.hiscores.flush(5.0)
+
+    expected = [("Old", 500), (GameEngine.UNNAMED_HI_SCORE, 90)]
+    assert decode_table(hi_path.read_bytes())[:2] == expected
+    assert real_load(hi_path)[:2] == expected
+
+
+def test_hi_score_load_waits_briefly_for_the_prefetch(tmp_path: Path, monkeypatch) -> None:
+    e, hi_path = _miss_engine(tmp_path, monkeypatch)
+    reader = threading.Timer(0.05, e.hiscores.load, args=(hi_path,))
+    reader.start()
+
+    e._load_hi_scores(5.0)
+    reader.join()
+
+    assert e._hi_scores[0] == ("Old", 500) and not e._hi_scores_partial
+
+
 def test_player_death_notes_score_and_returns_to_monitor(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.chdir(tmp_path)
     world = make_new_world()
@@ -445,3 +492,96 @@ def test_smoke_original_worlds_tick_without_crash() -> None:
 
         for step in range(64):
             e._tick_game((step + 1) * e.game_cycle_ms)
+
+
+def test_prefetch_warms_neighbour_board_for_transition() -> None:
+    pygame.init()
+    screen = pygame.display.set_mode((c.SCREEN_W, c.SCREEN_H))
+    e = _engine()
+    e.world.rooms.append(make_default_room())
+    e.world.num_rooms = 1
+    e.room.room_info.room_udlr[3] = 1
+    e._screen = screen
+    e._renderer = Renderer(screen)
+
+    e._service_prefetch(rows=c.YS)
+    warm = e._cached_board_surface(1)
+    assert warm is not None
+
+    expected = e._renderer.offscreen()
+    e._draw_board(expected, e.world.rooms[1])
+    assert pygame.image.tobytes(warm, "RGB") == pygame.image.tobytes(expected.screen, "RGB")
+
+    e.world.rooms[1] = make_default_room()
+    assert e._cached_board_surface(1) is None
+
+
+def test_prefetch_draw_leaves_neighbour_board_untouched() -> None:
+    pygame.init()
+    screen = pygame.display.set_mode((c.SCREEN_W, c.SCREEN_H))
+    e = _engine()
+    neighbour = make_default_room()
+    neighbour.board[10][10] = BoardCell(c.SBOMB, 0x0C)
+    neighbour.objs.append(Obj(x=10, y=10, cycle=1, rate=20))
+    e.world.rooms.append(neighbour)
+    e.world.num_rooms = 1
+    e.room.room_info.room_udlr[3] = 1
+    e._screen = screen
+    e._renderer = Renderer(screen)
+
+    e._service_prefetch(rows=c.YS)
+    assert e._cached_board_surface(1) is not None
+    assert neighbour.board[10][10] == BoardCell(c.SBOMB, 0x0C)
+
+
+def test_cached_board_redraws_animated_cells_at_the_current_tick() -> None:
+    pygame.init()
+    screen = pygame.display.set_mode((c.SCREEN_W, c.SCREEN_H))
+    e = _engine()
+    neighbour = make_default_room()
+    neighbour.board[10][10] = BoardCell(c.SHOOTER, 0x0E)
+    neighbour.board[12][10] = BoardCell(c.SBOMB, 0x0C)
+    e.world.rooms.append(neighbour)
+    e.world.num_rooms = 1
+    e.room.room_info.room_udlr[3] = 1
+    e._screen = screen
+    e._renderer = Renderer(screen)
+    e.counter = 0
+    e._service_prefetch(rows=c.YS)
+    assert e._cached_board_surface(1) is not None
+
+    e.counter = 5
+    e.world.inv.room = 1
+    before = copy.deepcopy(neighbour)
+    shown = e._board_target_surface()
+
+    expected = e._renderer.offscreen()
+    draw_board(expected, before, e.info, e.counter, live=True)
+    assert pygame.image.tobytes(shown, "RGB") == pygame.image.tobytes(expected.screen, "RGB")
+    assert neighbour.board[12][10] == BoardCell(c.SBOMB, 0x0D)
+
+
+def test_board_transition_is_frame_driven_and_reveals_target_board() -> None:
+    pygame.init()
+    screen = pygame.display.set_mode((c.SCREEN_W, c.SCREEN_H))
+    e = _engine()
+    e.world.rooms.append(make_default_room())
+    e.world.num_rooms = 1
+    e._screen = screen
+    e._renderer = Renderer(screen)
+
+    e.change_room(1)
+    assert e.transition is not None
+    order = e.transition.order
+    assert sorted(order) == [(x, y) for x in range(1, c.XS + 1) for y in range(1, c.YS + 1)]
+
+    frames = 0
+    while e.step_transition():
+        frames += 1
+    assert frames == -(-c.XS * c.YS // e.DISSOLVE_CELLS_PER_FRAME)
+    revealed = pygame.image.tobytes(screen, "RGB")
+
+    e._renderer.clear()
+    e._draw_board(e._renderer)
+    e._draw_panel(e._renderer)
+    assert pygame.image.tobytes(screen, "RGB") == revealed
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.model import make_new_world
+from almost_of_zzt.rng import BufferedRandom, PascalRandom, make_rng
+
+
+def test_buffered_random_is_reproducible_and_in_range() -> None:
+    a, b = BufferedRandom(7), BufferedRandom(7)
+    draws = [a.randrange(9) for _ in range(BufferedRandom.BLOCK + 10)]
+    assert draws == [b.randrange(9) for _ in range(BufferedRandom.BLOCK + 10)]
+    assert set(draws) == set(range(9))
+    assert all(220 <= a.randrange(220, 660) < 660 for _ in range(1000))
+
+    a.seed(7)
+    assert [a.randrange(9) for _ in range(20)] == draws[:20]
+    with pytest.raises(ValueError):
+        a.randrange(0)
+
+
+def test_engine_rng_is_seedable_and_injectable() -> None:
+    first = GameEngine(make_new_world(), seed=42)
+    second = GameEngine(make_new_world(), seed=42)
+    assert first.counter == second.counter
+    assert first.sound._digits == second.sound._digits
+
+    custom = random.Random(5)
+    e = GameEngine(make_new_world(), rng=custom)
+    assert e.random is custom
+
+    seeded = GameEngine(make_new_world(), rng=random.Random(5), seed=42)
+    named = GameEngine(make_new_world(), rng="python", seed=42)
+    assert [seeded.random.randrange(9) for _ in range(20)] == [named.random.randrange(9) for _ in range(20)]
+    assert isinstance(make_rng("python", 1), random.Random)
+    with pytest.raises(ValueError):
+        make_rng("nope")
+
+
+def test_pascal_random_follows_turbo_pascal_lcg() -> None:
+    rng = PascalRandom(0)
+    assert [rng.randrange(100) for _ in range(2)] == [0, (0x0808 * 100) >> 16]
+    assert rng.rand_seed == (134775813 + 1) & 0xFFFFFFFF
+
+    rng.seed(0xFFFFFFFF)
+    seed_after = (0xFFFFFFFF * 134775813 + 1) & 0xFFFFFFFF
+    assert rng.randrange(5, 15) == 5 + (((seed_after >> 16) * 10) >> 16)
+    assert rng.randrange(0) == 0
+    assert rng.rand_seed == (seed_after * 134775813 + 1) & 0xFFFFFFFF
+
+
+def test_engine_pascal_rng_keeps_sound_digits_off_the_game_stream() -> None:
+    a = GameEngine(make_new_world(), rng="pascal", seed=1)
+    b = GameEngine(make_new_world(), rng="pascal", seed=999)
+    assert isinstance(a.random, PascalRandom)
+    assert a.sound._digits == b.sound._digits
+
+    a.random.seed(77)
+    b.random.seed(77)
+    assert [a.random.randrange(9) for _ in range(50)] == [b.random.randrange(9) for _ in range(50)]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.model import make_new_world
+
+
+def _engine() -> GameEngine:
+    world = make_new_world()
+    world.inv.room = 0
+    e = GameEngine(world)
+    for i in range(30):
+        e.add_obj(2 + i, 5, c.BLOCK, 0x0F, (0, 1, 2, 3, 7)[i % 5])
+    return e
+
+
+def _scripted(e: GameEngine, log: list[tuple[int, int, int]]) -> None:
+    def invoke_update(n: int) -> None:
+        obj = e.room.objs[n]
+        log.append((e.counter, n, obj.x))
+        if obj.x == 9:
+            e.add_obj(obj.x, 7, c.BLOCK, 0x0F, 1)
+        elif obj.x == 14 and e.counter % 2 == 0:
+            e.kill_obj(3)
+        elif obj.x == 20:
+            e.room.objs[n + 1].cycle = 1
+        elif obj.x == 25 and e.counter % 3 == 0:
+            # Passages re-roll the counter mid-tick.
+            e.counter += 1
+
+    e.invoke_update = invoke_update  # type: ignore[method-assign]
+
+
+def _naive_tick(e: GameEngine) -> None:
+    e.obj_num = 0
+    while e.obj_num <= e.room.num_objs:
+        cyc = e.room.objs[e.obj_num].cycle
+        if cyc != 0 and (e.counter % cyc) == (e.obj_num % cyc):
+            e.invoke_update(e.obj_num)
+        e.obj_num += 1
+
+
+def test_scheduler_matches_pascal_order_with_in_tick_changes() -> None:
+    fast, slow = _engine(), _engine()
+    fast_log: list[tuple[int, int, int]] = []
+    slow_log: list[tuple[int, int, int]] = []
+    _scripted(fast, fast_log)
+    _scripted(slow, slow_log)
+
+    for counter in range(1, 40):
+        fast.counter = slow.counter = counter
+        fast._update_active_objects()
+        _naive_tick(slow)
+
+    assert fast_log == slow_log
+    assert len(fast.room.objs) == len(slow.room.objs)
+    assert fast.room.objs.cycle == slow.room.objs.cycle
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.model import BoardCell, Obj, make_default_room, make_new_world
+
+
+def _engine() -> GameEngine:
+    world = make_new_world()
+    world.game_name = "TEST"
+    world.rooms.append(make_default_room())
+    world.num_rooms = 1
+    world.inv.room = 0
+    return GameEngine(world)
+
+
+def test_quick_save_restores_board_stats_and_inventory() -> None:
+    e = _engine()
+    idx = e.add_obj(10, 10, c.PROG, 0x0F, 3, Obj(inside=b"@BOT\r:PING\r#END\r"))
+    e.world.inv.gems = 7
+    e.oop.set_flag("SAVED")
+    snap = e.quick_save()
+
+    e.room.board[5][5] = BoardCell(c.GEM, 0x0D)
+    e.kill_obj(idx)
+    e.world.inv.gems = 0
+    e.oop.clear_flag("SAVED")
+
+    assert e.quick_load(snap) is True
+    assert e.room.board[5][5].kind != c.GEM
+    assert e.room.objs[idx].inside == b"@BOT\r:PING\r#END\r"
+    assert e.room.board[10][10].kind == c.PROG
+    assert e.world.inv.gems == 7
+    assert e.oop.flag_num("SAVED") >= 0
+
+
+def test_quick_save_reencodes_rooms_left_since_last_capture() -> None:
+    e = _engine()
+    e.quick_save()
+
+    e.change_room(1)
+    e.world.rooms[0].board[3][3] = BoardCell(c.AMMO, 0x03)
+    e.change_room(0)
+    e.change_room(1)
+    snap = e.quick_save()
+
+    e.change_room(0)
+    e.room.board[3][3] = BoardCell(c.EMPTY, 0)
+    e.quick_load(snap)
+
+    assert e.world.rooms[0].board[3][3].kind == c.AMMO
+    assert e.world.inv.room == 1
+
+
+def test_rewind_after_death_restores_earlier_play_state() -> None:
+    e = _engine()
+    e.change_room(1)
+    e._set_play_mode(c.PLAYER)
+    e.standby = False
+    e._read_control = lambda: None  # type: ignore[method-assign]
+    e.cycle_last_ms = 0
+    for step in range(40):
+        e._tick_game((step + 1) * e.game_cycle_ms)
+    assert len(e.rewind_buffer) > 0
+
+    e.world.inv.strength = 0
+    e._tick_game(41 * e.game_cycle_ms)
+    assert e.play_mode == c.MONITOR
+
+    e._handle_monitor_key(e.REWIND_KEY)
+
+    assert e.play_mode == c.PLAYER
+    assert e.world.inv.room == 1
+    assert e.world.inv.strength == 100
+    assert e.standby is True
+
+
+def test_rewind_buffer_stays_within_memory_budget() -> None:
+    e = _engine()
+    e.rewind_buffer.max_bytes = 8 * 1024
+    for tick in range(200):
+        e.room.board[1 + tick % 50][5].kind = c.GEM
+        e.rewind_buffer.push(tick, e.quicksave.capture_frame(e))
+
+    assert e.rewind_buffer.total_bytes <= 8 * 1024
+    assert 1 < len(e.rewind_buffer) < 200
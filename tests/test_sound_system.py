@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import random
+import time
+from array import array
+
+import pygame
 
 from almost_of_zzt import constants as c
 from almost_of_zzt.engine import GameEngine
 from almost_of_zzt.model import Obj, make_new_world
-from almost_of_zzt.sound import SoundEngine
+from almost_of_zzt import sound as sound_mod
+from almost_of_zzt.sound import TIMER_INTERVAL_MS, SoundEngine, digit_samples
 
 
 def test_music_parser_matches_pascal_shape() -> None:
@@ -61,3 +66,113 @@ def test_oop_play_queues_music_sequence() -> None:
 
     assert e.sound.notes != b""
     assert e.sound.make_sound is True
+
+
+def test_bind_pygame_presynthesizes_tones_and_digits(monkeypatch) -> None:
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    s = SoundEngine(random.Random(5))
+    s.bind_pygame()
+    try:
+        speaker = s._speaker
+        assert set(speaker._tone_cache) == {f for f in s._note_table if f > 0}
+        assert set(speaker._digit_cache) == set(range(10))
+
+        # Same samples as stepping through one square-wave period by hand.
+        period = int(speaker.sample_rate / 440)
+        expected = array("h", [speaker.amplitude if i < period // 2 else -speaker.amplitude for i in range(period)])
+        assert speaker._make_square_wave(440).get_raw() == expected.tobytes()
+
+        clip = digit_samples(speaker.sample_rate, [2, 1000, 3000], speaker.amplitude)
+        assert len(clip) == 2 * (speaker.sample_rate // 1000)
+        assert list(clip[:23]) == [speaker.amplitude] * 22 + [-speaker.amplitude]
+    finally:
+        s.shutdown()
+        pygame.mixer.quit()
+
+
+class _RecordingSpeaker:
+    def __init__(self) -> None:
+        self.played: list[int] = []
+
+    def play_note(self, freq: int) -> None:
+        self.played.append(freq)
+
+    def play_digit(self, digit: int, data: list[int]) -> None:
+        self.played.append(-digit)
+
+    def stop(self) -> None:
+        return
+
+    def pump(self) -> None:
+        return
+
+    def shutdown(self) -> None:
+        return
+
+
+def test_audio_thread_queues_calls_and_steps_the_timer_itself() -> None:
+    s = SoundEngine(random.Random(6))
+    speaker = s._speaker = _RecordingSpeaker()  # type: ignore[assignment]
+    s.start_thread()
+    try:
+        s.add(3, bytes((0x30, 1, 0xF1, 1)))
+        s.tick(10_000_000)
+        deadline = time.monotonic() + 2.0
+        while len(speaker.played) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        s.shutdown()
+
+    assert speaker.played == [s._note_table[0x30], -1]
+    assert not s.threaded
+    assert s._last_tick_ms is None
+
+
+def test_music_compilation_is_memoized_with_counters() -> None:
+    s = SoundEngine(random.Random(7))
+    spec = "ic+dx-e!3f#"
+    before = s.music_cache_info()
+
+    first = s.music(spec)
+    second = SoundEngine(random.Random(8)).music(spec)
+
+    after = s.music_cache_info()
+    assert first is second
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+    assert after.maxsize == sound_mod.MUSIC_CACHE_SIZE
+
+
+def test_streaming_speaker_renders_phase_continuous_chunks(monkeypatch) -> None:
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    s = SoundEngine(random.Random(9))
+    s.bind_pygame(streaming=True)
+    try:
+        speaker = s._speaker
+        assert isinstance(speaker, sound_mod._StreamSpeaker)
+        assert set(speaker._digit_cache) == set(range(10))
+        out = array("h", [0]) * 1000
+
+        speaker.play_note(441)
+        speaker.render(memoryview(out)[:130])
+        # 441 Hz is a 100-sample period; 130 samples in we are 30 into a cycle.
+        assert list(out[:50]) == [speaker.amplitude] * 50
+        speaker.play_note(882)
+        speaker.render(memoryview(out)[130:200])
+        # The new 50-sample period resumes 15 samples into its cycle.
+        assert list(out[130:140]) == [speaker.amplitude] * 10
+        assert list(out[140:165]) == [-speaker.amplitude] * 25
+
+        speaker.play_digit(0, s._digits[0])
+        speaker.render(memoryview(out)[200:])
+        clip = len(speaker._digit_cache[0])
+        assert out[200] == speaker.amplitude
+        assert set(out[200 + clip :]) == {0}
+
+        s.add(1, bytes((0x40, 1)))
+        s.tick(0)
+        s.tick(TIMER_INTERVAL_MS)
+        assert speaker._channel.get_busy()
+    finally:
+        s.shutdown()
+        pygame.mixer.quit()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pygame
+
+from almost_of_zzt import constants as c
+from almost_of_zzt.engine import GameEngine
+from almost_of_zzt.model import make_new_world
+from almost_of_zzt.thumbs import THUMB_SIZE, ThumbnailCache
+from almost_of_zzt.world import load_title_room, load_world, save_world
+
+
+def _world(tmp_path: Path) -> Path:
+    world = make_new_world()
+    world.rooms[0].title = "Thumb"
+    out = tmp_path / "THUMB.ZZT"
+    save_world(world, str(out))
+    return out
+
+
+def test_title_room_decodes_only_board_zero(tmp_path: Path) -> None:
+    path = _world(tmp_path)
+    assert load_title_room(str(path)) == load_world(str(path)).rooms[0]
+
+
+def test_thumbnail_cache_is_keyed_by_mtime_and_size(tmp_path: Path) -> None:
+    path = _world(tmp_path)
+    cache = ThumbnailCache(tmp_path / "cache")
+
+    thumb = cache.thumbnail(path)
+    assert thumb.get_size() == THUMB_SIZE
+    first = cache.thumbnail_file(path)
+    assert first.exists()
+
+    fresh = ThumbnailCache(tmp_path / "cache")
+    fresh.render = None  # type: ignore[assignment]
+    assert fresh.thumbnail_file(path) == first
+    assert pygame.image.tobytes(fresh.thumbnail(path), "RGB") == pygame.image.tobytes(thumb, "RGB")
+
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    second = cache.thumbnail_file(path)
+    assert second != first
+    assert not first.exists() and second.exists()
+
+
+def test_thumbnail_cache_keeps_the_most_recently_used_entries(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path / "cache", max_entries=2)
+    paths = []
+    for n in range(3):
+        (tmp_path / str(n)).mkdir()
+        paths.append(_world(tmp_path / str(n)))
+
+    first = cache.thumbnail_file(paths[0])
+    second = cache.thumbnail_file(paths[1])
+    os.utime(first, ns=(0, 1_000_000_000))
+    os.utime(second, ns=(0, 2_000_000_000))
+    assert cache.thumbnail_file(paths[0]) == first
+    third = cache.thumbnail_file(paths[2])
+
+    assert sorted(p.name for p in (tmp_path / "cache").iterdir()) == sorted([first.name, third.name])
+
+
+def test_thumbnail_draws_without_an_engine(tmp_path: Path, monkeypatch) -> None:
+    path = _world(tmp_path)
+    engine = GameEngine(load_world(str(path)))
+    engine.counter = 0
+
+    def no_engine(*args, **kwargs):
+        raise AssertionError("thumbnails must not build a GameEngine")
+
+    monkeypatch.setattr(GameEngine, "__init__", no_engine)
+    cache = ThumbnailCache(tmp_path / "cache")
+    thumb = cache.render(path)
+
+    renderer, _ = cache._board_renderer()
+    renderer.clear()
+    engine._draw_board(renderer, engine.world.rooms[0])
+    board = renderer.screen.subsurface((0, c.BOARD_OFFSET_Y, c.XS * c.CELL_W, c.YS * c.CELL_H))
+    expected = pygame.transform.smoothscale(board, THUMB_SIZE)
+    assert pygame.image.tobytes(thumb, "RGB") == pygame.image.tobytes(expected, "RGB")
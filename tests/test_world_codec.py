@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 
+import pytest
+
 from almost_of_zzt import constants as c
-from almost_of_zzt.model import Obj, make_new_world
+from almost_of_zzt.model import BoardCell, Obj, make_default_room, make_new_world
 from almost_of_zzt.world import load_world, save_world
 
 
@@ -40,3 +43,68 @@ def test_roundtrip_object_inside_data(tmp_path: Path) -> None:
 
     assert loaded.rooms[0].num_objs == 1
     assert loaded.rooms[0].objs[1].inside == b"@TEST\r:START\r#END\r"
+
+
+def test_only_bound_scripts_are_aliased_and_identical_text_is_shared(tmp_path: Path) -> None:
+    world = make_new_world()
+    room = world.rooms[0]
+    script = b"@GUARD\r:TOUCH\r#END\r"
+    for x, bind in ((10, 7), (11, 7), (12, 0)):
+        room.objs.append(Obj(x=x, y=10, cycle=3, inside=bytes(bytearray(script)), bind=bind))
+        room.board[x][10].kind = c.PROG
+
+    out = tmp_path / "alias.zzt"
+    save_world(world, str(out))
+    assert out.read_bytes().count(script) == 2
+
+    loaded = load_world(str(out))
+    objs = loaded.rooms[0].objs
+    assert [o.inside for o in objs[1:]] == [script] * 3
+    assert objs[1].bind == objs[2].bind != 0 and objs[3].bind == 0
+    assert objs[1].inside is objs[2].inside is objs[3].inside
+
+
+def test_program_pool_belongs_to_its_world(tmp_path: Path) -> None:
+    out = tmp_path / "pool.zzt"
+    world = make_new_world()
+    world.rooms[0].objs.append(Obj(x=10, y=10, inside=b"@A\r#END\r"))
+    save_world(world, str(out))
+
+    worlds = [load_world(str(out)) for _ in range(4)]
+
+    assert [len(w.programs) for w in worlds] == [1, 1, 1, 1]
+    assert worlds[0].programs is not worlds[1].programs
+
+
+def test_stat_table_refs_follow_their_row_across_removal() -> None:
+    room = make_default_room()
+    for x in (10, 11, 12):
+        room.objs.append(Obj(x=x, y=5, cycle=x, under=BoardCell(c.FAKE_WALL, 0x0E)))
+
+    doomed, kept = room.objs[1], room.objs[3]
+    assert room.objs.cycle.tolist() == [1, 10, 11, 12]
+
+    del room.objs[1]
+    assert kept is room.objs[2]
+    assert (kept.x, kept.cycle) == (12, 12)
+    assert (doomed.x, doomed.under) == (10, BoardCell(c.FAKE_WALL, 0x0E))
+    assert room.objs.cycle.tolist() == [1, 11, 12]
+
+    kept.under = BoardCell(c.WATER, 0x9F)
+    assert (room.objs.under_kind[2], room.objs.under_color[2]) == (c.WATER, 0x9F)
+    assert copy.deepcopy(kept) == Obj(x=12, y=5, cycle=12, under=BoardCell(c.WATER, 0x9F))
+
+
+def test_stat_under_cell_is_read_only() -> None:
+    room = make_default_room()
+    room.objs.append(Obj(x=4, y=5, under=BoardCell(c.FAKE_WALL, 0x0E)))
+    obj = room.objs[1]
+
+    with pytest.raises(AttributeError):
+        obj.under.color = 0x1F
+    assert obj.under == BoardCell(c.FAKE_WALL, 0x0E)
+
+    cell = copy.deepcopy(obj.under)
+    cell.color = 0x1F
+    obj.under = cell
+    assert room.objs.under_color[1] == 0x1F